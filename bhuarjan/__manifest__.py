@@ -38,6 +38,7 @@
         'data/section_master_data.xml',
         'data/cglrc_master_data.xml',
         'data/qweb_report_paper_format.xml',
+        'data/section23_award_job_cron.xml',
         #'data/jurda_test_permutations.xml',
         # 'data/jurda_sample_surveys.xml',
         'security/secrurity.xml',
@@ -294,6 +294,22 @@ class ApiDocsController(http.Controller):
                         }
                      }
                 },
+                "/api/bhuarjan/sync": {
+                     "get": {
+                        "tags": ["Survey Management"],
+                        "summary": "Delta Sync (surveys, landowners, trees, photo types)",
+                        "security": [{"bearerAuth": []}],
+                        "parameters": [
+                             {"name": "models", "in": "query", "schema": {"type": "string"}, "description": "Comma-separated: surveys, landowners, trees, photo_types"},
+                             {"name": "surveys_since", "in": "query", "schema": {"type": "string"}, "description": "Watermark from the previous sync (same for landowners_since, trees_since, photo_types_since)"},
+                             {"name": "village_id", "in": "query", "schema": {"type": "integer"}},
+                             {"name": "limit", "in": "query", "schema": {"type": "integer", "default": 500}}
+                        ],
+                        "responses": {
+                            "200": {"description": "Updated records, deleted ids and next watermark per model"}
+                        }
+                     }
+                },
                 "/api/bhuarjan/photo/{photo_id}": {
                     "delete": {
                         "tags": ["Survey Management"],
@@ -5,6 +5,8 @@ import logging
 from odoo import http
 from odoo.http import request, Response
 
+from .reference_cache import conditional_reference
+
 _logger = logging.getLogger(__name__)
 
 
@@ -114,6 +116,7 @@ class AppVersionAPIController(http.Controller):
             )
 
     @http.route('/api/bhuarjan/app/version/latest', type='http', auth='public', methods=['GET'], csrf=False)
+    @conditional_reference('bhu.app.version')
     def get_latest_version(self, **kwargs):
         """
         Get the latest app version information
@@ -28,12 +28,11 @@ def check_permission(func):
         token = auth_header[7:]
 
         try:
-            decoded_token = jwt.decode(token, options={"verify_signature": False})
-            user_id = decoded_token['user_id']
-            user = request.env['res.users'].sudo().search([('id', '=', user_id)])
-            if not user:
-                raise AccessError('User not found')
-            request.user = user  # Optionally store for later use
+            info = request.env['jwt.token'].sudo()._resolve_token(token)
+            # Role and villages come from the token cache; ``request.user`` is only read on demand
+            request.user = request.env['res.users'].sudo().browse(info.user_id)
+            request.user_role = info.role
+            request.user_village_ids = list(info.village_ids)
         except jwt.ExpiredSignatureError:
             raise AccessError('JWT token has expired')
         except jwt.InvalidTokenError:
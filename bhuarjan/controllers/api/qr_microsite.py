@@ -1,10 +1,109 @@
 from odoo import http
-from odoo.http import request
+from odoo.http import request, Response
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
+from werkzeug.wsgi import wrap_file
 import logging
 import base64
+import hashlib
+import os
 
 _logger = logging.getLogger(__name__)
 
+# Scanners revalidate on every hit; an unchanged document answers 304.
+MICROSITE_CACHE_CONTROL = 'public, no-cache'
+# Member lines printed by the SIA order and the expert committee proposal.
+MEMBER_LINE_FIELDS = (
+    'non_govt_social_scientist_line_ids', 'local_bodies_representative_line_ids',
+    'resettlement_expert_line_ids', 'technical_expert_line_ids',
+)
+
+
+def _not_modified(etag):
+    """304 response when the client already holds ``etag``, else None."""
+    if not request.httprequest.if_none_match.contains_weak(etag):
+        return None
+    response = Response(status=304, headers=[('Cache-Control', MICROSITE_CACHE_CONTROL)])
+    response.set_etag(etag)
+    return response
+
+
+def _pdf_response(body, size, filename, etag, ascii_fallback):
+    """PDF response with ``ETag`` and ``Range`` support; ``body`` is an iterable or file wrapper."""
+    cd = request.env['form10.export.utils'].content_disposition_attachment(
+        filename, ascii_fallback=ascii_fallback
+    )
+    response = Response(
+        body,
+        headers=[
+            ('Content-Type', 'application/pdf'),
+            ('Content-Disposition', cd),
+            ('Content-Length', str(size)),
+            ('Cache-Control', MICROSITE_CACHE_CONTROL),
+        ],
+        direct_passthrough=True,
+    )
+    response.set_etag(etag)
+    try:
+        return response.make_conditional(request.httprequest, accept_ranges=True, complete_length=size)
+    except RequestedRangeNotSatisfiable:
+        response.close()
+        return Response(status=416, headers=[('Content-Range', f'bytes */{size}')])
+
+
+def _attachment_response(attachment, filename, etag, ascii_fallback):
+    """Stream a stored attachment from the filestore."""
+    if attachment.store_fname:
+        full_path = attachment._full_path(attachment.store_fname)
+        body = wrap_file(request.httprequest.environ, open(full_path, 'rb'))
+        return _pdf_response(body, os.path.getsize(full_path), filename, etag, ascii_fallback)
+    pdf_data = attachment.raw or b''
+    return _pdf_response([pdf_data], len(pdf_data), filename, etag, ascii_fallback)
+
+
+def _render_pdf(report_action, record):
+    pdf_data, _ = report_action._render_qweb_pdf(
+        report_action.report_name,
+        res_ids=[record.id],
+        data={}
+    )
+    return pdf_data
+
+
+def _cached_pdf_response(record, kind, render, filename, ascii_fallback, project=None, village=None,
+                         child_lines=()):
+    """Serve the stored ``kind`` PDF of ``record``; ``render()`` only runs when its inputs changed.
+
+    ``child_lines``: One2many fields of ``record`` printed by the report.
+    """
+    cache = request.env['bhu.microsite.document.cache']
+    fingerprint = cache._microsite_fingerprint(
+        record, kind, project=project, village=village, child_lines=child_lines,
+    )
+    not_modified = _not_modified(fingerprint)
+    if not_modified:
+        return not_modified
+    attachment = cache._get_cached_document(record, kind, fingerprint)
+    if attachment:
+        return _attachment_response(attachment, filename, fingerprint, ascii_fallback)
+    _logger.info("Rendering %s PDF for %s %s", kind, record._name, record.id)
+    pdf_data = render()
+    if not pdf_data:
+        return request.not_found("Error: PDF rendering returned empty result")
+    attachment = cache._store_document(record, kind, fingerprint, pdf_data, filename)
+    return _attachment_response(attachment, filename, fingerprint, ascii_fallback)
+
+
+def _signed_pdf_response(record, field_name, filename, ascii_fallback):
+    """Serve an uploaded signed document, versioned by the record's ``write_date``."""
+    etag = hashlib.md5(repr(
+        ('signed', record._name, record.id, field_name, record.write_date)
+    ).encode('utf-8')).hexdigest()
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+    pdf_data = base64.b64decode(record[field_name])
+    return _pdf_response([pdf_data], len(pdf_data), filename, etag, ascii_fallback)
+
 
 class Form10PDFController(http.Controller):
     """Controller for direct PDF download from QR code scan"""
@@ -47,6 +146,17 @@ class Form10PDFController(http.Controller):
             if village.village_uuid != village_uuid:
                 _logger.error("Village UUID mismatch! Expected %s, got %s", village_uuid, village.village_uuid)
             
+            # Serve the stored PDF while the project, village and its surveys are unchanged
+            cache = request.env['bhu.microsite.document.cache']
+            cache_kind = f'form10_village_{village.id}'
+            fingerprint = cache._microsite_fingerprint(project, cache_kind, project=project, village=village)
+            not_modified = _not_modified(fingerprint)
+            if not_modified:
+                return not_modified
+            cached = cache._get_cached_document(project, cache_kind, fingerprint)
+            if cached:
+                return _attachment_response(cached, cached.name, fingerprint, 'Form10_Export.pdf')
+            
             # Generate PDF report using Odoo's standard rendering
             try:
                 report_action = request.env.ref('bhuarjan.action_report_form10_bulk_table').sudo()
@@ -212,15 +322,6 @@ class Form10PDFController(http.Controller):
             
             _logger.debug("Rendering PDF with %d res_ids", len(res_ids))
             
-            # Invalidate report cache to ensure fresh generation
-            # This prevents any caching issues that might cause the wrong data to appear
-            report_action.invalidate_recordset(['report_name', 'report_file'])
-            
-            # Render PDF directly - Odoo will populate 'docs' in template with these records
-            # _render_qweb_pdf signature: (reportname, docids, data=None)
-            # Odoo automatically populates 'docs' from res_ids, so we don't need to pass it explicitly
-            report_name = report_action.report_name
-            
             # Verify surveys exist before rendering
             verify_surveys = request.env['bhu.survey'].sudo().browse(res_ids)
             _logger.debug("Verifying %d surveys before PDF render", len(verify_surveys))
@@ -228,65 +329,29 @@ class Form10PDFController(http.Controller):
                 _logger.error("No surveys found to render PDF!")
                 return request.not_found("No surveys found for PDF generation")
             
-            data = {
-                'report_type': 'qweb-pdf',
-                'context': {
-                    'project_id': project.id,
-                    'village_id': village.id,
-                }
-            }
+            export_utils = request.env['form10.export.utils']
             try:
-                pdf_result = report_action.sudo()._render_qweb_pdf(report_name, res_ids, data=data)
+                # Chunked render, merged into a spooled temp file
+                pdf_file, _size = export_utils.generate_form10_pdf_file(verify_surveys)
             except Exception as render_error:
-                # Fallback: try with minimal data
-                _logger.warning(f"PDF render with data failed: {str(render_error)}, trying fallback")
-                try:
-                    pdf_result = report_action.sudo()._render_qweb_pdf(report_name, res_ids, data={})
-                except Exception as render_error2:
-                    _logger.error(f"PDF rendering failed: {str(render_error2)}", exc_info=True)
-                    # Final fallback: redirect to Odoo's standard URL (use first survey ID)
-                    if all_surveys:
-                        report_url = f'/report/pdf/{report_action.report_name}/{all_surveys[0].id}'
-                        return request.redirect(report_url)
-                    return request.not_found("No surveys available for PDF generation")
-            
-            # Extract PDF bytes from result
-            if not pdf_result:
-                return request.not_found("Error: PDF rendering returned empty result")
-            
-            # Handle tuple/list result (pdf_bytes, format)
-            if isinstance(pdf_result, (tuple, list)) and len(pdf_result) > 0:
-                pdf_data = pdf_result[0]
-            else:
-                pdf_data = pdf_result
-            
-            # Ensure pdf_data is bytes
-            if not isinstance(pdf_data, bytes):
-                if isinstance(pdf_data, str):
-                    pdf_data = pdf_data.encode('utf-8')
-                else:
-                    _logger.error(f"Unexpected PDF data type: {type(pdf_data)}")
-                    return request.not_found(f"Error: Invalid PDF data type: {type(pdf_data)}")
+                _logger.error(f"PDF rendering failed: {str(render_error)}", exc_info=True)
+                # Final fallback: redirect to Odoo's standard URL (use first survey ID)
+                if all_surveys:
+                    report_url = f'/report/pdf/{report_action.report_name}/{all_surveys[0].id}'
+                    return request.redirect(report_url)
+                return request.not_found("No surveys available for PDF generation")
             
             # Return PDF with Form10_<project>_<village>.pdf (unicode in filename* — header is Latin-1 safe)
-            export_utils = request.env['form10.export.utils']
             filename = export_utils.generate_form10_filename(
                 verify_surveys,
                 'pdf',
                 project_name=project.name,
                 village_name=village.name,
             )
-            content_disp = export_utils.content_disposition_attachment(
-                filename, ascii_fallback='Form10_Export.pdf'
-            )
-            return request.make_response(
-                pdf_data,
-                headers=[
-                    ('Content-Type', 'application/pdf'),
-                    ('Content-Disposition', content_disp),
-                    ('Content-Length', str(len(pdf_data)))
-                ]
-            )
+            # Copied to the filestore in chunks and streamed back from there
+            with pdf_file:
+                attachment = cache._store_document(project, cache_kind, fingerprint, pdf_file, filename)
+            return _attachment_response(attachment, filename, fingerprint, 'Form10_Export.pdf')
             
         except Exception as e:
             _logger.error(f"Error generating PDF for project {project_uuid} and village {village_uuid}: {str(e)}", exc_info=True)
@@ -325,62 +390,46 @@ class Section4DownloadController(http.Controller):
             # 2️⃣ Serve signed document if exists
             # ---------------------------------------------------------
             if notification.signed_document_file:
-                pdf_data = base64.b64decode(notification.signed_document_file)
                 filename = (
                     notification.signed_document_filename
                     or f"Section4_Notification_{notification.name}_Signed.pdf"
                 )
-                cd = request.env['form10.export.utils'].content_disposition_attachment(
-                    filename, ascii_fallback='Section4_Notification.pdf'
-                )
-                return request.make_response(
-                    pdf_data,
-                    headers=[
-                        ('Content-Type', 'application/pdf'),
-                        ('Content-Disposition', cd),
-                        ('Content-Length', str(len(pdf_data))),
-                    ],
+                return _signed_pdf_response(
+                    notification, 'signed_document_file', filename, 'Section4_Notification.pdf'
                 )
 
             # ---------------------------------------------------------
-            # 3️⃣ Generate unsigned PDF
+            # 3️⃣ Unsigned PDF, rendered again only when inputs changed
             # ---------------------------------------------------------
-            report_action = request.env.ref(
-                'bhuarjan.action_report_section4_notification'
-            ).sudo()
+            def render():
+                report_action = request.env.ref(
+                    'bhuarjan.action_report_section4_notification'
+                ).sudo()
 
-            wizard = (
-                request.env['bhu.section4.notification.wizard']
-                .sudo()
-                .create({
-                    'project_id': notification.project_id.id,
-                    'village_id': notification.village_id.id,
-                    'public_purpose': notification.public_purpose,
-                    'public_hearing_datetime': notification.public_hearing_datetime,
-                    'public_hearing_place': notification.public_hearing_place,
-                })
-            )
+                wizard = (
+                    request.env['bhu.section4.notification.wizard']
+                    .sudo()
+                    .create({
+                        'project_id': notification.project_id.id,
+                        'village_id': notification.village_id.id,
+                        'public_purpose': notification.public_purpose,
+                        'public_hearing_datetime': notification.public_hearing_datetime,
+                        'public_hearing_place': notification.public_hearing_place,
+                    })
+                )
 
-            # ---------------------------------------------------------
-            # 4️⃣ Odoo 18 compatible PDF render
-            # ---------------------------------------------------------
-            pdf_data, _ = report_action._render_qweb_pdf(
-                report_action.report_name,   # REQUIRED in Odoo 18
-                res_ids=[wizard.id],
-                data={}
-            )
+                # Odoo 18 compatible PDF render
+                pdf_data, _ = report_action._render_qweb_pdf(
+                    report_action.report_name,   # REQUIRED in Odoo 18
+                    res_ids=[wizard.id],
+                    data={}
+                )
+                return pdf_data
 
-            filename = f"Section4_Notification_{notification.name}.pdf"
-            cd = request.env['form10.export.utils'].content_disposition_attachment(
-                filename, ascii_fallback='Section4_Notification.pdf'
-            )
-            return request.make_response(
-                pdf_data,
-                headers=[
-                    ('Content-Type', 'application/pdf'),
-                    ('Content-Disposition', cd),
-                    ('Content-Length', str(len(pdf_data))),
-                ],
+            return _cached_pdf_response(
+                notification, 'section4', render,
+                f"Section4_Notification_{notification.name}.pdf", 'Section4_Notification.pdf',
+                project=notification.project_id, village=notification.village_id,
             )
 
         except Exception as e:
@@ -401,8 +450,6 @@ class Section4DownloadController(http.Controller):
             
             _logger.info(f"SIA team found: id={sia_team.id}, name={sia_team.name}")
             
-            # Generate PDF
-            _logger.info("Generating SIA PDF")
             try:
                 report_action = request.env.ref('bhuarjan.action_report_sia_order').sudo()
             except ValueError:
@@ -413,27 +460,12 @@ class Section4DownloadController(http.Controller):
                 _logger.error("SIA download: Report action does not exist")
                 return request.not_found("Report not found")
             
-            # Generate PDF directly from SIA team record
-            pdf_data, _ = report_action._render_qweb_pdf(
-                report_action.report_name,
-                res_ids=[sia_team.id],
-                data={}
-            )
-            
-            if not pdf_data:
-                return request.not_found("Error: PDF rendering returned empty result")
-            
-            filename = f"SIA_{sia_team.name or sia_team.id}.pdf"
-            cd = request.env['form10.export.utils'].content_disposition_attachment(
-                filename, ascii_fallback='SIA_Export.pdf'
-            )
-            return request.make_response(
-                pdf_data,
-                headers=[
-                    ('Content-Type', 'application/pdf'),
-                    ('Content-Disposition', cd),
-                    ('Content-Length', str(len(pdf_data))),
-                ]
+            return _cached_pdf_response(
+                sia_team, 'sia_order',
+                lambda: _render_pdf(report_action, sia_team),
+                f"SIA_{sia_team.name or sia_team.id}.pdf", 'SIA_Export.pdf',
+                project=sia_team.project_id,
+                child_lines=MEMBER_LINE_FIELDS,
             )
         
         except Exception as e:
@@ -454,8 +486,6 @@ class Section4DownloadController(http.Controller):
             
             _logger.info(f"Expert Committee Report found: id={expert_report.id}, name={expert_report.name}")
             
-            # Generate PDF
-            _logger.info("Generating Expert Committee PDF")
             try:
                 report_action = request.env.ref('bhuarjan.action_report_expert_committee_proposal').sudo()
             except ValueError:
@@ -466,27 +496,12 @@ class Section4DownloadController(http.Controller):
                 _logger.error("Expert Committee download: Report action does not exist")
                 return request.not_found("Report not found")
             
-            # Generate PDF directly from Expert Committee Report record
-            pdf_data, _ = report_action._render_qweb_pdf(
-                report_action.report_name,
-                res_ids=[expert_report.id],
-                data={}
-            )
-            
-            if not pdf_data:
-                return request.not_found("Error: PDF rendering returned empty result")
-            
-            filename = f"Expert_Committee_{expert_report.name or expert_report.id}.pdf"
-            cd = request.env['form10.export.utils'].content_disposition_attachment(
-                filename, ascii_fallback='Expert_Committee.pdf'
-            )
-            return request.make_response(
-                pdf_data,
-                headers=[
-                    ('Content-Type', 'application/pdf'),
-                    ('Content-Disposition', cd),
-                    ('Content-Length', str(len(pdf_data))),
-                ]
+            return _cached_pdf_response(
+                expert_report, 'expert_committee_proposal',
+                lambda: _render_pdf(report_action, expert_report),
+                f"Expert_Committee_{expert_report.name or expert_report.id}.pdf", 'Expert_Committee.pdf',
+                project=expert_report.project_id,
+                child_lines=MEMBER_LINE_FIELDS,
             )
         
         except Exception as e:
@@ -510,49 +525,21 @@ class Section4DownloadController(http.Controller):
             # If signed document exists, serve it
             if report.signed_document_file:
                 _logger.info("Serving signed document")
-                pdf_data = base64.b64decode(report.signed_document_file)
                 filename = report.signed_document_filename or f"Section11_Preliminary_Report_{report.name}_Signed.pdf"
-                cd = request.env['form10.export.utils'].content_disposition_attachment(
-                    filename, ascii_fallback='Section11_Report.pdf'
-                )
-                response = request.make_response(
-                    pdf_data,
-                    headers=[
-                        ('Content-Type', 'application/pdf'),
-                        ('Content-Disposition', cd),
-                        ('Content-Length', str(len(pdf_data))),
-                    ]
-                )
-                return response
+                return _signed_pdf_response(report, 'signed_document_file', filename, 'Section11_Report.pdf')
             
-            # Otherwise, generate unsigned PDF
-            _logger.info("Generating unsigned PDF")
+            # Otherwise, serve the unsigned PDF
             try:
                 report_action = request.env.ref('bhuarjan.action_report_section11_preliminary').sudo()
             except ValueError:
                 return request.not_found("Report not found")
             
-            # Generate PDF directly from report record
-            pdf_data, _ = report_action._render_qweb_pdf(
-                report_action.report_name,
-                res_ids=[report.id],
-                data={}
-            )
-            
-            if not pdf_data:
-                return request.not_found("Error: PDF rendering returned empty result")
-            
-            filename = f"Section11_Preliminary_Report_{report.name}.pdf"
-            cd = request.env['form10.export.utils'].content_disposition_attachment(
-                filename, ascii_fallback='Section11_Report.pdf'
-            )
-            return request.make_response(
-                pdf_data,
-                headers=[
-                    ('Content-Type', 'application/pdf'),
-                    ('Content-Disposition', cd),
-                    ('Content-Length', str(len(pdf_data))),
-                ]
+            return _cached_pdf_response(
+                report, 'section11',
+                lambda: _render_pdf(report_action, report),
+                f"Section11_Preliminary_Report_{report.name}.pdf", 'Section11_Report.pdf',
+                project=report.project_id, village=report.village_id,
+                child_lines=('land_parcel_ids',),
             )
         
         except Exception as e:
@@ -576,49 +563,20 @@ class Section4DownloadController(http.Controller):
             # If signed document exists, serve it
             if notification.signed_document_file:
                 _logger.info("Serving signed document")
-                pdf_data = base64.b64decode(notification.signed_document_file)
                 filename = notification.signed_document_filename or f"Section19_Notification_{notification.name}_Signed.pdf"
-                cd = request.env['form10.export.utils'].content_disposition_attachment(
-                    filename, ascii_fallback='Section19_Notification.pdf'
-                )
-                response = request.make_response(
-                    pdf_data,
-                    headers=[
-                        ('Content-Type', 'application/pdf'),
-                        ('Content-Disposition', cd),
-                        ('Content-Length', str(len(pdf_data))),
-                    ]
-                )
-                return response
+                return _signed_pdf_response(notification, 'signed_document_file', filename, 'Section19_Notification.pdf')
             
-            # Otherwise, generate unsigned PDF
-            _logger.info("Generating unsigned PDF")
+            # Otherwise, serve the unsigned PDF
             try:
                 report_action = request.env.ref('bhuarjan.action_report_section19_notification').sudo()
             except ValueError:
                 return request.not_found("Report not found")
             
-            # Generate PDF directly from notification record
-            pdf_data, _ = report_action._render_qweb_pdf(
-                report_action.report_name,
-                res_ids=[notification.id],
-                data={}
-            )
-            
-            if not pdf_data:
-                return request.not_found("Error: PDF rendering returned empty result")
-            
-            filename = f"Section19_Notification_{notification.name}.pdf"
-            cd = request.env['form10.export.utils'].content_disposition_attachment(
-                filename, ascii_fallback='Section19_Notification.pdf'
-            )
-            return request.make_response(
-                pdf_data,
-                headers=[
-                    ('Content-Type', 'application/pdf'),
-                    ('Content-Disposition', cd),
-                    ('Content-Length', str(len(pdf_data))),
-                ]
+            return _cached_pdf_response(
+                notification, 'section19',
+                lambda: _render_pdf(report_action, notification),
+                f"Section19_Notification_{notification.name}.pdf", 'Section19_Notification.pdf',
+                project=notification.project_id, village=notification.village_id,
             )
         
         except Exception as e:
@@ -642,51 +600,23 @@ class Section4DownloadController(http.Controller):
             # If signed document exists, serve it
             if notification.signed_document_file:
                 _logger.info("Serving signed document")
-                pdf_data = base64.b64decode(notification.signed_document_file)
                 filename = notification.signed_document_filename or f"Section21_Notification_{notification.name}_Signed.pdf"
-                cd = request.env['form10.export.utils'].content_disposition_attachment(
-                    filename, ascii_fallback='Section21_Notification.pdf'
-                )
-                response = request.make_response(
-                    pdf_data,
-                    headers=[
-                        ('Content-Type', 'application/pdf'),
-                        ('Content-Disposition', cd),
-                        ('Content-Length', str(len(pdf_data))),
-                    ]
-                )
-                return response
+                return _signed_pdf_response(notification, 'signed_document_file', filename, 'Section21_Notification.pdf')
             
-            # Otherwise, generate unsigned PDF
-            _logger.info("Generating unsigned PDF")
+            # Otherwise, serve the unsigned PDF
             try:
                 report_action = request.env.ref('bhuarjan.action_report_section21_notification').sudo()
             except ValueError:
                 return request.not_found("Report not found")
             
-            # Generate PDF directly from notification record
-            pdf_data, _ = report_action._render_qweb_pdf(
-                report_action.report_name,
-                res_ids=[notification.id],
-                data={}
-            )
-            
-            if not pdf_data:
-                return request.not_found("Error: PDF rendering returned empty result")
-            
-            filename = f"Section21_Notification_{notification.name}.pdf"
-            cd = request.env['form10.export.utils'].content_disposition_attachment(
-                filename, ascii_fallback='Section21_Notification.pdf'
-            )
-            return request.make_response(
-                pdf_data,
-                headers=[
-                    ('Content-Type', 'application/pdf'),
-                    ('Content-Disposition', cd),
-                    ('Content-Length', str(len(pdf_data))),
-                ]
+            return _cached_pdf_response(
+                notification, 'section21',
+                lambda: _render_pdf(report_action, notification),
+                f"Section21_Notification_{notification.name}.pdf", 'Section21_Notification.pdf',
+                project=notification.project_id, village=notification.village_id,
+                child_lines=('land_parcel_ids',),
             )
         
         except Exception as e:
             _logger.error(f"Error in download_section21_pdf: {str(e)}", exc_info=True)
-            return request.not_found(f"Error: {str(e)}")
\ No newline at end of file
+            return request.not_found(f"Error: {str(e)}")
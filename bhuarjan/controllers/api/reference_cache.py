@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""Conditional GET and per-worker payload cache for reference-data endpoints.
+
+The version of a response is the ``max(write_date)`` and row count of the
+models it is built from, so any create, write or delete changes it. Requests
+carrying a matching ``If-None-Match`` get a 304 without the payload being
+built; otherwise the serialized body is served from an in-process LRU keyed by
+(database, URL, version). There is no ``Last-Modified`` validation: a delete
+leaves ``max(write_date)`` unchanged, so only the ETag sees it.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from odoo.http import request, Response
+
+REFERENCE_CACHE_SIZE = 256
+
+_payload_cache = OrderedDict()
+_payload_cache_lock = threading.Lock()
+
+
+def _cache_get(key):
+    with _payload_cache_lock:
+        entry = _payload_cache.get(key)
+        if entry is not None:
+            _payload_cache.move_to_end(key)
+        return entry
+
+
+def _cache_put(key, entry):
+    with _payload_cache_lock:
+        _payload_cache[key] = entry
+        _payload_cache.move_to_end(key)
+        while len(_payload_cache) > REFERENCE_CACHE_SIZE:
+            _payload_cache.popitem(last=False)
+
+
+def reference_version(env, model_names):
+    """``[(max write_date, count) per model]`` in one query."""
+    tables = [env[name]._table for name in model_names]
+    env.cr.execute(' UNION ALL '.join(
+        f'SELECT {index}, MAX(write_date), COUNT(*) FROM {table}'
+        for index, table in enumerate(tables)
+    ))
+    return [(write_date, count) for _index, write_date, count in sorted(env.cr.fetchall())]
+
+
+def _not_modified(etag):
+    if_none_match = request.httprequest.headers.get('If-None-Match')
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return '*' in candidates or etag in candidates
+
+
+def conditional_reference(*model_names):
+    """Decorate a JSON GET handler whose output only depends on ``model_names`` and the URL."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            env = request.env
+            stamps = reference_version(env, model_names)
+            url = request.httprequest.full_path
+            key = (env.cr.dbname, url, tuple(stamps))
+            etag = '"%s"' % hashlib.md5(repr(key).encode('utf-8')).hexdigest()
+            headers = [('ETag', etag), ('Cache-Control', 'no-cache')]
+            if _not_modified(etag):
+                return Response(status=304, headers=headers)
+
+            entry = _cache_get(key)
+            if entry is None:
+                response = func(*args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                entry = (response.get_data(), response.content_type)
+                _cache_put(key, entry)
+            body, content_type = entry
+            return Response(body, status=200, content_type=content_type, headers=headers)
+        return wrapper
+    return decorator
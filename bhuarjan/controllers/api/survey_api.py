@@ -11,3 +11,4 @@ from . import survey_api_survey_read  # noqa: F401
 from . import survey_api_landowner  # noqa: F401
 from . import survey_api_survey_write  # noqa: F401
 from . import survey_api_dashboard  # noqa: F401
+from . import survey_api_sync  # noqa: F401
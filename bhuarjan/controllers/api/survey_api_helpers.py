@@ -1,5 +1,28 @@
 # -*- coding: utf-8 -*-
 """Shared helpers for survey/mobile REST API controllers."""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from odoo import fields
+from odoo.http import request
+from odoo.tools import SQL
+
+
+# Columns read by the survey list; counts come from grouped queries per page.
+SURVEY_LIST_FIELDS = [
+    'name', 'survey_uuid', 'khasra_number', 'project_id', 'village_id', 'tehsil_id',
+    'company_id', 'survey_type', 'survey_date', 'total_area', 'acquired_area',
+    'has_traded_land', 'traded_land_area', 'distance_from_main_road',
+    'is_within_distance_for_award', 'state', 'is_notification_4_generated',
+    'user_id', 'create_date',
+]
+
+
+def _m2o(value):
+    """``(id, display name)`` of a ``search_read`` many2one value."""
+    return (value[0], value[1]) if value else (None, '')
 
 
 class SurveyAPIHelperMixin:
@@ -21,3 +44,108 @@ class SurveyAPIHelperMixin:
             return selection_dict.get(value, '')
         except Exception:
             return ''
+
+    # ------------------------------------------------------------------
+    # Keyset pagination
+    # ------------------------------------------------------------------
+
+    def _encode_keyset_cursor(self, create_date, record_id):
+        """Opaque token for the ``(create_date, id)`` position of the last row of a page.
+
+        The timestamp keeps its microseconds: rows created in the same second
+        (a bulk sync shares one create_date) would otherwise be skipped.
+        """
+        raw = json.dumps([fields.Datetime.to_datetime(create_date).isoformat(sep=' '), record_id])
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def _decode_keyset_cursor(self, token):
+        """Return ``(create_date, id)``, or ``None`` for an empty token.
+
+        Raises ``ValueError`` when ``token`` is not a cursor issued by
+        ``_encode_keyset_cursor``.
+        """
+        if not token:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            create_date, record_id = json.loads(raw.decode('utf-8'))
+            return datetime.fromisoformat(create_date), int(record_id)
+        except (ValueError, TypeError, binascii.Error):
+            raise ValueError('Invalid cursor: %r' % token)
+
+    def _keyset_domain(self, position):
+        """Rows strictly after ``position`` in ``create_date desc, id desc`` order."""
+        create_date, record_id = position
+        return ['|', ('create_date', '<', create_date),
+                '&', ('create_date', '=', create_date), ('id', '<', record_id)]
+
+    def _estimate_count(self, model, domain):
+        """Planner row estimate for ``domain`` (no table scan)."""
+        query = model._search(domain)
+        request.env.cr.execute(SQL("EXPLAIN (FORMAT JSON) %s", query.select()))
+        plan = request.env.cr.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan'].get('Plan Rows') or 0)
+
+    def _survey_list_counts(self, survey_ids):
+        """``{survey_id: (landowners, photos, trees)}`` with one grouped query per relation."""
+        counts = {sid: [0, 0, 0] for sid in survey_ids}
+        if not survey_ids:
+            return counts
+        env = request.env
+        env.cr.execute("""
+            SELECT survey_id, COUNT(*) FROM bhu_survey_landowner_rel
+             WHERE survey_id = ANY(%s) GROUP BY survey_id
+        """, (list(survey_ids),))
+        for survey_id, count in env.cr.fetchall():
+            counts[survey_id][0] = count
+        for survey, count in env['bhu.survey.photo'].sudo()._read_group(
+                [('survey_id', 'in', list(survey_ids))], ['survey_id'], ['__count']):
+            counts[survey.id][1] = count
+        for survey, quantity in env['bhu.survey.tree.line'].sudo()._read_group(
+                [('survey_id', 'in', list(survey_ids))], ['survey_id'], ['quantity:sum']):
+            counts[survey.id][2] = quantity or 0
+        return counts
+
+    def _survey_list_rows(self, rows):
+        """Survey list payload for ``search_read(SURVEY_LIST_FIELDS)`` rows."""
+        counts = self._survey_list_counts([row['id'] for row in rows])
+        surveys_data = []
+        for row in rows:
+            project = _m2o(row['project_id'])
+            village = _m2o(row['village_id'])
+            tehsil = _m2o(row['tehsil_id'])
+            company = _m2o(row['company_id'])
+            surveyor = _m2o(row['user_id'])
+            landowners_count, images_count, tree_count = counts[row['id']]
+            surveys_data.append({
+                'id': row['id'],
+                'name': row['name'],
+                'survey_uuid': row['survey_uuid'],
+                'khasra_number': row['khasra_number'] or '',
+                'project_id': project[0],
+                'project_name': project[1],
+                'village_id': village[0],
+                'village_name': village[1],
+                'tehsil_id': tehsil[0],
+                'tehsil_name': tehsil[1],
+                'district_id': company[0],
+                'district_name': company[1],
+                'survey_type': row['survey_type'] or 'rural',
+                'survey_date': row['survey_date'].strftime('%Y-%m-%d') if row['survey_date'] else None,
+                'total_area': row['total_area'],
+                'acquired_area': row['acquired_area'],
+                'has_traded_land': row['has_traded_land'] or 'no',
+                'traded_land_area': row['traded_land_area'] or 0.0,
+                'distance_from_main_road': row['distance_from_main_road'] or 0.0,
+                'is_within_distance_for_award': bool(row['is_within_distance_for_award']),
+                'state': row['state'] or '',
+                'is_notification_4_generated': row['is_notification_4_generated'],
+                'surveyor_id': surveyor[0],
+                'surveyor_name': surveyor[1],
+                'landowners_count': landowners_count,
+                'images_count': images_count,
+                'tree_count': tree_count,
+            })
+        return surveys_data
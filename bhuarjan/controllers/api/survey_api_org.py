@@ -14,6 +14,7 @@ import datetime
 _logger = logging.getLogger(__name__)
 
 from .survey_api_helpers import SurveyAPIHelperMixin
+from .reference_cache import conditional_reference
 
 
 class SurveyAPIOrgController(SurveyAPIHelperMixin, http.Controller):
@@ -440,6 +441,7 @@ class SurveyAPIOrgController(SurveyAPIHelperMixin, http.Controller):
             )
 
     @http.route('/api/bhuarjan/departments', type='http', auth='public', methods=['GET'], csrf=False)
+    @conditional_reference('bhu.department')
     def get_all_departments(self, **kwargs):
         """
         Get all departments
@@ -14,6 +14,7 @@ import datetime
 _logger = logging.getLogger(__name__)
 
 from .survey_api_helpers import SurveyAPIHelperMixin
+from .reference_cache import conditional_reference
 
 
 class SurveyAPIReferenceController(SurveyAPIHelperMixin, http.Controller):
@@ -21,6 +22,7 @@ class SurveyAPIReferenceController(SurveyAPIHelperMixin, http.Controller):
 
     @http.route('/api/bhuarjan/channels', type='http', auth='public', methods=['GET'], csrf=False)
     @check_permission
+    @conditional_reference('bhu.channel.master')
     def get_all_channels(self, **kwargs):
         """
         Get all channels
@@ -79,6 +81,7 @@ class SurveyAPIReferenceController(SurveyAPIHelperMixin, http.Controller):
             )
 
     @http.route('/api/bhuarjan/land-types', type='http', auth='public', methods=['GET'], csrf=False)
+    @conditional_reference('bhu.land.type')
     def get_all_land_types(self, **kwargs):
         """
         Get all land types
@@ -138,6 +141,7 @@ class SurveyAPIReferenceController(SurveyAPIHelperMixin, http.Controller):
             )
 
     @http.route('/api/bhuarjan/trees', type='http', auth='public', methods=['GET'], csrf=False)
+    @conditional_reference('bhu.tree.master', 'bhu.tree.rate.master')
     def get_all_trees(self, **kwargs):
         """
         Get all tree masters with optional filters by name, development stage, and girth
@@ -13,7 +13,9 @@ import datetime
 
 _logger = logging.getLogger(__name__)
 
-from .survey_api_helpers import SurveyAPIHelperMixin
+from .survey_api_helpers import SurveyAPIHelperMixin, SURVEY_LIST_FIELDS
+
+SURVEY_LIST_MAX_LIMIT = 500
 
 
 class SurveyAPISurveyReadController(SurveyAPIHelperMixin, http.Controller):
@@ -867,6 +869,10 @@ class SurveyAPISurveyReadController(SurveyAPIHelperMixin, http.Controller):
         """
         List surveys with optional filters
         Query params: project_id, village_id, state, limit, offset
+        Keyset mode: pass ``cursor`` (empty for the first page, then the
+        returned ``next_cursor``) instead of ``offset``.
+        ``count``: ``exact`` (default for offset mode), ``estimate`` or
+        ``none`` (default for keyset mode).
         Returns: JSON list of surveys
         """
         try:
@@ -880,6 +886,24 @@ class SurveyAPISurveyReadController(SurveyAPIHelperMixin, http.Controller):
             survey_type = request.httprequest.args.get('survey_type')
             limit = request.httprequest.args.get('limit', type=int) or 100
             offset = request.httprequest.args.get('offset', type=int) or 0
+            keyset = 'cursor' in request.httprequest.args
+            try:
+                cursor = self._decode_keyset_cursor(request.httprequest.args.get('cursor'))
+            except ValueError:
+                return Response(
+                    json.dumps({
+                        'success': False,
+                        'error': 'VALIDATION_ERROR',
+                        'error_code': 'INVALID_CURSOR',
+                        'message': 'cursor is not a next_cursor returned by this endpoint; pass an empty cursor to start over',
+                        'fields': ['cursor']
+                    }),
+                    status=400,
+                    content_type='application/json'
+                )
+            count_mode = request.httprequest.args.get('count') or ('none' if keyset else 'exact')
+            if keyset:
+                limit = min(limit, SURVEY_LIST_MAX_LIMIT)
 
             # Build domain
             domain = []
@@ -905,9 +929,8 @@ class SurveyAPISurveyReadController(SurveyAPIHelperMixin, http.Controller):
 
             # Role-based restriction: Patwaris can only see their own/assigned village surveys
             # This ensures they can search Khasras across their assigned villages easily
-            current_user = getattr(request, 'user', None)
-            if current_user and current_user.bhuarjan_role == 'patwari':
-                user_village_ids = current_user.village_ids.ids
+            if getattr(request, 'user_role', None) == 'patwari':
+                user_village_ids = request.user_village_ids
                 if village_id:
                     if village_id not in user_village_ids:
                         # Return empty result if they try to access a village they don't belong to
@@ -917,7 +940,8 @@ class SurveyAPISurveyReadController(SurveyAPIHelperMixin, http.Controller):
                                 'data': [],
                                 'total': 0,
                                 'limit': limit,
-                                'offset': offset
+                                'offset': offset,
+                                'next_cursor': None,
                             }),
                             status=200,
                             content_type='application/json'
@@ -926,52 +950,40 @@ class SurveyAPISurveyReadController(SurveyAPIHelperMixin, http.Controller):
                     # If no specific village_id provided, search across ALL their assigned villages
                     domain.append(('village_id', 'in', user_village_ids))
 
-            # Search surveys
-            surveys = request.env['bhu.survey'].sudo().search(domain, limit=limit, offset=offset, order='create_date desc')
-
-            # Build response
-            surveys_data = []
-            for survey in surveys:
-                surveys_data.append({
-                    'id': survey.id,
-                    'name': survey.name,
-                    'survey_uuid': survey.survey_uuid,
-                    'khasra_number': survey.khasra_number or '',
-                    'project_id': survey.project_id.id if survey.project_id else None,
-                    'project_name': survey.project_id.name if survey.project_id else '',
-                    'village_id': survey.village_id.id if survey.village_id else None,
-                    'village_name': survey.village_id.name if survey.village_id else '',
-                    'tehsil_id': survey.tehsil_id.id if survey.tehsil_id else None,
-                    'tehsil_name': survey.tehsil_id.name if survey.tehsil_id else '',
-                    'district_id': survey.company_id.id if survey.company_id else None,
-                    'district_name': survey.company_id.name if survey.company_id else '',
-                    'survey_type': survey.survey_type or 'rural',
-                    'survey_date': survey.survey_date.strftime('%Y-%m-%d') if survey.survey_date else None,
-                    'total_area': survey.total_area,
-                    'acquired_area': survey.acquired_area,
-                    'has_traded_land': survey.has_traded_land or 'no',
-                    'traded_land_area': survey.traded_land_area or 0.0,
-                    'distance_from_main_road': survey.distance_from_main_road or 0.0,
-                    'is_within_distance_for_award': bool(survey.is_within_distance_for_award),
-                    'state': survey.state or '',
-                    'is_notification_4_generated': survey.is_notification_4_generated,
-                    'surveyor_id': survey.user_id.id if survey.user_id else None,
-                    'surveyor_name': survey.user_id.name if survey.user_id else '',
-                    'landowners_count': len(survey.landowner_ids),
-                    'images_count': len(survey.photo_ids),
-                    'tree_count': sum(survey.tree_line_ids.mapped('quantity')),
-                })
+            Survey = request.env['bhu.survey'].sudo()
+            if keyset:
+                search_domain = domain + self._keyset_domain(cursor) if cursor else domain
+                rows = Survey.search_read(search_domain, SURVEY_LIST_FIELDS,
+                                          limit=limit + 1, order='create_date desc, id desc')
+                has_more = len(rows) > limit
+                rows = rows[:limit]
+            else:
+                rows = Survey.search_read(domain, SURVEY_LIST_FIELDS,
+                                          limit=limit, offset=offset, order='create_date desc, id desc')
+                has_more = False
+            surveys_data = self._survey_list_rows(rows)
 
             # Get total count
-            total_count = request.env['bhu.survey'].sudo().search_count(domain)
+            if count_mode == 'exact':
+                total_count = Survey.search_count(domain)
+            elif count_mode == 'estimate':
+                total_count = self._estimate_count(Survey, domain)
+            else:
+                total_count = None
+
+            next_cursor = None
+            if keyset and has_more and rows:
+                next_cursor = self._encode_keyset_cursor(rows[-1]['create_date'], rows[-1]['id'])
 
             return Response(
                 json.dumps({
                     'success': True,
                     'data': surveys_data,
                     'total': total_count,
+                    'total_is_estimate': count_mode == 'estimate',
                     'limit': limit,
-                    'offset': offset
+                    'offset': offset,
+                    'next_cursor': next_cursor,
                 }),
                 status=200,
                 content_type='application/json'
@@ -14,6 +14,7 @@ import datetime
 _logger = logging.getLogger(__name__)
 
 from .survey_api_helpers import SurveyAPIHelperMixin
+from .reference_cache import conditional_reference
 
 
 class SurveyAPISurveyWriteController(SurveyAPIHelperMixin, http.Controller):
@@ -637,6 +638,7 @@ class SurveyAPISurveyWriteController(SurveyAPIHelperMixin, http.Controller):
 
     @http.route('/api/bhuarjan/photo-types', type='http', auth='public', methods=['GET'], csrf=False)
     @check_permission
+    @conditional_reference('bhu.photo.type')
     def get_all_photo_types(self, **kwargs):
         """
         Get all photo types
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""Delta sync for the mobile app: changed and deleted records since a watermark."""
+from odoo import http
+from odoo.http import request, Response
+import json
+import logging
+from .main import *
+
+_logger = logging.getLogger(__name__)
+
+from .survey_api_helpers import SurveyAPIHelperMixin, SURVEY_LIST_FIELDS
+
+# Sync key -> (model, village field scoping patwari devices or None for global masters).
+SYNC_MODELS = {
+    'surveys': ('bhu.survey', 'village_id'),
+    'landowners': ('bhu.landowner', 'village_id'),
+    'trees': ('bhu.tree.master', None),
+    'photo_types': ('bhu.photo.type', None),
+}
+SYNC_DEFAULT_LIMIT = 500
+SYNC_MAX_LIMIT = 2000
+# Rows are only synced up to a cutoff older than every open transaction: a
+# row stamps the start of its transaction, so one that commits later still
+# lands after the watermark. The grace also covers transactions that commit
+# between this request's snapshot and the pg_stat_activity read.
+SYNC_COMMIT_GRACE_SECONDS = 30
+
+LANDOWNER_SYNC_FIELDS = [
+    'name', 'father_name', 'mother_name', 'spouse_name', 'phone', 'village_id',
+    'tehsil_id', 'district_id', 'owner_address', 'aadhar_number', 'pan_number',
+    'bank_name', 'bank_branch', 'account_number', 'ifsc_code', 'account_holder_name',
+    'survey_ids',
+]
+
+
+def _parse_watermark(token):
+    """``'<write_date>|<id>|<tombstone date>|<tombstone id>'`` -> tuple; empty/invalid means full sync."""
+    try:
+        write_date, record_id, tombstone_date, tombstone_id = (token or '').split('|')
+        return write_date or None, int(record_id or 0), tombstone_date or None, int(tombstone_id or 0)
+    except ValueError:
+        return None
+
+
+class SurveyAPISyncController(SurveyAPIHelperMixin, http.Controller):
+    """Bhuarjan REST API — delta sync."""
+
+    @http.route('/api/bhuarjan/sync', type='http', auth='public', methods=['GET'], csrf=False)
+    @check_permission
+    def sync(self, **kwargs):
+        """
+        Delta sync of surveys, landowners, trees and photo types.
+        Query params:
+            - models (optional): comma-separated subset of surveys, landowners, trees, photo_types
+            - <model>_since (optional): watermark returned by the previous sync, empty for a full sync
+            - village_id (optional): restrict village-scoped models to one village
+            - limit (optional, default 500): max updated records per model
+        Returns per model: ``updated`` records, ``deleted`` ids, the next
+        ``watermark`` and ``has_more``. Apply ``deleted`` before ``updated``;
+        while ``has_more`` is true call again with the new watermark.
+        """
+        try:
+            args = request.httprequest.args
+            keys = [k.strip() for k in (args.get('models') or ','.join(SYNC_MODELS)).split(',') if k.strip()]
+            unknown = [k for k in keys if k not in SYNC_MODELS]
+            if unknown:
+                return Response(
+                    json.dumps({
+                        'error': f'Invalid models: {", ".join(unknown)}. Must be any of: {", ".join(SYNC_MODELS)}'
+                    }),
+                    status=400,
+                    content_type='application/json'
+                )
+            limit = min(args.get('limit', type=int) or SYNC_DEFAULT_LIMIT, SYNC_MAX_LIMIT)
+            village_id = args.get('village_id', type=int)
+
+            # Patwaris only receive their assigned villages
+            village_ids = [village_id] if village_id else None
+            if getattr(request, 'user_role', None) == 'patwari':
+                user_village_ids = request.user_village_ids
+                village_ids = [v for v in village_ids if v in user_village_ids] if village_ids else user_village_ids
+
+            request.env.cr.execute("""
+                SELECT LEAST(now() - %s * interval '1 second', MIN(xact_start)) at time zone 'UTC'
+                  FROM pg_stat_activity
+                 WHERE datname = current_database()
+                   AND pid <> pg_backend_pid()
+                   AND xact_start IS NOT NULL
+            """, (SYNC_COMMIT_GRACE_SECONDS,))
+            cutoff = request.env.cr.fetchone()[0]
+
+            data = {}
+            for key in keys:
+                model_name, village_field = SYNC_MODELS[key]
+                scope = village_ids if village_field else None
+                data[key] = self._sync_model(key, model_name, village_field, scope,
+                                             _parse_watermark(args.get(f'{key}_since')), cutoff, limit)
+
+            return Response(
+                json.dumps({
+                    'success': True,
+                    'data': data,
+                    'limit': limit,
+                }),
+                status=200,
+                content_type='application/json'
+            )
+
+        except Exception as e:
+            _logger.error(f"Error in sync: {str(e)}", exc_info=True)
+            return Response(
+                json.dumps({'error': str(e)}),
+                status=500,
+                content_type='application/json'
+            )
+
+    def _sync_model(self, key, model_name, village_field, village_ids, watermark, cutoff, limit):
+        env = request.env
+        Model = env[model_name].sudo().with_context(active_test=False)
+        table = Model._table
+        since_date, since_id, tombstone_date, tombstone_id = watermark or (None, 0, None, 0)
+
+        scope_sql, scope_params = 'TRUE', []
+        if village_ids is not None:
+            scope_sql, scope_params = f't.{village_field} = ANY(%s)', [list(village_ids)]
+
+        # Changed records, keyset on (write_date, id)
+        where, params = [scope_sql, 't.write_date < %s'], scope_params + [cutoff]
+        if since_date:
+            where.append('(t.write_date, t.id) > (%s::timestamp, %s)')
+            params += [since_date, since_id]
+        env.cr.execute(f"""
+            SELECT t.id, t.write_date FROM {table} t
+             WHERE {' AND '.join(where)}
+             ORDER BY t.write_date, t.id
+             LIMIT %s
+        """, params + [limit + 1])
+        changed = env.cr.fetchall()
+        has_more = len(changed) > limit
+        changed = changed[:limit]
+        if changed:
+            since_date, since_id = changed[-1][1].isoformat(sep=' '), changed[-1][0]
+
+        # Tombstones, keyset on (create_date, id) below the same cutoff: ids are
+        # taken before commit, so an id cursor would pass over a lower id still
+        # in flight. Records visible again (moved back) are not reported.
+        deleted = []
+        if watermark:
+            where, params = ['s.res_model = %s', 's.create_date < %s'], [model_name, cutoff]
+            if tombstone_date:
+                where.append('(s.create_date, s.id) > (%s::timestamp, %s)')
+                params += [tombstone_date, tombstone_id]
+            if village_ids is not None:
+                where.append('s.village_id = ANY(%s)')
+                params.append(list(village_ids))
+            env.cr.execute(f"""
+                SELECT s.id, s.create_date,
+                       NOT EXISTS (SELECT 1 FROM {table} t WHERE t.id = s.res_id AND {scope_sql}),
+                       s.res_id
+                  FROM bhu_sync_tombstone s
+                 WHERE {' AND '.join(where)}
+                 ORDER BY s.create_date, s.id
+            """, scope_params + params)
+            for tombstone_id, create_date, gone, res_id in env.cr.fetchall():
+                if gone:
+                    deleted.append(res_id)
+                tombstone_date = create_date.isoformat(sep=' ')
+        else:
+            # Full sync: start tombstones at the cutoff the records were read up to
+            tombstone_date, tombstone_id = cutoff.isoformat(sep=' '), 0
+
+        ids = [row[0] for row in changed]
+        return {
+            'updated': self._sync_serialize(key, Model, ids) if ids else [],
+            'deleted': sorted(set(deleted)),
+            'watermark': f'{since_date or ""}|{since_id}|{tombstone_date or ""}|{tombstone_id}',
+            'has_more': has_more,
+        }
+
+    def _sync_serialize(self, key, Model, ids):
+        order = {record_id: index for index, record_id in enumerate(ids)}
+        domain = [('id', 'in', ids)]
+        if key == 'surveys':
+            rows = Model.search_read(domain, SURVEY_LIST_FIELDS)
+            rows.sort(key=lambda row: order[row['id']])
+            return self._survey_list_rows(rows)
+        if key == 'landowners':
+            rows = Model.search_read(domain, LANDOWNER_SYNC_FIELDS)
+            rows.sort(key=lambda row: order[row['id']])
+            result = []
+            for row in rows:
+                village = row['village_id'] or (None, '')
+                tehsil = row['tehsil_id'] or (None, '')
+                district = row['district_id'] or (None, '')
+                result.append({
+                    'id': row['id'],
+                    'name': row['name'] or '',
+                    'father_name': row['father_name'] or '',
+                    'mother_name': row['mother_name'] or '',
+                    'spouse_name': row['spouse_name'] or '',
+                    'phone': row['phone'] or '',
+                    'village_id': village[0],
+                    'village_name': village[1],
+                    'tehsil_id': tehsil[0],
+                    'tehsil_name': tehsil[1],
+                    'district_id': district[0],
+                    'district_name': district[1],
+                    'owner_address': row['owner_address'] or '',
+                    'aadhar_number': row['aadhar_number'] or '',
+                    'pan_number': row['pan_number'] or '',
+                    'bank_name': row['bank_name'] or '',
+                    'bank_branch': row['bank_branch'] or '',
+                    'account_number': row['account_number'] or '',
+                    'ifsc_code': row['ifsc_code'] or '',
+                    'account_holder_name': row['account_holder_name'] or '',
+                    'survey_ids': row['survey_ids'],
+                })
+            return result
+        if key == 'trees':
+            rows = Model.search_read(domain, ['name', 'tree_type', 'active'])
+            rows.sort(key=lambda row: order[row['id']])
+            return [{
+                'id': row['id'],
+                'name': row['name'] or '',
+                'tree_type': row['tree_type'],
+                'active': row['active'],
+            } for row in rows]
+        rows = Model.search_read(domain, ['name', 'code', 'description', 'sequence', 'active'])
+        rows.sort(key=lambda row: order[row['id']])
+        return [{
+            'id': row['id'],
+            'name': row['name'] or '',
+            'code': row['code'] or '',
+            'description': row['description'] or '',
+            'sequence': row['sequence'] or 10,
+            'active': row['active'],
+        } for row in rows]
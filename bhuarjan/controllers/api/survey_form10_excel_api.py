@@ -5,6 +5,7 @@ Handles Excel export endpoints for Form 10 (Bulk Table Report)
 """
 from odoo import http
 from odoo.http import request, Response
+from werkzeug.wsgi import wrap_file
 
 import json
 import logging
@@ -87,7 +88,7 @@ class Form10ExcelAPIController(http.Controller):
 
             # Use utility function to generate Excel
             try:
-                excel_data = export_utils.generate_form10_excel(surveys)
+                excel_file, excel_size = export_utils.generate_form10_excel_file(surveys)
                 _logger.info("Form 10 Excel download: Excel file generated")
             except Exception as excel_error:
                 _logger.error(f"Form 10 Excel download: Excel generation failed: {str(excel_error)}", exc_info=True)
@@ -110,13 +111,14 @@ class Form10ExcelAPIController(http.Controller):
             content_disp = export_utils.content_disposition_attachment(
                 filename, ascii_fallback='Form10_Export.xlsx'
             )
-            response = request.make_response(
-                excel_data,
+            response = Response(
+                wrap_file(request.httprequest.environ, excel_file),
                 headers=[
                     ('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
                     ('Content-Disposition', content_disp),
-                    ('Content-Length', str(len(excel_data)))
-                ]
+                    ('Content-Length', str(excel_size))
+                ],
+                direct_passthrough=True,
             )
             _logger.info("Form 10 Excel download: Excel response created successfully")
             return response
@@ -168,7 +170,7 @@ class Form10ExcelAPIController(http.Controller):
 
             # Use utility function to generate Excel
             try:
-                excel_data = export_utils.generate_form10_excel(surveys)
+                excel_file, excel_size = export_utils.generate_form10_excel_file(surveys)
                 _logger.info("Form 10 Excel download by survey: Excel file generated")
             except Exception as excel_error:
                 _logger.error(f"Form 10 Excel download by survey: Excel generation failed: {str(excel_error)}", exc_info=True)
@@ -186,13 +188,14 @@ class Form10ExcelAPIController(http.Controller):
             content_disp = export_utils.content_disposition_attachment(
                 filename, ascii_fallback='Form10_Export.xlsx'
             )
-            response = request.make_response(
-                excel_data,
+            response = Response(
+                wrap_file(request.httprequest.environ, excel_file),
                 headers=[
                     ('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
                     ('Content-Disposition', content_disp),
-                    ('Content-Length', str(len(excel_data)))
-                ]
+                    ('Content-Length', str(excel_size))
+                ],
+                direct_passthrough=True,
             )
             _logger.info("Form 10 Excel download by survey: Excel response created successfully")
             return response
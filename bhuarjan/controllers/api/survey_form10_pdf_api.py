@@ -5,6 +5,7 @@ Handles PDF export endpoints for Form 10 (Bulk Table Report)
 """
 from odoo import http
 from odoo.http import request, Response
+from werkzeug.wsgi import wrap_file
 
 import json
 import logging
@@ -85,15 +86,13 @@ class Form10PDFAPIController(http.Controller):
                     content_type='application/json'
                 )
 
-            # Use utility function to generate PDF
+            # Use utility function to generate PDF (chunked, spooled to a temp file)
             try:
-                pdf_data = export_utils.generate_form10_pdf(surveys)
-                _logger.info(f"Form 10 download: PDF data generated, size: {len(pdf_data)} bytes")
+                pdf_file, pdf_size = export_utils.generate_form10_pdf_file(surveys)
+                _logger.info(f"Form 10 download: PDF data generated, size: {pdf_size} bytes")
             except Exception as pdf_error:
                 _logger.error(f"Form 10 download: PDF generation failed: {str(pdf_error)}", exc_info=True)
                 error_msg = str(pdf_error)
-                if isinstance(pdf_error, MemoryError):
-                    error_msg = 'PDF generation failed due to memory constraints. Please reduce the number of surveys or contact administrator.'
                 return Response(
                     json.dumps({'error': error_msg}),
                     status=500,
@@ -114,13 +113,15 @@ class Form10PDFAPIController(http.Controller):
             content_disp = export_utils.content_disposition_attachment(
                 filename, ascii_fallback='Form10_Export.pdf'
             )
-            response = request.make_response(
-                pdf_data,
+            # Stream the spooled file; the WSGI server closes it once sent
+            response = Response(
+                wrap_file(request.httprequest.environ, pdf_file),
                 headers=[
                     ('Content-Type', 'application/pdf'),
                     ('Content-Disposition', content_disp),
-                    ('Content-Length', str(len(pdf_data)))
-                ]
+                    ('Content-Length', str(pdf_size))
+                ],
+                direct_passthrough=True,
             )
             _logger.info("Form 10 download: PDF response created successfully")
             return response
@@ -77,6 +77,9 @@ class DashboardCounts(models.AbstractModel):
         expert_counts = self._get_section_counts('bhu.expert.committee.report', expert_base)
         sia_counts = self._get_section_counts('bhu.sia.team', sia_base)
         section23_counts = self._get_section_counts('bhu.section23.award', section23_base)
+        payment_counts = self._get_section_counts('bhu.payment.file', payment_base, states=['draft', 'generated'])
+        reconciliation_counts = self._get_section_counts(
+            'bhu.payment.reconciliation.bank', reconciliation_base, states=['draft', 'processed', 'completed'])
         
         return {
             # ... existing counts ...
@@ -96,15 +99,15 @@ class DashboardCounts(models.AbstractModel):
             'section23_send_back': section23_counts['send_back'],
             
             # Payment Files
-            'payment_file_total': self.env['bhu.payment.file'].search_count(payment_base),
-            'payment_file_draft': self.env['bhu.payment.file'].search_count(payment_base + [('state', '=', 'draft')]),
-            'payment_file_generated': self.env['bhu.payment.file'].search_count(payment_base + [('state', '=', 'generated')]),
+            'payment_file_total': payment_counts['total'],
+            'payment_file_draft': payment_counts['draft'],
+            'payment_file_generated': payment_counts['generated'],
             
             # Payment Reconciliations
-            'reconciliation_total': self.env['bhu.payment.reconciliation.bank'].search_count(reconciliation_base),
-            'reconciliation_draft': self.env['bhu.payment.reconciliation.bank'].search_count(reconciliation_base + [('state', '=', 'draft')]),
-            'reconciliation_processed': self.env['bhu.payment.reconciliation.bank'].search_count(reconciliation_base + [('state', '=', 'processed')]),
-            'reconciliation_completed': self.env['bhu.payment.reconciliation.bank'].search_count(reconciliation_base + [('state', '=', 'completed')]),
+            'reconciliation_total': reconciliation_counts['total'],
+            'reconciliation_draft': reconciliation_counts['draft'],
+            'reconciliation_processed': reconciliation_counts['processed'],
+            'reconciliation_completed': reconciliation_counts['completed'],
             
             # Document Vault
             'total_documents': self.env['bhu.document.vault'].search_count([]),
@@ -2,15 +2,124 @@
 
 from odoo import models, api
 import logging
+import threading
+import time
 
 _logger = logging.getLogger(__name__)
 
+# Seconds a grouped state count stays valid in this worker. Changes made in
+# this worker drop the entries of the touched model once they are committed
+# (see ``_invalidate_dashboard_counts``); other workers catch up within the TTL.
+DASHBOARD_COUNT_CACHE_TTL = 60
+# Entries kept per worker; expired ones are purged on insert, then the oldest go.
+DASHBOARD_COUNT_CACHE_SIZE = 2048
+# ``cr.postcommit.data`` key of the models to drop once the transaction commits.
+DASHBOARD_COUNT_INVALIDATION_KEY = 'bhuarjan.dashboard_count_invalidations'
+
+# {(dbname, scope, model_name, state_field, domain_repr): (expires_at, buckets)}
+_STATE_BUCKET_CACHE = {}
+_STATE_BUCKET_LOCK = threading.Lock()
+
+
+def _store_state_buckets(key, expires_at, buckets):
+    """Cache ``buckets``; purges expired entries and keeps the cache bounded."""
+    now = time.monotonic()
+    with _STATE_BUCKET_LOCK:
+        _STATE_BUCKET_CACHE.pop(key, None)
+        for stale in [k for k, (expiry, _b) in _STATE_BUCKET_CACHE.items() if expiry <= now]:
+            del _STATE_BUCKET_CACHE[stale]
+        _STATE_BUCKET_CACHE[key] = (expires_at, buckets)
+        # Insertion order: the first entries are the oldest.
+        while len(_STATE_BUCKET_CACHE) > DASHBOARD_COUNT_CACHE_SIZE:
+            del _STATE_BUCKET_CACHE[next(iter(_STATE_BUCKET_CACHE))]
+
+
+def _drop_state_buckets(dbname, model_names):
+    """Drop cached state counts of ``model_names`` (all models when it holds None)."""
+    with _STATE_BUCKET_LOCK:
+        for key in list(_STATE_BUCKET_CACHE):
+            if key[0] == dbname and (None in model_names or key[2] in model_names):
+                del _STATE_BUCKET_CACHE[key]
+
 
 class DashboardHelpers(models.AbstractModel):
     """Generic helper methods for dashboard counts"""
     _name = 'bhuarjan.dashboard.helpers'
     _description = 'Dashboard Helper Methods'
 
+    @api.model
+    def _get_dashboard_cache_scope(self):
+        """Key describing what the current user can see through record rules.
+
+        Users with the same groups, company set, district and department share
+        cached counts; SDM / Tehsildar / Department / Patwari rules also
+        depend on the user id, so those users get their own scope.
+        """
+        user = self.env.user
+        can_see_all = any(
+            user.has_group(group)
+            for group in ('bhuarjan.group_bhuarjan_admin', 'base.group_system',
+                          'bhuarjan.group_bhuarjan_collector',
+                          'bhuarjan.group_bhuarjan_additional_collector',
+                          'bhuarjan.group_bhuarjan_district_administrator')
+        )
+        return (
+            tuple(sorted(user.groups_id.ids)),
+            tuple(sorted(self.env.companies.ids)),
+            user.district_id.id,
+            user.bhu_department_id.id,
+            None if can_see_all else user.id,
+        )
+
+    @api.model
+    def _get_state_buckets(self, model_name, base_domain, state_field='state'):
+        """Count every state of ``model_name`` with a single GROUP BY.
+
+        ``state_field`` may be any groupable spec, e.g. ``'survey_date:day'``
+        for the survey trend chart.
+
+        Returns:
+            dict: ``{state: {'count': int, 'first_id': int}}`` where
+            ``first_id`` is the oldest record (lowest id) in that state.
+        """
+        domain = list(base_domain or [])
+        key = (
+            self.env.cr.dbname,
+            self._get_dashboard_cache_scope(),
+            model_name,
+            state_field,
+            repr(domain),
+        )
+        now = time.monotonic()
+        with _STATE_BUCKET_LOCK:
+            hit = _STATE_BUCKET_CACHE.get(key)
+        if hit and hit[0] > now:
+            return hit[1]
+
+        buckets = {}
+        for state, count, first_id in self.env[model_name]._read_group(
+            domain, [state_field], ['__count', 'id:min'],
+        ):
+            buckets[state] = {'count': count, 'first_id': first_id}
+
+        _store_state_buckets(key, now + DASHBOARD_COUNT_CACHE_TTL, buckets)
+        return buckets
+
+    @api.model
+    def _invalidate_dashboard_counts(self, model_name=None):
+        """Drop cached state counts for ``model_name`` (all models if None) after commit.
+
+        Dropping them earlier would let a concurrent request cache the
+        pre-commit counts again for a full TTL.
+        """
+        cr = self.env.cr
+        pending = cr.postcommit.data.get(DASHBOARD_COUNT_INVALIDATION_KEY)
+        if pending is None:
+            pending = cr.postcommit.data[DASHBOARD_COUNT_INVALIDATION_KEY] = set()
+            dbname = cr.dbname
+            cr.postcommit.add(lambda: _drop_state_buckets(dbname, pending))
+        pending.add(model_name)
+
     @api.model
     def _get_model_count_by_status(self, model_name, base_domain, status=None, state_field='state'):
         """Generic method to get count by status for any model
@@ -23,19 +132,14 @@ class DashboardHelpers(models.AbstractModel):
         Returns:
             int: Count of records matching the domain and status
         """
-        if not base_domain:
-            base_domain = []
+        buckets = self._get_state_buckets(model_name, base_domain, state_field)
         
         if status is None:
             # Return total count without status filter
-            return self.env[model_name].search_count(base_domain)
-        
-        if isinstance(status, list):
-            status_domain = [(state_field, 'in', status)]
-        else:
-            status_domain = [(state_field, '=', status)]
+            return sum(b['count'] for b in buckets.values())
         
-        return self.env[model_name].search_count(base_domain + status_domain)
+        statuses = status if isinstance(status, list) else [status]
+        return sum(buckets[s]['count'] for s in statuses if s in buckets)
     
     @api.model
     def _get_section_counts(self, model_name, base_domain, state_field='state', states=None):
@@ -51,13 +155,12 @@ class DashboardHelpers(models.AbstractModel):
         if states is None:
             states = ['draft', 'submitted', 'approved', 'send_back']
         
-        if not base_domain:
-            base_domain = []
+        buckets = self._get_state_buckets(model_name, base_domain, state_field)
         
-        total = self.env[model_name].search_count(base_domain)
+        total = sum(b['count'] for b in buckets.values())
         counts = {}
         for state in states:
-            counts[f'{state}'] = self._get_model_count_by_status(model_name, base_domain, state, state_field)
+            counts[f'{state}'] = buckets.get(state, {}).get('count', 0)
         
         return {
             'total': total,
@@ -73,10 +176,7 @@ class DashboardHelpers(models.AbstractModel):
         Returns:
             dict: Dictionary with total count only (no state breakdown)
         """
-        if not base_domain:
-            base_domain = []
-        
-        total = self.env[model_name].search_count(base_domain)
+        total = self._get_model_count_by_status(model_name, base_domain, None)
         
         return {
             'total': total,
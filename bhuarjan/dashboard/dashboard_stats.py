@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, api
+from odoo import models, fields, api
+from odoo.tools import SQL
 import logging
 
 _logger = logging.getLogger(__name__)
@@ -314,45 +315,49 @@ class DashboardStats(models.AbstractModel):
         Returns:
             dict: Section information with counts and status
         """
-        records = self.env[model_name].search(domain, order='create_date asc')
-        total = len(records)
-        
-        submitted = records.filtered(lambda r: getattr(r, state_field, False) == 'submitted')
-        approved = records.filtered(lambda r: getattr(r, state_field, False) == 'approved')
-        rejected = records.filtered(lambda r: getattr(r, state_field, False) == 'rejected')
-        send_back = records.filtered(lambda r: getattr(r, state_field, False) == 'send_back')
-        draft = records.filtered(lambda r: getattr(r, state_field, False) == 'draft')
+        # One GROUP BY per model (shared with the section counts via the bucket cache)
+        buckets = self._get_state_buckets(model_name, domain, state_field)
+        total = sum(b['count'] for b in buckets.values())
+
+        def _count(state):
+            return buckets.get(state, {}).get('count', 0)
+
+        submitted = _count('submitted')
+        approved = _count('approved')
+        rejected = _count('rejected')
+        send_back = _count('send_back')
+        draft = _count('draft')
         
-        all_approved = total > 0 and len(approved) == total
+        all_approved = total > 0 and approved == total
         
         # Completion logic: surveys need approved OR rejected, others need all approved
         if is_survey:
-            is_completed = total > 0 and len(submitted) == 0 and len(draft) == 0 and (len(approved) + len(rejected) == total)
+            is_completed = total > 0 and submitted == 0 and draft == 0 and (approved + rejected == total)
         else:
             is_completed = all_approved
         
         # Pick first pending based on pending_state
-        if pending_state == 'submitted':
-            first_pending = submitted[0] if submitted else False
-        elif pending_state == 'draft':
+        # (oldest record of that state; ids follow creation order)
+        if pending_state == 'draft':
             # For CGLRC 247, draft records are considered pending SDM approval
-            first_pending = draft[0] if draft else False
+            first_pending_id = buckets.get('draft', {}).get('first_id') or False
         else:
-            first_pending = submitted[0] if submitted else False
+            first_pending_id = buckets.get('submitted', {}).get('first_id') or False
 
-        first_document = records[0] if records else False
+        first_ids = [b['first_id'] for b in buckets.values() if b.get('first_id')]
+        first_document_id = min(first_ids) if first_ids else False
         
         return {
             'total': total,
-            'draft_count': len(draft),
-            'submitted_count': len(submitted),
-            'approved_count': len(approved),
-            'rejected_count': len(rejected),
-            'send_back_count': len(send_back),
+            'draft_count': draft,
+            'submitted_count': submitted,
+            'approved_count': approved,
+            'rejected_count': rejected,
+            'send_back_count': send_back,
             'all_approved': all_approved,
             'is_completed': is_completed,
-            'first_pending_id': first_pending.id if first_pending else False,
-            'first_document_id': first_document.id if first_document else False,
+            'first_pending_id': first_pending_id,
+            'first_document_id': first_document_id,
         }
 
     @api.model
@@ -572,13 +577,6 @@ class DashboardStats(models.AbstractModel):
             is_collector = self.is_collector_user()
             _logger.info(f"Dashboard Stats - User access: can_see_all={user_access['can_see_all']}, user_type={user_access['user_type']}, project_ids={user_access['project_ids']}")
             
-            # Debug: Test survey query directly
-            if domains['final_domain']:
-                test_surveys = self.env['bhu.survey'].search(domains['final_domain'], limit=10)
-                _logger.info(f"Dashboard Stats - Test query found {len(test_surveys)} surveys with domain {domains['final_domain']}")
-                if test_surveys:
-                    _logger.info(f"Dashboard Stats - Sample survey IDs: {test_surveys.mapped('id')}")
-            
             # Get project exemption status and allowed sections
             is_project_exempt = False
             is_displacement = False
@@ -619,45 +617,6 @@ class DashboardStats(models.AbstractModel):
             # Log survey counts for debugging
             _logger.info(f"Dashboard Stats - Survey counts: total={counts['survey']['total']}, approved={counts['survey']['approved']}, domain={domains['final_domain']}")
             
-            # Log Section 4 counts significantly
-            try:
-                _logger.info(f"Dashboard Stats - Section 4 counts: "
-                             f"total={counts['section4']['total']},"
-                             f"draft={counts['section4']['draft']},"
-                             f"generated={counts['section4'].get('generated', 0)},"
-                             f"submitted={counts['section4']['submitted']},"
-                             f"Domain={domains['final_domain']}")
-                if domains['final_domain']:
-                    sec4_recs = self.env['bhu.section4.notification'].search(domains['final_domain'])
-                    if sec4_recs:
-                        _logger.info(f"Dashboard Stats - FOUND Section 4 IDs: {sec4_recs.ids}, States: {sec4_recs.mapped('state')}")
-                    else:
-                        _logger.info("Dashboard Stats - NO Section 4 records found with this domain.")
-            except Exception as e:
-                 _logger.error(f"Error logging section 4 stats: {e}")
-            
-            # Debug Section 8 specifically
-            _logger.info(f"Dashboard Stats - Section 8 domain_without_village: {domains['domain_without_village']}")
-            _logger.info(f"Dashboard Stats - Section 8 counts: total={counts.get('section8', {}).get('total', 0)}, draft={counts.get('section8', {}).get('draft', 0)}, approved={counts.get('section8', {}).get('approved', 0)}, rejected={counts.get('section8', {}).get('rejected', 0)}")
-            # Test Section 8 query directly
-            test_section8 = self.env['bhu.section8'].search(domains['domain_without_village'] if domains['domain_without_village'] else [])
-            _logger.info(f"Dashboard Stats - Direct Section 8 query found {len(test_section8)} records with domain {domains['domain_without_village']}")
-            if test_section8:
-                _logger.info(f"Dashboard Stats - Section 8 record IDs: {test_section8.mapped('id')}, projects: {test_section8.mapped('project_id.id')}, states: {test_section8.mapped('state')}")
-            
-            # Debug: Test the domain directly to verify it's working
-            if domains['final_domain']:
-                test_surveys = self.env['bhu.survey'].search(domains['final_domain'], limit=10)
-                test_count = len(test_surveys)
-                _logger.info(f"Dashboard Stats - Direct test: Found {test_count} surveys with domain {domains['final_domain']}")
-                if test_surveys:
-                    _logger.info(f"Dashboard Stats - Sample survey IDs: {test_surveys.mapped('id')}, villages: {test_surveys.mapped('village_id.id')}")
-                else:
-                    # Try without village filter to see if project filter works
-                    if domains['project_domain']:
-                        test_without_village = self.env['bhu.survey'].search(domains['project_domain'], limit=10)
-                        _logger.info(f"Dashboard Stats - Without village filter: Found {len(test_without_village)} surveys with project domain {domains['project_domain']}")
-            
             # Build response with all statistics
             result = {
                 'is_collector': is_collector,
@@ -1099,57 +1058,206 @@ class DashboardStats(models.AbstractModel):
         villages = project.village_ids
         return villages.read(["id", "name", "village_type"])
 
+    # Latest acquisition stage first: (stage key, model)
+    PROJECT_STAGE_MODELS = [
+        ('award', 'bhu.section23.award'),
+        ('section21', 'bhu.section21.notification'),
+        ('section19', 'bhu.section19.notification'),
+        ('section11', 'bhu.section11.preliminary.report'),
+        ('section4', 'bhu.section4.notification'),
+        ('sia', 'bhu.sia.team'),
+    ]
+
+    @api.model
+    def get_scope_survey_summary(self, company_ids=None, project_ids=None):
+        """Survey counts and last activity for the whole dashboard scope in one call.
+
+        Replaces the per-department / per-project / per-village ``searchCount``
+        calls of the dashboard selectors and the group dashboard table: surveys
+        are grouped once by (project, village), landowners once by project and
+        each stage model once by project.
+
+        Args:
+            company_ids: Optional company IDs to restrict projects and surveys to
+            project_ids: Optional explicit project IDs (group dashboard); defaults
+                to the projects of ``get_user_projects``
+
+        Returns:
+            dict: {
+                'departments': [{id, name, survey_count, last_survey_date}],
+                'projects': [{id, name, department_id, survey_count, landowner_count,
+                              last_survey_date, last_activity, stage,
+                              villages: [{id, name, village_type, survey_count, last_survey_date}]}],
+            }
+        """
+        Project = self.env['bhu.project']
+        if project_ids is not None:
+            projects = Project.browse([int(pid) for pid in project_ids]).exists()
+        else:
+            projects = Project.browse([p['id'] for p in self.get_user_projects()])
+        if company_ids:
+            projects = projects.filtered(lambda p: p.company_id.id in company_ids)
+
+        survey_domain = [('project_id', 'in', projects.ids)]
+        if company_ids:
+            survey_domain.append(('company_id', 'in', company_ids))
+
+        # project id -> {village id: (count, last survey_date, last write_date)}
+        per_village = {}
+        for project, village, count, last_date, last_write in self.env['bhu.survey']._read_group(
+                survey_domain, ['project_id', 'village_id'],
+                ['__count', 'survey_date:max', 'write_date:max']):
+            per_village.setdefault(project.id, {})[village.id] = (count, last_date, last_write)
+
+        # Distinct landowners per project, over the surveys visible to the user
+        landowner_counts = {}
+        if projects:
+            survey_query = self.env['bhu.survey']._search(survey_domain)
+            self.env.cr.execute(SQL("""
+                SELECT s.project_id, COUNT(DISTINCT r.landowner_id)
+                  FROM bhu_survey_landowner_rel r
+                  JOIN bhu_survey s ON s.id = r.survey_id
+                 WHERE r.survey_id IN (%s)
+              GROUP BY s.project_id
+            """, survey_query.select()))
+            landowner_counts = dict(self.env.cr.fetchall())
+
+        # Stage: latest section with at least one record for the project
+        stage_project_ids = {}
+        for stage, model_name in self.PROJECT_STAGE_MODELS:
+            Model = self.env[model_name]
+            if not projects or not Model.has_access('read'):
+                stage_project_ids[stage] = set()
+                continue
+            stage_project_ids[stage] = {
+                project.id for project, in Model._read_group(
+                    [('project_id', 'in', projects.ids)], ['project_id'])
+            }
+
+        def _max(*values):
+            values = [v for v in values if v]
+            return max(values) if values else False
+
+        project_rows = []
+        department_totals = {}
+        for project in projects:
+            villages = []
+            survey_count, last_date, last_write = 0, False, False
+            village_rows = per_village.get(project.id, {})
+            for village in project.village_ids:
+                count, v_last_date, _v_last_write = village_rows.get(village.id, (0, False, False))
+                villages.append({
+                    'id': village.id,
+                    'name': village.name,
+                    'village_type': village.village_type,
+                    'survey_count': count,
+                    'last_survey_date': fields.Date.to_string(v_last_date) if v_last_date else False,
+                })
+            for count, v_last_date, v_last_write in village_rows.values():
+                survey_count += count
+                last_date = _max(last_date, v_last_date)
+                last_write = _max(last_write, v_last_write)
+
+            stage = next(
+                (key for key, _model in self.PROJECT_STAGE_MODELS if project.id in stage_project_ids[key]),
+                'initial',
+            )
+            project_rows.append({
+                'id': project.id,
+                'name': project.name,
+                'department_id': project.department_id.id,
+                'survey_count': survey_count,
+                'landowner_count': landowner_counts.get(project.id, 0),
+                'last_survey_date': fields.Date.to_string(last_date) if last_date else False,
+                'last_activity': fields.Datetime.to_string(last_write) if last_write else False,
+                'stage': stage,
+                'villages': villages,
+            })
+            if project.department_id:
+                totals = department_totals.setdefault(project.department_id.id, [0, False])
+                totals[0] += survey_count
+                totals[1] = _max(totals[1], last_date)
+
+        departments = []
+        if project_ids is None:
+            for department in self.get_all_departments():
+                count, last_date = department_totals.get(department['id'], (0, False))
+                departments.append({
+                    'id': department['id'],
+                    'name': department['name'],
+                    'survey_count': count,
+                    'last_survey_date': fields.Date.to_string(last_date) if last_date else False,
+                })
+
+        return {'departments': departments, 'projects': project_rows}
+
     @api.model
     def get_survey_trend_data(self, company_ids=None):
-        """Survey counts by day (30d), week (12w), month (12m) for chart widgets."""
+        """Survey counts by day (30d), week (12w), month (12m) for chart widgets.
+
+        One GROUP BY ``survey_date:day`` over the whole 12-month window (cached
+        with the other dashboard counts); weekly and monthly series are summed
+        from the daily buckets.
+        """
         from datetime import date, timedelta
 
-        Survey = self.env["bhu.survey"]
         today = date.today()
 
-        def _count(domain_extra):
-            base = [("company_id", "in", company_ids)] if company_ids else []
-            return Survey.search_count(base + domain_extra)
+        week_start = today - timedelta(days=today.weekday())
+        week_starts = [week_start - timedelta(weeks=i) for i in range(11, -1, -1)]
+
+        month_starts = []
+        for i in range(11, -1, -1):
+            month_dt = date(today.year, today.month, 1)
+            total_months = month_dt.month - i - 1
+            year_offset, month_offset = divmod(total_months, 12)
+            month_starts.append(date(month_dt.year + year_offset, month_offset + 1, 1))
+
+        def _month_end(ms):
+            if ms.month == 12:
+                return date(ms.year + 1, 1, 1) - timedelta(days=1)
+            return date(ms.year, ms.month + 1, 1) - timedelta(days=1)
+
+        window_start = min(month_starts[0], week_starts[0], today - timedelta(days=29))
+        window_end = max(_month_end(month_starts[-1]), week_starts[-1] + timedelta(days=6))
+
+        domain = [("company_id", "in", company_ids)] if company_ids else []
+        domain += [
+            ("survey_date", ">=", window_start.isoformat()),
+            ("survey_date", "<=", window_end.isoformat()),
+        ]
+        buckets = self._get_state_buckets("bhu.survey", domain, state_field="survey_date:day")
+        per_day = {
+            fields.Date.to_date(day): bucket["count"]
+            for day, bucket in buckets.items() if day
+        }
+
+        def _sum_range(start, end):
+            return sum(count for day, count in per_day.items() if start <= day <= end)
 
         daily = []
         for i in range(29, -1, -1):
             d = today - timedelta(days=i)
             daily.append({
                 "label": d.strftime("%d %b"),
-                "value": _count([("survey_date", "=", d.isoformat())]),
+                "value": per_day.get(d, 0),
                 "iso": d.isoformat(),
             })
 
         weekly = []
-        week_start = today - timedelta(days=today.weekday())
-        for i in range(11, -1, -1):
-            ws = week_start - timedelta(weeks=i)
+        for ws in week_starts:
             we = ws + timedelta(days=6)
             weekly.append({
                 "label": ws.strftime("%d %b"),
-                "value": _count([
-                    ("survey_date", ">=", ws.isoformat()),
-                    ("survey_date", "<=", we.isoformat()),
-                ]),
+                "value": _sum_range(ws, we),
                 "iso": ws.isoformat(),
             })
 
         monthly = []
-        for i in range(11, -1, -1):
-            month_dt = date(today.year, today.month, 1)
-            total_months = month_dt.month - i - 1
-            year_offset, month_offset = divmod(total_months, 12)
-            ms = date(month_dt.year + year_offset, month_offset + 1, 1)
-            if ms.month == 12:
-                me = date(ms.year + 1, 1, 1) - timedelta(days=1)
-            else:
-                me = date(ms.year, ms.month + 1, 1) - timedelta(days=1)
+        for ms in month_starts:
             monthly.append({
                 "label": ms.strftime("%b %Y"),
-                "value": _count([
-                    ("survey_date", ">=", ms.isoformat()),
-                    ("survey_date", "<=", me.isoformat()),
-                ]),
+                "value": _sum_range(ms, _month_end(ms)),
                 "iso": ms.isoformat(),
             })
 
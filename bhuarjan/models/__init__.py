@@ -10,6 +10,7 @@ from . import notification_mixin
 from .process import process_workflow_mixin
 
 from . import qr_code_mixin
+from . import sync_tombstone
 
 from .survey import survey
 
@@ -29,6 +30,7 @@ from .payment import payment_dashboard
 from .masters import land_rate_master
 
 from .masters import settings_master
+from .masters import sequence_counter
 
 from .process import message_wizard
 
@@ -82,6 +84,7 @@ from .sections import section247_cglrc
 from .survey import survey_photo
 
 from .survey import form10_export_utils
+from . import microsite_document_cache
 from . import app_version
 
 from .masters import document_template_master
@@ -3,6 +3,8 @@
 from odoo import models, _
 from odoo.exceptions import ValidationError
 
+from ..xlsx_export import XlsxExport
+
 
 class Section23AwardConsolidated(models.Model):
     _inherit = 'bhu.section23.award'
@@ -32,10 +34,8 @@ class Section23AwardConsolidated(models.Model):
         """Download consolidated award sheet as Excel (one row per khasra)."""
         self.ensure_one()
         self._s23_recompute_award_survey_lines_for_export()
-        import io
-        import base64
         try:
-            import xlsxwriter
+            import xlsxwriter  # noqa: F401
         except ImportError:
             raise ValidationError(_("Python library 'xlsxwriter' is not installed."))
 
@@ -46,8 +46,7 @@ class Section23AwardConsolidated(models.Model):
         award_headers = self.get_award_header_constants()
         consolidated_headers = award_headers['excel']['consolidated_award_headers']
 
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+        workbook = XlsxExport()
         sheet = workbook.add_worksheet('Consolidated Award')
 
         # ── Formats ────────────────────────────────────────────────────────
@@ -246,18 +245,12 @@ class Section23AwardConsolidated(models.Model):
         sheet.set_column(4, 7, 14)
         sheet.set_column(8, 8, 12)
 
-        workbook.close()
-        output.seek(0)
-        file_data = base64.b64encode(output.read())
-        output.close()
-
-        attachment = self.env['ir.attachment'].create({
-            'name': f"ConsolidatedAwardSheet_{self.village_id.name or 'Award'}.xlsx",
-            'type': 'binary',
-            'datas': file_data,
-            'res_model': 'bhu.section23.award',
-            'res_id': self.id,
-        })
+        attachment = workbook.save_attachment(
+            self.env,
+            f"ConsolidatedAwardSheet_{self.village_id.name or 'Award'}.xlsx",
+            'bhu.section23.award',
+            self.id,
+        )
 
         return {
             'type': 'ir.actions.act_url',
@@ -164,6 +164,8 @@ class Section23Award(models.Model):
         string='Award Line Items',
         readonly=True,
     )
+    # Scope (all/land/tree/asset) the stored line items were last built for.
+    award_line_items_scope = fields.Char(string='Award Line Items Scope', readonly=True, copy=False)
     award_structure_line_ids = fields.One2many(
         'bhu.award.structure.details',
         'award_id',
@@ -360,12 +362,13 @@ class Section23Award(models.Model):
                     ('village_id', '=', rec.village_id.id),
                     ('state', 'in', ['draft', 'submitted', 'approved', 'locked']),
                 ])
-                for survey in surveys:
-                    for tree_line in survey.tree_line_ids:
-                        qty = float(getattr(tree_line, 'quantity', 0) or 0.0)
-                        rate = float(tree_line.get_applicable_rate() if hasattr(tree_line, 'get_applicable_rate') else 0.0)
-                        base_value = qty * rate
-                        tree_total += base_value + (base_value * 0.1) + (base_value * 2.1)
+                tree_lines = surveys.tree_line_ids
+                rates = tree_lines._get_applicable_rates()
+                for tree_line in tree_lines:
+                    qty = float(tree_line.quantity or 0.0)
+                    rate = float(rates[tree_line.id])
+                    base_value = qty * rate
+                    tree_total += base_value + (base_value * 0.1) + (base_value * 2.1)
             rec.tree_total = tree_total
 
     @api.depends('land_total', 'tree_total', 'structure_total')
@@ -583,6 +586,7 @@ class Section23Award(models.Model):
             record._sync_village_profile_from_master(force=False)
             record._sync_rate_fields_from_master(force=False)
             record._populate_award_survey_lines(reset_if_empty=False)
+        self.env['bhuarjan.dashboard.helpers']._invalidate_dashboard_counts(self._name)
         return records
 
     def write(self, vals):
@@ -616,6 +620,8 @@ class Section23Award(models.Model):
                     rec._sync_award_structure_lines()
             if village_profile_changed and rec.village_id:
                 rec._sync_village_profile_to_master()
+        if 'state' in vals:
+            self.env['bhuarjan.dashboard.helpers']._invalidate_dashboard_counts(self._name)
         return result
 
     def unlink(self):
@@ -630,7 +636,9 @@ class Section23Award(models.Model):
         for rec in self:
             rec.award_survey_line_ids.unlink()
             rec.award_line_item_ids.unlink()
-        return super().unlink()
+        result = super().unlink()
+        self.env['bhuarjan.dashboard.helpers']._invalidate_dashboard_counts('bhu.section23.award')
+        return result
 
     def _populate_award_survey_lines(self, reset_if_empty=False):
         """Populate survey lines from draft/submitted/approved surveys.
@@ -2,12 +2,63 @@
 
 from odoo import models
 
+from .award_rows import (
+    LandCompensationRow,
+    StructureCompensationRow,
+    TreeCompensationRow,
+    column_totals,
+)
+
 
 class Section23AwardData(models.Model):
     _inherit = 'bhu.section23.award'
 
-    def get_land_compensation_data(self):
-        """Get land compensation data grouped by landowner and khasra"""
+    def _s23_land_compensation_prefetch(self, surveys):
+        """Load everything the land rows need in a handful of queries.
+
+        Returns indexes keyed by khasra / survey id so the row pass never
+        searches again:
+
+        - ``survey_by_khasra``: first survey per khasra in the default survey
+          order (same record the old per-row ``search(limit=1)`` returned)
+        - ``award_line_by_survey``: first award survey line per survey
+        - ``rate_master``: active land rate master for the village
+        - ``interest_period``: Section 4 hearing → award date
+        """
+        self.ensure_one()
+        khasras = list({s.khasra_number for s in surveys if s.khasra_number})
+        rate_surveys = self.env['bhu.survey'].search([
+            ('project_id', '=', self.project_id.id),
+            ('village_id', '=', self.village_id.id),
+            ('khasra_number', 'in', khasras),
+        ]) if khasras else self.env['bhu.survey']
+        # Warm the prefetch cache for related records used per row.
+        (surveys | rate_surveys).mapped('landowner_ids')
+        (surveys | rate_surveys).mapped('crop_type_id')
+
+        survey_by_khasra = {}
+        for survey in rate_surveys:
+            survey_by_khasra.setdefault(survey.khasra_number, survey)
+
+        award_line_by_survey = {}
+        for line in self.award_survey_line_ids:
+            if line.survey_id:
+                award_line_by_survey.setdefault(line.survey_id.id, line)
+
+        rate_master = self._get_active_rate_master_for_village() or self.env['bhu.rate.master']
+        return {
+            'survey_by_khasra': survey_by_khasra,
+            'award_line_by_survey': award_line_by_survey,
+            'rate_master': rate_master,
+            'interest_period': self._s23_interest_period(),
+        }
+
+    def _s23_compute_land_compensation_data(self):
+        """Get land compensation data grouped by landowner and khasra
+
+        Computes from scratch; callers use ``get_land_compensation_data``
+        (memoized per generation, see ``award_generation_snapshot``).
+        """
         self.ensure_one()
         acre_per_hectare = 2.471
 
@@ -22,6 +73,13 @@ class Section23AwardData(models.Model):
         if not surveys:
             return []
 
+        prefetch = self._s23_land_compensation_prefetch(surveys)
+        survey_by_khasra = prefetch['survey_by_khasra']
+        award_line_by_survey = prefetch['award_line_by_survey']
+        rate_master = prefetch['rate_master']
+        interest_period = prefetch['interest_period']
+        empty_award_line = self.env['bhu.section23.award.survey.line']
+
         # Group by landowner and khasra
         compensation_data = {}
 
@@ -45,79 +103,88 @@ class Section23AwardData(models.Model):
                 # If no landowners, create entry with empty landowner
                 key = (False, khasra)
                 if key not in compensation_data:
-                    compensation_data[key] = {
-                        'landowner': None,
-                        'landowner_name': '',
-                        'father_name': '',
-                        'address': '',
-                        'khasra': khasra,
-                        'original_area': 0.0,
-                        'acquired_area': 0.0,
-                        'lagan': khasra,  # Using khasra as lagan
-                        'fallow': is_fallow,
-                        'unirrigated': is_unirrigated,
-                        'irrigated': is_irrigated,
-                        'is_diverted': is_diverted,
-                        'guide_line_rate': 0.0,
-                        'market_value': 0.0,
-                        'solatium': 0.0,
-                        'interest': 0.0,
-                        'total_compensation': 0.0,
-                        'rehab_policy_per_acre_1': 0.0,
-                        'rehab_policy_per_acre_2': 0.0,
-                        'rehab_policy_amount': 0.0,
-                        'dev_compensation': 0.0,
-                    }
-                compensation_data[key]['original_area'] += total_area
-                compensation_data[key]['acquired_area'] += acquired_area
+                    compensation_data[key] = LandCompensationRow(
+                        landowner_id=False,
+                        landowner_name='',
+                        father_name='',
+                        address='',
+                        khasra=khasra,
+                        original_area=0.0,
+                        acquired_area=0.0,
+                        lagan=khasra,  # Using khasra as lagan
+                        fallow=is_fallow,
+                        unirrigated=is_unirrigated,
+                        irrigated=is_irrigated,
+                        is_diverted=is_diverted,
+                        guide_line_rate=0.0,
+                        market_value=0.0,
+                        solatium=0.0,
+                        interest=0.0,
+                        total_compensation=0.0,
+                        rehab_policy_per_acre_1=0.0,
+                        rehab_policy_per_acre_2=0.0,
+                        rehab_policy_amount=0.0,
+                        dev_compensation=0.0,
+                    )
+                compensation_data[key].original_area += total_area
+                compensation_data[key].acquired_area += acquired_area
             else:
                 # Process each landowner
                 for landowner in landowners:
                     key = (landowner.id, khasra)
                     if key not in compensation_data:
-                        compensation_data[key] = {
-                            'landowner': landowner,
-                            'landowner_name': landowner.name or '',
-                            'father_name': landowner.father_name or '',
-                            'spouse_name': landowner.spouse_name or '',
-                            'address': landowner.owner_address or '',
-                            'khasra': khasra,
-                            'original_area': 0.0,
-                            'acquired_area': 0.0,
-                            'lagan': khasra,
-                            'fallow': is_fallow,
-                            'unirrigated': is_unirrigated,
-                            'irrigated': is_irrigated,
-                            'is_diverted': is_diverted,
-                            'guide_line_rate': 0.0,  # Will be calculated
-                            'market_value': 0.0,
-                            'solatium': 0.0,
-                            'interest': 0.0,
-                            'total_compensation': 0.0,
-                            'rehab_policy_per_acre_1': 0.0,
-                            'rehab_policy_per_acre_2': 0.0,
-                            'rehab_policy_amount': 0.0,
-                            'dev_compensation': 0.0,
-                        }
-                    compensation_data[key]['original_area'] += total_area
-                    compensation_data[key]['acquired_area'] += acquired_area
-
-        # Convert to list and calculate totals
-        result = []
+                        compensation_data[key] = LandCompensationRow(
+                            landowner_id=landowner.id,
+                            landowner_name=landowner.name or '',
+                            father_name=landowner.father_name or '',
+                            spouse_name=landowner.spouse_name or '',
+                            address=landowner.owner_address or '',
+                            khasra=khasra,
+                            original_area=0.0,
+                            acquired_area=0.0,
+                            lagan=khasra,
+                            fallow=is_fallow,
+                            unirrigated=is_unirrigated,
+                            irrigated=is_irrigated,
+                            is_diverted=is_diverted,
+                            guide_line_rate=0.0,  # Will be calculated
+                            market_value=0.0,
+                            solatium=0.0,
+                            interest=0.0,
+                            total_compensation=0.0,
+                            rehab_policy_per_acre_1=0.0,
+                            rehab_policy_per_acre_2=0.0,
+                            rehab_policy_amount=0.0,
+                            dev_compensation=0.0,
+                        )
+                    compensation_data[key].original_area += total_area
+                    compensation_data[key].acquired_area += acquired_area
+
+        # Award-level values are the same for every row; resolve them once.
+        threshold = self._s23_distance_threshold()
+        village_name = (self.village_id.name or '') if self.village_id else ''
+        # Trigger urban slab path from the award's effective village type
+        # (award override first, then village master fallback).
+        _effective_vtype = (
+            self.village_type
+            or (self.village_id.village_type if self.village_id else 'rural')
+            or 'rural'
+        )
+        _is_urban_village = str(_effective_vtype).lower() == 'urban'
+        _body_type = (
+            self.urban_body_type
+            or (self.village_id.urban_body_type if self.village_id else False)
+        ) if _is_urban_village else False
+
         # Convert to list and calculate totals matching the 19 columns
         result = []
         for _key, data in compensation_data.items():
-            # Get survey to access proper rates if possible
-            survey = self.env['bhu.survey'].search([
-                ('project_id', '=', self.project_id.id),
-                ('village_id', '=', self.village_id.id),
-                ('khasra_number', '=', data['khasra'])
-            ], limit=1)
+            # Survey to access proper rates (prefetched, indexed by khasra)
+            survey = survey_by_khasra.get(data.khasra) or self.env['bhu.survey']
 
             # Derive main-road status from measured distance.
             # Rule: rural <= 50m is MR, urban <= 20m is MR; 0/blank counts as MR.
             distance_from_main_road = (survey.distance_from_main_road or 0.0) if survey else 0.0
-            threshold = self._s23_distance_threshold()
             derived_is_within_distance = distance_from_main_road <= threshold
 
             # Effective guideline rate:
@@ -126,12 +193,13 @@ class Section23AwardData(models.Model):
             # - BMR + diverted + unirrigated: ×1.0
             # - BMR + not-diverted + irrigated: ×1.0
             # - BMR + not-diverted + unirrigated: ×0.8
-            award_line = self.award_survey_line_ids.filtered(lambda l: l.survey_id.id == survey.id)
-            has_award_line = bool(award_line)
+            al_rec = award_line_by_survey.get(survey.id, empty_award_line) if survey else empty_award_line
+            has_award_line = bool(al_rec)
             is_diverted = survey.has_traded_land == 'yes' if survey else False
 
-            al_rec = award_line[:1] if has_award_line else self.env['bhu.section23.award.survey.line']
-            base_rate_ha = self._s23_land_base_rate_per_hectare(survey, al_rec, derived_is_within_distance)
+            base_rate_ha = self._s23_land_base_rate_per_hectare(
+                survey, al_rec, derived_is_within_distance, rate_master=rate_master,
+            )
             # Same MR/BMR lane as rate master / optional manual override on award survey line.
             within_lane = bool(al_rec.is_within_distance) if has_award_line else bool(derived_is_within_distance)
             is_within_distance = within_lane
@@ -151,7 +219,7 @@ class Section23AwardData(models.Model):
             )
 
             if has_award_line:
-                guide_master = award_line[0].guide_line_master_rate or base_rate_ha
+                guide_master = al_rec.guide_line_master_rate or base_rate_ha
             else:
                 guide_master = base_rate_ha or 0.0
             # Always derive effective rate from master × survey-based factors (matches report columns).
@@ -161,14 +229,13 @@ class Section23AwardData(models.Model):
                 irrigation_label = 'Irrigated / सिंचित'
             else:
                 irrigation_label = 'Unirrigated / असिंचित'
-            village_name = (self.village_id.name or '') if self.village_id else ''
             road_lbl = 'MR' if is_within_distance else 'BMR'
             diverted_lbl = 'Yes' if is_diverted else 'No'
 
             # Shared meta fields written into every row regardless of rural/urban path
             data.update({
                 'original_area': survey.total_area if survey else 0.0,
-                'lagan': survey.lagan if (survey and hasattr(survey, 'lagan')) else data['khasra'],
+                'lagan': survey.lagan if (survey and hasattr(survey, 'lagan')) else data.khasra,
                 'is_within_distance': is_within_distance,
                 'distance_from_main_road': distance_from_main_road,
                 'irrigated': is_irrigated_rate,
@@ -189,22 +256,10 @@ class Section23AwardData(models.Model):
             })
 
             # --- Urban area-based slab path ---
-            # Trigger urban slab path from the award's effective village type
-            # (award override first, then village master fallback).
-            _effective_vtype = (
-                self.village_type
-                or (self.village_id.village_type if self.village_id else 'rural')
-                or 'rural'
-            )
-            _is_urban_village = str(_effective_vtype).lower() == 'urban'
-            _body_type = (
-                self.urban_body_type
-                or (self.village_id.urban_body_type if self.village_id else False)
-            ) if _is_urban_village else False
             if _body_type and _is_urban_village:
                 slab_rows = self._generate_urban_slab_rows(
                     data, is_within_distance, guide_master, effective_rate, acre_per_hectare,
-                    body_type=_body_type,
+                    body_type=_body_type, rate_master=rate_master, interest_period=interest_period,
                 )
                 result.extend(slab_rows)
                 continue
@@ -216,14 +271,14 @@ class Section23AwardData(models.Model):
             # 15: solatium = market_value * 1.0
             # 16: interest = 1% per month on basic value from section 4 hearing to award date
 
-            market_value_basic = data['acquired_area'] * effective_rate
+            market_value_basic = data.acquired_area * effective_rate
             market_value_factored = market_value_basic * 2.0
             solatium = market_value_factored * 1.0  # 100%
 
-            interest, _days = self._calculate_interest_on_basic(market_value_basic)
+            interest, _days = self._calculate_interest_on_basic(market_value_basic, period=interest_period)
 
             total_compensation = market_value_factored + solatium + interest
-            acquired_area_acre = data['acquired_area'] * acre_per_hectare
+            acquired_area_acre = data.acquired_area * acre_per_hectare
             rehab_rate_per_acre = self._get_min_rehab_rate_per_acre(
                 data.get('fallow'),
                 data.get('irrigated'),
@@ -248,7 +303,7 @@ class Section23AwardData(models.Model):
             result.append(data)
 
         # Sort by landowner name, then khasra
-        result.sort(key=lambda x: (x['landowner_name'] or '', x['khasra'] or ''))
+        result.sort(key=lambda x: (x.landowner_name or '', x.khasra or ''))
 
         return result
 
@@ -256,12 +311,13 @@ class Section23AwardData(models.Model):
 
     def _generate_urban_slab_rows(self, base_data, is_within_distance,
                                   guide_line_ha, effective_rate_ha, acre_per_hectare,
-                                  body_type=None):
+                                  body_type=None, rate_master=None, interest_period=None):
         """Urban: split one khasra into multiple rows by acquired-area slabs (Nagar Nigam/Palika/Panchayat).
 
         Plot ₹/sqm from the rate master (MR/BMR lane), then BMR factors via
         ``_s23_bmr_rate_multiplier``. Each slab applies its % to that effective ₹/sqm.
         Area above the last slab uses ``effective_rate_ha`` (₹/ha, already BMR-adjusted).
+        ``rate_master`` / ``interest_period`` are passed in by the batch land engine.
         """
         self.ensure_one()
         body_type = (
@@ -298,10 +354,13 @@ class Section23AwardData(models.Model):
             ]
             no_slab_threshold = 0.100
 
-        rm = self.env['bhu.rate.master'].search([
-            ('village_id', '=', self.village_id.id),
-            ('state', 'in', ['active', 'draft']),
-        ], limit=1, order='state ASC, effective_from DESC')
+        if rate_master is not None:
+            rm = rate_master
+        else:
+            rm = self.env['bhu.rate.master'].search([
+                ('village_id', '=', self.village_id.id),
+                ('state', 'in', ['active', 'draft']),
+            ], limit=1, order='state ASC, effective_from DESC')
 
         if is_within_distance:
             sqm_raw = float(self.rate_master_main_road_sqm or 0.0)
@@ -319,7 +378,7 @@ class Section23AwardData(models.Model):
         )
         sqm_plot = sqm_raw * _urban_mult
 
-        total_area_ha = base_data['acquired_area']
+        total_area_ha = base_data.acquired_area
         rows = []
 
         # Policy rule: when acquired area crosses body threshold, no slab split applies.
@@ -328,7 +387,7 @@ class Section23AwardData(models.Model):
             basic_value = total_area_ha * effective_rate_ha
             market_value = basic_value * 2.0
             solatium = market_value * 1.0
-            interest, _ = self._calculate_interest_on_basic(basic_value)
+            interest, _ = self._calculate_interest_on_basic(basic_value, period=interest_period)
             total_comp = market_value + solatium + interest
 
             acquired_acre = total_area_ha * acre_per_hectare
@@ -338,7 +397,7 @@ class Section23AwardData(models.Model):
             rehab_amt = acquired_acre * rehab_rate
             paid = max(total_comp, rehab_amt)
 
-            row = dict(base_data)
+            row = base_data.copy()
             row.update({
                 'acquired_area': total_area_ha,
                 'guide_line_rate': effective_rate_ha,
@@ -375,7 +434,7 @@ class Section23AwardData(models.Model):
             basic_value = portion_sqm * sqm_plot * pct
             market_value = basic_value * 2.0
             solatium = market_value * 1.0
-            interest, _ = self._calculate_interest_on_basic(basic_value)
+            interest, _ = self._calculate_interest_on_basic(basic_value, period=interest_period)
             total_comp = market_value + solatium + interest
 
             acquired_acre = portion_ha * acre_per_hectare
@@ -387,7 +446,7 @@ class Section23AwardData(models.Model):
             paid = max(total_comp, rehab_amt)
 
             effective_sqm_rate = sqm_plot * pct
-            row = dict(base_data)
+            row = base_data.copy()
             row.update({
                 'acquired_area': portion_ha,
                 'guide_line_rate': effective_sqm_rate,
@@ -415,10 +474,9 @@ class Section23AwardData(models.Model):
 
         return rows
 
-    def get_land_compensation_grouped_data(self):
+    def _s23_group_land_compensation_data(self, land_data):
         """Group land rows by owner so multiple khasras appear together."""
         self.ensure_one()
-        land_data = self.get_land_compensation_data()
         grouped = {}
         ordered_keys = []
 
@@ -455,7 +513,7 @@ class Section23AwardData(models.Model):
                     'khasra_count': 0,
                     '_seen_khasra_for_totals': set(),
                 }
-                for field_name in area_totals + amount_totals:
+                for field_name in area_totals:
                     grouped[key][field_name] = 0.0
                 ordered_keys.append(key)
             group = grouped[key]
@@ -470,12 +528,11 @@ class Section23AwardData(models.Model):
                     group['original_area'] += row.get('original_area', 0.0) or 0.0
                 # Acquired area is portion-wise and should sum across slab rows.
                 group['acquired_area'] += row.get('acquired_area', 0.0) or 0.0
-            for field_name in amount_totals:
-                group[field_name] += row.get(field_name, 0.0) or 0.0
 
         result = []
         for key in ordered_keys:
             group = grouped[key]
+            group.update(column_totals(group['lines'], amount_totals))
             lines = sorted(group.get('lines', []), key=_khasra_sort_key)
             # Add merge metadata for urban slab rows so repeating khasra cells
             # render once with rowspan in report columns 3,4,7,8,9,10.
@@ -584,7 +641,7 @@ class Section23AwardData(models.Model):
                 )
         return self.format_indian_number(ha, 4)
 
-    def get_tree_compensation_data(self):
+    def _s23_compute_tree_compensation_data(self):
         """Get tree compensation data grouped by landowner and khasra"""
         self.ensure_one()
 
@@ -601,6 +658,7 @@ class Section23AwardData(models.Model):
 
         # Get all tree lines from surveys
         tree_data = {}
+        tree_rates = surveys.tree_line_ids._get_applicable_rates()
 
         def _tree_label(tree_line):
             base = tree_line.tree_master_id.name if tree_line.tree_master_id else 'Other / अन्य'
@@ -625,41 +683,41 @@ class Section23AwardData(models.Model):
                     key = (False, khasra, tree_type_name)
                     if key not in tree_data:
                         _la = (survey.acquired_area or 0.0) or (survey.total_area or 0.0)
-                        tree_data[key] = {
-                            'landowner': None,
-                            'landowner_name': '',
-                            'father_name': '',
-                            'khasra': khasra,
-                            'total_khasra': '',
-                            'total_area': _la,
-                            'land_khasra': khasra,
-                            'land_area_ha': _la,
-                            'tree_khasra': khasra,
-                            'mulya': 0.0,
-                            'kul_rashi': 0.0,
-                            'tree_type': tree_type_name,
-                            'tree_type_code': getattr(tree_line, 'tree_type', '') or 'other',
-                            'tree_count': 0,
-                            'girth_cm': 0.0,
-                            'unit_rate': 0.0,
-                            'rate': 0.0,
-                            'development_stage': getattr(tree_line, 'development_stage', '') or '',
-                            'condition': getattr(tree_line, 'condition', '') or '',
-                            'value': 0.0,
-                            'determined_value': 0.0,
-                            'solatium': 0.0,
-                            'interest': 0.0,
-                            'total': 0.0,
-                            'remark': '',
-                        }
-                    rate_per_tree = tree_line.get_applicable_rate() if hasattr(tree_line, 'get_applicable_rate') else 0.0
-                    tree_data[key]['tree_count'] += tree_line.quantity or 0
-                    tree_data[key]['girth_cm'] = getattr(tree_line, 'girth_cm', 0.0) or 0.0
-                    tree_data[key]['rate'] = rate_per_tree
-                    tree_data[key]['unit_rate'] = rate_per_tree
-                    tree_data[key]['development_stage'] = getattr(tree_line, 'development_stage', '') or ''
-                    tree_data[key]['condition'] = getattr(tree_line, 'condition', '') or ''
-                    tree_data[key]['value'] += (getattr(tree_line, 'quantity', 0) or 0) * rate_per_tree
+                        tree_data[key] = TreeCompensationRow(
+                            landowner_id=False,
+                            landowner_name='',
+                            father_name='',
+                            khasra=khasra,
+                            total_khasra='',
+                            total_area=_la,
+                            land_khasra=khasra,
+                            land_area_ha=_la,
+                            tree_khasra=khasra,
+                            mulya=0.0,
+                            kul_rashi=0.0,
+                            tree_type=tree_type_name,
+                            tree_type_code=getattr(tree_line, 'tree_type', '') or 'other',
+                            tree_count=0,
+                            girth_cm=0.0,
+                            unit_rate=0.0,
+                            rate=0.0,
+                            development_stage=getattr(tree_line, 'development_stage', '') or '',
+                            condition=getattr(tree_line, 'condition', '') or '',
+                            value=0.0,
+                            determined_value=0.0,
+                            solatium=0.0,
+                            interest=0.0,
+                            total=0.0,
+                            remark='',
+                        )
+                    rate_per_tree = tree_rates.get(tree_line.id, 0.0)
+                    tree_data[key].tree_count += tree_line.quantity or 0
+                    tree_data[key].girth_cm = getattr(tree_line, 'girth_cm', 0.0) or 0.0
+                    tree_data[key].rate = rate_per_tree
+                    tree_data[key].unit_rate = rate_per_tree
+                    tree_data[key].development_stage = getattr(tree_line, 'development_stage', '') or ''
+                    tree_data[key].condition = getattr(tree_line, 'condition', '') or ''
+                    tree_data[key].value += (getattr(tree_line, 'quantity', 0) or 0) * rate_per_tree
             else:
                 # Process each landowner
                 for landowner in landowners:
@@ -668,68 +726,68 @@ class Section23AwardData(models.Model):
                         key = (landowner.id, khasra, tree_type_name)
                         if key not in tree_data:
                             _la = (survey.acquired_area or 0.0) or (survey.total_area or 0.0)
-                            tree_data[key] = {
-                                'landowner': landowner,
-                                'landowner_name': landowner.name or '',
-                                'father_name': landowner.father_name or '',
-                                'spouse_name': landowner.spouse_name or '',
-                                'khasra': khasra,
-                                'total_khasra': khasra,
-                                'total_area': _la,
-                                'land_khasra': khasra,
-                                'land_area_ha': _la,
-                                'tree_khasra': khasra,
-                                'mulya': 0.0,
-                                'kul_rashi': 0.0,
-                                'tree_type': tree_type_name,
-                                'tree_type_code': getattr(tree_line, 'tree_type', '') or 'other',
-                                'tree_count': 0,
-                                'girth_cm': 0.0,
-                                'unit_rate': 0.0,
-                                'rate': 0.0,
-                                'development_stage': getattr(tree_line, 'development_stage', '') or '',
-                                'condition': getattr(tree_line, 'condition', '') or '',
-                                'value': 0.0,
-                                'determined_value': 0.0,
-                                'solatium': 0.0,
-                                'interest': 0.0,
-                                'total': 0.0,
-                                'remark': '',
-                            }
-                        rate_per_tree = tree_line.get_applicable_rate() if hasattr(tree_line, 'get_applicable_rate') else 0.0
-                        tree_data[key]['tree_count'] += getattr(tree_line, 'quantity', 0) or 0
-                        tree_data[key]['girth_cm'] = getattr(tree_line, 'girth_cm', 0.0) or 0.0
-                        tree_data[key]['unit_rate'] = rate_per_tree
-                        tree_data[key]['rate'] = rate_per_tree
-                        tree_data[key]['development_stage'] = getattr(tree_line, 'development_stage', '') or ''
-                        tree_data[key]['condition'] = getattr(tree_line, 'condition', '') or ''
-                        tree_data[key]['value'] += (getattr(tree_line, 'quantity', 0) or 0) * rate_per_tree
+                            tree_data[key] = TreeCompensationRow(
+                                landowner_id=landowner.id,
+                                landowner_name=landowner.name or '',
+                                father_name=landowner.father_name or '',
+                                spouse_name=landowner.spouse_name or '',
+                                khasra=khasra,
+                                total_khasra=khasra,
+                                total_area=_la,
+                                land_khasra=khasra,
+                                land_area_ha=_la,
+                                tree_khasra=khasra,
+                                mulya=0.0,
+                                kul_rashi=0.0,
+                                tree_type=tree_type_name,
+                                tree_type_code=getattr(tree_line, 'tree_type', '') or 'other',
+                                tree_count=0,
+                                girth_cm=0.0,
+                                unit_rate=0.0,
+                                rate=0.0,
+                                development_stage=getattr(tree_line, 'development_stage', '') or '',
+                                condition=getattr(tree_line, 'condition', '') or '',
+                                value=0.0,
+                                determined_value=0.0,
+                                solatium=0.0,
+                                interest=0.0,
+                                total=0.0,
+                                remark='',
+                            )
+                        rate_per_tree = tree_rates.get(tree_line.id, 0.0)
+                        tree_data[key].tree_count += getattr(tree_line, 'quantity', 0) or 0
+                        tree_data[key].girth_cm = getattr(tree_line, 'girth_cm', 0.0) or 0.0
+                        tree_data[key].unit_rate = rate_per_tree
+                        tree_data[key].rate = rate_per_tree
+                        tree_data[key].development_stage = getattr(tree_line, 'development_stage', '') or ''
+                        tree_data[key].condition = getattr(tree_line, 'condition', '') or ''
+                        tree_data[key].value += (getattr(tree_line, 'quantity', 0) or 0) * rate_per_tree
 
         # Calculate compensation amounts
         result = []
         for _key, data in tree_data.items():
-            determined_value = data['value']
-            data['mulya'] = determined_value
-            data['kul_rashi'] = determined_value
-            data['land_khasra'] = data.get('land_khasra') or data.get('khasra') or ''
-            data['tree_khasra'] = data.get('tree_khasra') or data.get('khasra') or ''
-            data['land_area_ha'] = data.get('land_area_ha', 0.0) or 0.0
+            determined_value = data.value
+            data.mulya = determined_value
+            data.kul_rashi = determined_value
+            data.land_khasra = data.get('land_khasra') or data.get('khasra') or ''
+            data.tree_khasra = data.get('tree_khasra') or data.get('khasra') or ''
+            data.land_area_ha = data.get('land_area_ha', 0.0) or 0.0
             solatium = determined_value * 1.0  # 100% solatium
             interest, _days = self._calculate_interest_on_basic(determined_value)
             total = determined_value + solatium + interest
 
-            data['determined_value'] = determined_value
-            data['solatium'] = solatium
-            data['interest'] = interest
-            data['total'] = total
+            data.determined_value = determined_value
+            data.solatium = solatium
+            data.interest = interest
+            data.total = total
             result.append(data)
 
         # Sort by landowner name, then khasra, then tree type
-        result.sort(key=lambda x: (x['landowner_name'] or '', x['khasra'] or '', x.get('tree_type', '') or ''))
+        result.sort(key=lambda x: (x.landowner_name or '', x.khasra or '', x.get('tree_type', '') or ''))
 
         return result
 
-    def get_structure_compensation_data(self):
+    def _s23_compute_structure_compensation_data(self):
         """Get structure compensation data from shared award structure entries."""
         self.ensure_one()
         surveys = self.env['bhu.survey'].search([
@@ -773,22 +831,21 @@ class Section23AwardData(models.Model):
             first_owner = owners[0] if owners else None
             owner_names = ', '.join([o.name for o in owners if o.name]) if owners else ''
             total_interest, _days = self._calculate_interest_on_basic(total_value)
-            structure_data.append({
+            structure_data.append(StructureCompensationRow(
                 **base_row,
-                'landowner_name': owner_names,
-                'father_name': first_owner.father_name if first_owner else '',
-                'spouse_name': first_owner.spouse_name if first_owner else '',
-                'address': first_owner.owner_address if first_owner else '',
-                'market_value': total_value,
-                'solatium': total_value,
-                'interest': total_interest,
-                'total': total_value + total_value + total_interest,
-            })
+                landowner_name=owner_names,
+                father_name=first_owner.father_name if first_owner else '',
+                spouse_name=first_owner.spouse_name if first_owner else '',
+                address=first_owner.owner_address if first_owner else '',
+                market_value=total_value,
+                solatium=total_value,
+                interest=total_interest,
+                total=total_value + total_value + total_interest,
+            ))
         return structure_data
 
-    def get_tree_compensation_grouped_data(self):
+    def _s23_group_tree_compensation_data(self, tree_data):
         self.ensure_one()
-        tree_data = self.get_tree_compensation_data()
         grouped = {}
         ordered_keys = []
         numeric_totals = (
@@ -796,10 +853,10 @@ class Section23AwardData(models.Model):
             'solatium', 'interest', 'total',
         )
         for row in tree_data:
-            owner = row.get('landowner')
+            owner_id = row.landowner_id
             khasra = row.get('tree_khasra') or row.get('khasra') or ''
-            if owner:
-                key = ('owner_khasra', owner.id, khasra)
+            if owner_id:
+                key = ('owner_khasra', owner_id, khasra)
             elif row.get('landowner_name'):
                 key = ('name_khasra', row.get('landowner_name'), row.get('father_name') or '', khasra)
             else:
@@ -814,8 +871,6 @@ class Section23AwardData(models.Model):
                     'khasra_count': 0,
                     'khasra_seen': set(),
                 }
-                for field_name in numeric_totals:
-                    grouped[key][field_name] = 0.0
                 ordered_keys.append(key)
             group = grouped[key]
             group['lines'].append(row)
@@ -823,20 +878,18 @@ class Section23AwardData(models.Model):
             if khasra and khasra not in group['khasra_seen']:
                 group['khasra_seen'].add(khasra)
                 group['khasra_count'] += 1
-            for field_name in numeric_totals:
-                group[field_name] += row.get(field_name, 0.0) or 0.0
 
         result = []
         for key in ordered_keys:
             group = grouped[key]
+            group.update(column_totals(group['lines'], numeric_totals))
             group.pop('khasra_seen', None)
             result.append(group)
         return result
 
-    def get_structure_compensation_grouped_data(self):
+    def _s23_group_structure_compensation_data(self, structure_data):
         """Group structure rows by khasra for report rowspans/subtotals."""
         self.ensure_one()
-        structure_data = self.get_structure_compensation_data()
         grouped = {}
         ordered_keys = []
         numeric_totals = ('total_area', 'asset_land_area', 'asset_dimension', 'market_value', 'solatium', 'interest', 'total')
@@ -853,8 +906,6 @@ class Section23AwardData(models.Model):
                     'owner_names': [],
                     'owner_seen': set(),
                 }
-                for field_name in numeric_totals:
-                    grouped[key][field_name] = 0.0
                 ordered_keys.append(key)
             group = grouped[key]
             owner_name = (row.get('landowner_name') or '').strip()
@@ -866,12 +917,11 @@ class Section23AwardData(models.Model):
             if khasra and khasra not in group['khasra_seen']:
                 group['khasra_seen'].add(khasra)
                 group['khasra_count'] += 1
-            for field_name in numeric_totals:
-                group[field_name] += row.get(field_name, 0.0) or 0.0
 
         result = []
         for key in ordered_keys:
             group = grouped[key]
+            group.update(column_totals(group['lines'], numeric_totals))
             group['landowner_name'] = ', '.join(group['owner_names'])
             group.pop('owner_names', None)
             group.pop('owner_seen', None)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""Fingerprinted Section 23 document cache.
+
+One row per (award, variant, scope, format) points at the cached attachment
+and stores the fingerprint of the inputs it was rendered from. Lookups are an
+exact match on the unique key; a matching fingerprint means the cached file is
+still current and rendering can be skipped.
+"""
+import hashlib
+import json
+
+from odoo import fields, models
+
+# Bump when the fingerprint payload changes shape.
+S23_CACHE_FINGERPRINT_VERSION = 1
+
+# Inputs each cache scope depends on (see ``_s23_cache_input_digests``).
+S23_SCOPE_COMPONENTS = {
+    'land': ('surveys', 'award_lines', 'land_rates'),
+    'tree': ('surveys', 'trees'),
+    'asset': ('surveys', 'assets'),
+    'all': ('surveys', 'award_lines', 'land_rates', 'trees', 'assets'),
+}
+
+_ROWS_DIGEST = (
+    "SELECT md5(coalesce(string_agg(t.id::text || '@' || coalesce(t.write_date::text, ''), ','"
+    " ORDER BY t.id), '')) FROM %s t WHERE %s"
+)
+
+# component -> list of (table, where clause); params are (award_id, project_id, village_id).
+S23_DIGEST_QUERIES = {
+    'surveys': [
+        ('bhu_survey', "t.project_id = %(project_id)s AND t.village_id = %(village_id)s"),
+        ('bhu_landowner', """t.id IN (
+            SELECT r.landowner_id FROM bhu_survey_landowner_rel r
+              JOIN bhu_survey s ON s.id = r.survey_id
+             WHERE s.project_id = %(project_id)s AND s.village_id = %(village_id)s)"""),
+    ],
+    'award_lines': [
+        ('bhu_section23_award_survey_line', "t.award_id = %(award_id)s"),
+    ],
+    'land_rates': [
+        ('bhu_rate_master', "t.village_id = %(village_id)s"),
+    ],
+    'trees': [
+        ('bhu_survey_tree_line', """t.survey_id IN (
+            SELECT s.id FROM bhu_survey s
+             WHERE s.project_id = %(project_id)s AND s.village_id = %(village_id)s)"""),
+        ('bhu_tree_master', "TRUE"),
+        ('bhu_tree_rate_master', "TRUE"),
+    ],
+    'assets': [
+        ('bhu_award_structure_details', """t.award_id = %(award_id)s OR t.survey_id IN (
+            SELECT s.id FROM bhu_survey s
+             WHERE s.project_id = %(project_id)s AND s.village_id = %(village_id)s)"""),
+    ],
+}
+
+
+def s23_fingerprint(payload):
+    """Stable sha256 of a JSON-serialisable payload."""
+    raw = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=True)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def s23_rows_digest_query(table, where):
+    return _ROWS_DIGEST % (table, where)
+
+
+class Section23AwardCache(models.Model):
+    _name = 'bhu.section23.award.cache'
+    _description = 'Section 23 Award Document Cache'
+
+    award_id = fields.Many2one('bhu.section23.award', string='Award', required=True,
+                               index=True, ondelete='cascade')
+    variant = fields.Char(string='Variant', required=True)
+    export_scope = fields.Char(string='Scope', required=True)
+    file_format = fields.Char(string='Format', required=True)
+    fingerprint = fields.Char(string='Input Fingerprint', index=True)
+    attachment_id = fields.Many2one('ir.attachment', string='Attachment', ondelete='cascade')
+
+    _sql_constraints = [
+        ('award_variant_scope_format_uniq', 'unique(award_id, variant, export_scope, file_format)',
+         'Only one cached document per award, variant, scope and format.'),
+    ]
@@ -3,6 +3,8 @@
 from odoo import fields, models, _
 from odoo.exceptions import ValidationError
 
+from ..xlsx_export import XlsxExport
+
 
 class Section23AwardExcel(models.Model):
     _inherit = 'bhu.section23.award'
@@ -17,15 +19,12 @@ class Section23AwardExcel(models.Model):
         show_land = export_scope in ('all', 'land')
         show_asset = export_scope in ('all', 'asset')
         show_tree = export_scope in ('all', 'tree')
-        import io
-        import base64
         try:
-            import xlsxwriter
+            import xlsxwriter  # noqa: F401
         except ImportError:
             raise ValidationError(_("Python library 'xlsxwriter' is not installed."))
 
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+        workbook = XlsxExport()
         award_headers = self.get_award_header_constants()
         land_sheet = asset_sheet = tree_sheet = None
         if show_land:
@@ -539,25 +538,18 @@ class Section23AwardExcel(models.Model):
                     tree_sheet.write_blank(tree_row, 12, None, total_label_fmt)
                     tree_row += 1
 
-        workbook.close()
-        output.seek(0)
-        file_data = base64.b64encode(output.read())
-        output.close()
-
         scope_suffix = {
             'all': 'all',
             'land': 'land',
             'asset': 'asset',
             'tree': 'tree',
         }.get(export_scope, 'all')
-        attachment = self.env['ir.attachment'].create({
-            'name': f"Section23_Award_{self.village_id.name or 'Export'}_{scope_suffix}.xlsx",
-            'type': 'binary',
-            'datas': file_data,
-            'mimetype': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            'res_model': self._name,
-            'res_id': self.id,
-        })
+        attachment = workbook.save_attachment(
+            self.env,
+            f"Section23_Award_{self.village_id.name or 'Export'}_{scope_suffix}.xlsx",
+            self._name,
+            self.id,
+        )
         return {
             'type': 'ir.actions.act_url',
             'url': f'/web/content/{attachment.id}?download=true',
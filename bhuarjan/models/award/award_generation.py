@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
 """Award generation — split slices on ``bhu.section23.award``."""
 from . import award_generation_wizard  # noqa: F401
+from . import award_document_cache  # noqa: F401
 from . import award_generation_cache  # noqa: F401
+from . import award_generation_snapshot  # noqa: F401
+from . import award_progress_store  # noqa: F401
+from . import award_progress_bus  # noqa: F401
 from . import award_generation_progress  # noqa: F401
 from . import award_generation_flow  # noqa: F401
 from . import award_generation_state  # noqa: F401
+from . import award_generation_job  # noqa: F401
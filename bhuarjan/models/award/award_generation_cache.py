@@ -1,11 +1,18 @@
 # -*- coding: utf-8 -*-
 
-import base64
 import re
 
 from odoo import models, api, _
 from odoo.exceptions import ValidationError
 
+from .award_document_cache import (
+    S23_CACHE_FINGERPRINT_VERSION,
+    S23_DIGEST_QUERIES,
+    S23_SCOPE_COMPONENTS,
+    s23_fingerprint,
+    s23_rows_digest_query,
+)
+
 
 class Section23Award(models.Model):
     _inherit = 'bhu.section23.award'
@@ -34,8 +41,69 @@ class Section23Award(models.Model):
         ext = 'pdf' if (file_format or 'pdf').lower() == 'pdf' else 'xlsx'
         return f"Sec23_Award_{award_type_tok}_{village_tok}_{loc_tok}.{ext}"
 
+    def _s23_cache_input_digests(self, components):
+        """Digest of ``(id, write_date)`` for every row feeding the given components."""
+        self.ensure_one()
+        params = {
+            'award_id': self.id,
+            'project_id': self.project_id.id or 0,
+            'village_id': self.village_id.id or 0,
+        }
+        self.env.flush_all()
+        digests = {}
+        for component in components:
+            parts = []
+            for table, where in S23_DIGEST_QUERIES[component]:
+                self.env.cr.execute(s23_rows_digest_query(table, where), params)
+                parts.append(self.env.cr.fetchone()[0])
+            digests[component] = parts
+        return digests
+
+    def _s23_cache_fingerprint(self, export_scope='all', variant='standard', digests=None):
+        """Fingerprint of everything a cached document is rendered from."""
+        self.ensure_one()
+        scope = (export_scope or 'all').lower()
+        var = (variant or 'standard').lower()
+        # Consolidated/R&R always cover every component.
+        components = S23_SCOPE_COMPONENTS['all' if var != 'standard' else scope]
+        if digests is None:
+            digests = self._s23_cache_input_digests(components)
+        module = self.env['ir.module.module'].sudo().search([('name', '=', 'bhuarjan')], limit=1)
+        rate_master = self._get_active_rate_master_for_village()
+        hearing_date, award_date = self._s23_interest_period()
+        return s23_fingerprint({
+            'version': S23_CACHE_FINGERPRINT_VERSION,
+            'module': module.latest_version,
+            'variant': var,
+            'scope': scope,
+            'header': [
+                self.name, self.case_number, self.award_date, hearing_date, award_date,
+                self.avg_three_year_sales_sort_rate,
+                self.rate_master_main_road_ha, self.rate_master_other_road_ha,
+                self.rate_master_main_road_sqm, self.rate_master_other_road_sqm,
+                self.village_type, self.urban_body_type,
+                self.project_id.id, self.project_id.write_date,
+                self.village_id.id, self.village_id.write_date,
+            ],
+            'rate_master': [rate_master.id, rate_master.write_date] if rate_master else None,
+            'inputs': {c: digests[c] for c in components},
+        })
+
+    def _s23_get_cache_entry(self, export_scope='all', variant='standard', file_format='pdf'):
+        self.ensure_one()
+        return self.env['bhu.section23.award.cache'].search([
+            ('award_id', '=', self.id),
+            ('variant', '=', (variant or 'standard').lower()),
+            ('export_scope', '=', (export_scope or 'all').lower()),
+            ('file_format', '=', 'pdf' if (file_format or 'pdf').lower() == 'pdf' else 'excel'),
+        ], limit=1)
+
     def _s23_get_cached_attachment(self, export_scope='all', variant='standard', file_format='pdf'):
         self.ensure_one()
+        entry = self._s23_get_cache_entry(export_scope, variant, file_format)
+        if entry:
+            return entry.attachment_id
+        # Files cached before fingerprinting were only tagged in the description.
         cache_key = self._s23_cache_attachment_name(export_scope, variant, file_format)
         att = self.env['ir.attachment'].search([
             ('res_model', '=', self._name),
@@ -58,25 +126,65 @@ class Section23Award(models.Model):
             ('name', '=', legacy_name),
         ], limit=1)
 
-    def _s23_store_cached_attachment(self, binary_data, export_scope='all', variant='standard', file_format='pdf'):
+    def _s23_is_cache_current(self, export_scope='all', variant='standard', file_format='pdf', fingerprint=None):
+        """True when the cached file exists and was rendered from ``fingerprint``."""
+        self.ensure_one()
+        entry = self._s23_get_cache_entry(export_scope, variant, file_format)
+        return bool(entry and entry.attachment_id and fingerprint and entry.fingerprint == fingerprint)
+
+    def _s23_store_cached_attachment(self, binary_data, export_scope='all', variant='standard', file_format='pdf',
+                                     fingerprint=None):
         self.ensure_one()
         if not binary_data:
             return False
-        cache_key = self._s23_cache_attachment_name(export_scope, variant, file_format)
-        user_name = self._s23_cache_filename_for_user(export_scope, variant, file_format)
-        mimetype = 'application/pdf' if (file_format or 'pdf') == 'pdf' else 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        old = self._s23_get_cached_attachment(export_scope, variant, file_format)
+        scope = (export_scope or 'all').lower()
+        var = (variant or 'standard').lower()
+        fmt = 'pdf' if (file_format or 'pdf').lower() == 'pdf' else 'excel'
+        cache_key = self._s23_cache_attachment_name(scope, var, fmt)
+        user_name = self._s23_cache_filename_for_user(scope, var, fmt)
+        mimetype = 'application/pdf' if fmt == 'pdf' else 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        if fingerprint is None:
+            fingerprint = self._s23_cache_fingerprint(scope, var)
+        old = self._s23_get_cached_attachment(scope, var, fmt)
         if old:
             old.unlink()
-        return self.env['ir.attachment'].create({
+        att = self.env['ir.attachment'].create({
             'name': user_name,
             'type': 'binary',
-            'datas': base64.b64encode(binary_data),
+            'raw': binary_data,
             'mimetype': mimetype,
             'res_model': self._name,
             'res_id': self.id,
-            'description': f'S23 cached export ({variant}/{export_scope}/{file_format}) [{cache_key}]',
+            'description': f'S23 cached export ({var}/{scope}/{fmt}) [{cache_key}]',
         })
+        entry = self._s23_get_cache_entry(scope, var, fmt)
+        vals = {'attachment_id': att.id, 'fingerprint': fingerprint}
+        if entry:
+            entry.write(vals)
+        else:
+            self.env['bhu.section23.award.cache'].create(dict(
+                vals, award_id=self.id, variant=var, export_scope=scope, file_format=fmt,
+            ))
+        return att
+
+    def _s23_stale_cache_variants(self, variants=('consolidated', 'rr')):
+        """Variants whose cached files no longer match the current inputs."""
+        self.ensure_one()
+        stale = []
+        digests = None
+        for var in variants:
+            entries = self.env['bhu.section23.award.cache'].search([
+                ('award_id', '=', self.id),
+                ('variant', '=', var),
+            ])
+            if not entries:
+                continue
+            if digests is None:
+                digests = self._s23_cache_input_digests(S23_SCOPE_COMPONENTS['all'])
+            fingerprint = self._s23_cache_fingerprint('all', var, digests=digests)
+            if any(e.fingerprint != fingerprint for e in entries):
+                stale.append(var)
+        return tuple(stale)
 
     def _s23_clear_variant_cache(self, variants=None):
         """Delete cached files for selected variant(s) from DB."""
@@ -85,11 +193,15 @@ class Section23Award(models.Model):
         vars_clean = tuple(v for v in variants if v in ('standard', 'consolidated', 'rr'))
         if not vars_clean:
             return 0
+        entries = self.env['bhu.section23.award.cache'].search([
+            ('award_id', '=', self.id),
+            ('variant', 'in', vars_clean),
+        ])
         atts = self.env['ir.attachment'].search([
             ('res_model', '=', self._name),
             ('res_id', '=', self.id),
         ])
-        to_remove = atts.filtered(
+        to_remove = entries.attachment_id | atts.filtered(
             lambda att: any(
                 (f"s23_cache::{var}::" in ((att.description or '').lower())) or
                 (f"S23_CACHE__{var}__" in (att.name or ''))
@@ -97,6 +209,7 @@ class Section23Award(models.Model):
             )
         )
         count = len(to_remove)
+        entries.unlink()
         if to_remove:
             to_remove.unlink()
         return count
@@ -147,7 +260,10 @@ class Section23Award(models.Model):
         return b''
 
     def _s23_prepare_variant_cache(self, variant='standard', export_scope='all'):
-        """Generate and cache BOTH PDF and Excel for a variant."""
+        """Generate and cache BOTH PDF and Excel for a variant.
+
+        Formats whose cached file still matches the input fingerprint are kept.
+        """
         self.ensure_one()
         var = (variant or 'standard').lower()
         scope = export_scope or 'all'
@@ -170,42 +286,55 @@ class Section23Award(models.Model):
                 flush=True,
             )
 
-        self._s23_increment_loader_progress(
-            step=1, label=_('Rendering PDF report...'), flush=True, active=True
-        )
-        pdf_bytes = self._s23_render_variant_pdf_bytes(variant=var, export_scope=scope)
-        if pdf_bytes:
-            self._s23_store_cached_attachment(
-                pdf_bytes, export_scope=scope, variant=var, file_format='pdf'
+        fingerprint = self._s23_cache_fingerprint(export_scope=scope, variant=var)
+        if self._s23_is_cache_current(scope, var, 'pdf', fingerprint):
+            self._s23_increment_loader_progress(
+                step=2, label=_('PDF unchanged, using cached file...'), flush=True, active=True
             )
+        else:
             self._s23_increment_loader_progress(
-                step=1, label=_('Uploading PDF to DB cache...'), flush=True, active=True
+                step=1, label=_('Rendering PDF report...'), flush=True, active=True
             )
-
-        excel_action = False
-        self._s23_increment_loader_progress(
-            step=1, label=_('Rendering Excel report...'), flush=True, active=True
-        )
-        if var == 'standard':
-            excel_action = self.action_download_excel_components(export_scope=scope)
-        elif var == 'consolidated':
-            excel_action = self.action_download_consolidated_excel()
-        elif var == 'rr':
-            excel_action = self.action_download_rr_excel()
-
-        excel_attachment_id = self._extract_attachment_id_from_action(excel_action)
-        if excel_attachment_id:
-            tmp_att = self.env['ir.attachment'].browse(excel_attachment_id)
-            if tmp_att.exists() and tmp_att.datas:
-                excel_bytes = base64.b64decode(tmp_att.datas)
+            pdf_bytes = self._s23_render_variant_pdf_bytes(variant=var, export_scope=scope)
+            if pdf_bytes:
                 self._s23_store_cached_attachment(
-                    excel_bytes, export_scope=scope, variant=var, file_format='excel'
+                    pdf_bytes, export_scope=scope, variant=var, file_format='pdf',
+                    fingerprint=fingerprint,
                 )
                 self._s23_increment_loader_progress(
-                    step=1, label=_('Uploading Excel to DB cache...'), flush=True, active=True
+                    step=1, label=_('Uploading PDF to DB cache...'), flush=True, active=True
                 )
-                # Keep DB clean: remove temporary one created by exporter.
-                tmp_att.unlink()
+
+        if self._s23_is_cache_current(scope, var, 'excel', fingerprint):
+            self._s23_increment_loader_progress(
+                step=2, label=_('Excel unchanged, using cached file...'), flush=True, active=True
+            )
+        else:
+            excel_action = False
+            self._s23_increment_loader_progress(
+                step=1, label=_('Rendering Excel report...'), flush=True, active=True
+            )
+            if var == 'standard':
+                excel_action = self.action_download_excel_components(export_scope=scope)
+            elif var == 'consolidated':
+                excel_action = self.action_download_consolidated_excel()
+            elif var == 'rr':
+                excel_action = self.action_download_rr_excel()
+
+            excel_attachment_id = self._extract_attachment_id_from_action(excel_action)
+            if excel_attachment_id:
+                tmp_att = self.env['ir.attachment'].browse(excel_attachment_id)
+                if tmp_att.exists() and tmp_att.file_size:
+                    excel_bytes = tmp_att.raw
+                    self._s23_store_cached_attachment(
+                        excel_bytes, export_scope=scope, variant=var, file_format='excel',
+                        fingerprint=fingerprint,
+                    )
+                    self._s23_increment_loader_progress(
+                        step=1, label=_('Uploading Excel to DB cache...'), flush=True, active=True
+                    )
+                    # Keep DB clean: remove temporary one created by exporter.
+                    tmp_att.unlink()
         self._s23_increment_loader_progress(
             step=1, label=_('Cache ready. Updating status...'), flush=True, active=True
         )
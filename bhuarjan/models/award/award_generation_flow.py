@@ -8,6 +8,8 @@ from datetime import datetime
 from odoo import models, api, _
 from odoo.exceptions import ValidationError
 
+from .award_document_cache import S23_SCOPE_COMPONENTS
+
 _logger = logging.getLogger(__name__)
 
 
@@ -43,20 +45,41 @@ class Section23Award(models.Model):
         self._sync_award_structure_lines()
         t_sync = time.perf_counter() - t0
         t1 = time.perf_counter()
-        self._refresh_award_line_items(export_scope=export_scope, log_khasra=True)
+        # Exports refresh the rate lines first; do it before fingerprinting so
+        # the inputs stay as digested for the whole generation.
+        self._s23_recompute_award_survey_lines_for_export()
+        digests = self._s23_cache_input_digests(S23_SCOPE_COMPONENTS['all'])
+        fingerprint = self._s23_cache_fingerprint(export_scope=export_scope, variant='standard', digests=digests)
+        award = self._s23_open_computation_snapshot(digests)
+        # The refresh replaces all line items with the requested scope's rows,
+        # so stored items are only reusable when built for this same scope.
+        if (self.award_line_item_ids
+                and self.award_line_items_scope == (export_scope or 'all').lower()
+                and self._s23_is_cache_current(export_scope, 'standard', 'pdf', fingerprint)
+                and self._s23_is_cache_current(export_scope, 'standard', 'excel', fingerprint)):
+            # Inputs unchanged since the cached files were rendered: keep rows and files.
+            _logger.info("[S23 GENERATE] award=%s scope=%s unchanged, reusing cache", self.id, export_scope)
+        else:
+            award._refresh_award_line_items(export_scope=export_scope, log_khasra=True)
         t_refresh = time.perf_counter() - t1
         t2 = time.perf_counter()
-        self._s23_prepare_standard_scope_cache(export_scope=export_scope)
+        award._s23_prepare_standard_scope_cache(export_scope=export_scope)
         t_cache = time.perf_counter() - t2
         # Base section change invalidates consolidated/R&R snapshots.
         self._s23_increment_loader_progress(
             step=1, label=_('Resetting dependent caches...'), flush=True, active=True
         )
-        removed_count = self._s23_clear_variant_cache(variants=('consolidated', 'rr'))
-        self.write({
-            'consolidated_generated': False,
-            'rr_generated': False,
-        })
+        stale_variants = self._s23_stale_cache_variants(('consolidated', 'rr'))
+        removed_count = self._s23_clear_variant_cache(variants=stale_variants) if stale_variants else 0
+        had_consolidated = had_consolidated and 'consolidated' in stale_variants
+        had_rr = had_rr and 'rr' in stale_variants
+        reset_vals = {}
+        if 'consolidated' in stale_variants:
+            reset_vals['consolidated_generated'] = False
+        if 'rr' in stale_variants:
+            reset_vals['rr_generated'] = False
+        if reset_vals:
+            self.write(reset_vals)
         self._s23_increment_loader_progress(
             step=1, label=_('Updating generation status...'), flush=True, active=True
         )
@@ -108,28 +131,28 @@ class Section23Award(models.Model):
 
     def action_generate_land_award(self):
         self.ensure_one()
-        return self._generate_scope_without_download(
+        return self._enqueue_scope_generation(
             export_scope='land',
             label=_('Land award generated. Use Download Land Award for PDF/Excel.'),
         )
 
     def action_generate_tree_award(self):
         self.ensure_one()
-        return self._generate_scope_without_download(
+        return self._enqueue_scope_generation(
             export_scope='tree',
             label=_('Tree award generated. Use Download Tree Award for PDF/Excel.'),
         )
 
     def action_generate_asset_award(self):
         self.ensure_one()
-        return self._generate_scope_without_download(
+        return self._enqueue_scope_generation(
             export_scope='asset',
             label=_('Asset award generated. Use Download Asset Award for PDF/Excel.'),
         )
 
     def action_regenerate_land_award(self):
         self.ensure_one()
-        return self._generate_scope_without_download(
+        return self._enqueue_scope_generation(
             export_scope='land',
             label=_('Land award regenerated. Latest PDF/Excel cached and ready to download.'),
             allow_regenerate=True,
@@ -137,7 +160,7 @@ class Section23Award(models.Model):
 
     def action_regenerate_tree_award(self):
         self.ensure_one()
-        return self._generate_scope_without_download(
+        return self._enqueue_scope_generation(
             export_scope='tree',
             label=_('Tree award regenerated. Latest PDF/Excel cached and ready to download.'),
             allow_regenerate=True,
@@ -145,7 +168,7 @@ class Section23Award(models.Model):
 
     def action_regenerate_asset_award(self):
         self.ensure_one()
-        return self._generate_scope_without_download(
+        return self._enqueue_scope_generation(
             export_scope='asset',
             label=_('Asset award regenerated. Latest PDF/Excel cached and ready to download.'),
             allow_regenerate=True,
@@ -157,7 +180,9 @@ class Section23Award(models.Model):
         var = (variant or 'consolidated').lower()
         if var not in ('consolidated', 'rr'):
             var = 'consolidated'
-        self._s23_prepare_variant_cache(variant=var, export_scope='all')
+        self._s23_recompute_award_survey_lines_for_export()
+        award = self._s23_open_computation_snapshot()
+        award._s23_prepare_variant_cache(variant=var, export_scope='all')
         self._mark_variant_generated(variant=var)
         lbl = _('Consolidated award generated. Download is ready from DB cache.')
         if var == 'rr':
@@ -177,11 +202,64 @@ class Section23Award(models.Model):
 
     def action_generate_consolidated_award(self):
         self.ensure_one()
-        return self._generate_variant_without_download(variant='consolidated')
+        return self._enqueue_variant_generation(variant='consolidated')
 
     def action_generate_rr_award(self):
         self.ensure_one()
-        return self._generate_variant_without_download(variant='rr')
+        return self._enqueue_variant_generation(variant='rr')
+
+    def _enqueue_scope_generation(self, export_scope='all', label=None, allow_regenerate=False):
+        """Validate now, then hand the scope generation to the award job queue."""
+        self.ensure_one()
+        self._validate_for_generate(
+            require_sales_sort_rate=True,
+            allow_when_fully_generated=bool(allow_regenerate),
+        )
+        job, created = self.env['bhu.section23.award.job']._enqueue(
+            self,
+            job_type='scope',
+            export_scope=export_scope or 'all',
+            label=label or False,
+            allow_regenerate=bool(allow_regenerate),
+        )
+        return self._s23_job_queued_notification(job, created)
+
+    def _enqueue_variant_generation(self, variant='consolidated'):
+        """Validate now, then hand the Consolidated/R&R cache build to the job queue."""
+        self.ensure_one()
+        self._ensure_all_components_generated()
+        job, created = self.env['bhu.section23.award.job']._enqueue(
+            self,
+            job_type='variant',
+            variant=variant,
+        )
+        return self._s23_job_queued_notification(job, created)
+
+    def _s23_job_queued_notification(self, job, created):
+        self.ensure_one()
+        if created:
+            self._s23_set_loader_progress(
+                done=0,
+                total=0,
+                label=_('Queued for generation...'),
+                active=True,
+                flush=True,
+            )
+            message = _('Award generation has been queued and will continue in the background. '
+                        '/ अवार्ड जेनरेशन कतार में है और पृष्ठभूमि में जारी रहेगा।')
+        else:
+            message = _('A generation job for this award is already queued or running. Please wait for it to finish. '
+                        '/ इस अवार्ड का जेनरेशन पहले से चल रहा है।')
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Queued'),
+                'message': message,
+                'type': 'info',
+                'sticky': False,
+            },
+        }
 
     def action_download_land_award(self):
         self.ensure_one()
@@ -438,7 +516,7 @@ class Section23Award(models.Model):
     def action_generate_award(self):
         """Generate all section scopes without download prompt."""
         self.ensure_one()
-        return self._generate_scope_without_download(
+        return self._enqueue_scope_generation(
             export_scope='all',
             label=_('All sections generated. Full Standard/Consolidated/R&R downloads are now enabled.'),
         )
@@ -701,8 +779,10 @@ class Section23Award(models.Model):
                     sum(_safe_amount(r.get('total', 0.0)) for r in asset_rows),
                 )
 
-        if line_vals:
-            self.write({'award_line_item_ids': line_vals})
+        self.write({
+            'award_line_item_ids': line_vals,
+            'award_line_items_scope': scope,
+        })
         self._s23_set_loader_progress(
             done=total_rows,
             total=total_units,
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""Queued Section 23 award generation.
+
+Generate / regenerate buttons no longer build the award inside the HTTP
+request. They enqueue a ``bhu.section23.award.job`` and the browser keeps
+following the loader progress while a cron worker runs the job:
+
+- The pool is bounded by the ``Section 23 Award Jobs`` cron records (one job
+  at a time per record), which in turn run on the server's cron threads
+  (``max_cron_threads``). Jobs of different awards run in parallel.
+- Only one pending/running job may exist per award (partial unique index), so
+  two users cannot generate the same award concurrently.
+- Unexpected errors are retried with a back-off up to ``max_attempts``;
+  validation errors fail the job straight away.
+- The worker running a job holds a session advisory lock on its id from the
+  claim until it is done. A ``running`` job whose lock is free was left by a
+  killed worker (its connection, and so the lock, is gone) and is requeued;
+  long generations are never picked up twice.
+"""
+import logging
+from datetime import timedelta
+
+from psycopg2 import IntegrityError
+
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError, ValidationError
+from odoo.tools import mute_logger
+
+_logger = logging.getLogger(__name__)
+
+JOB_RETRY_DELAY_SECONDS = 60
+# First key of the (namespace, job id) advisory locks held by running jobs.
+JOB_LOCK_NAMESPACE = 2323
+JOB_CRON_XMLIDS = (
+    'bhuarjan.ir_cron_section23_award_job_worker_1',
+    'bhuarjan.ir_cron_section23_award_job_worker_2',
+)
+
+
+class Section23AwardJob(models.Model):
+    _name = 'bhu.section23.award.job'
+    _description = 'Section 23 Award Generation Job'
+    _order = 'id desc'
+
+    award_id = fields.Many2one('bhu.section23.award', string='Award', required=True,
+                               index=True, ondelete='cascade')
+    user_id = fields.Many2one('res.users', string='Requested By', required=True,
+                              default=lambda self: self.env.user)
+    company_id = fields.Many2one('res.company', string='Company',
+                                 default=lambda self: self.env.company)
+    job_type = fields.Selection([
+        ('scope', 'Section Scope'),
+        ('variant', 'Consolidated / R&R'),
+    ], string='Job Type', required=True, default='scope')
+    export_scope = fields.Char(string='Scope', default='all')
+    variant = fields.Char(string='Variant')
+    allow_regenerate = fields.Boolean(string='Regenerate')
+    label = fields.Char(string='Completion Message')
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Status', required=True, default='pending', index=True)
+    attempts = fields.Integer(string='Attempts', default=0)
+    max_attempts = fields.Integer(string='Max Attempts', default=3)
+    next_attempt_at = fields.Datetime(string='Next Attempt')
+    started_at = fields.Datetime(string='Started At')
+    finished_at = fields.Datetime(string='Finished At')
+    result_message = fields.Text(string='Result')
+    error = fields.Text(string='Error')
+
+    def init(self):
+        # One active job per award: this is the per-award lock.
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS bhu_section23_award_job_active_award_uniq
+            ON bhu_section23_award_job (award_id)
+            WHERE state IN ('pending', 'running')
+        """)
+
+    # ------------------------------------------------------------------
+    # Enqueue
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _enqueue(self, award, **vals):
+        """Create a pending job for ``award`` (or return the active one) and wake the workers."""
+        award.ensure_one()
+        active = self.search([
+            ('award_id', '=', award.id),
+            ('state', 'in', ('pending', 'running')),
+        ], limit=1)
+        if active:
+            return active, False
+        try:
+            with mute_logger('odoo.sql_db'), self.env.cr.savepoint():
+                job = self.create(dict(vals, award_id=award.id))
+        except IntegrityError:
+            # Another request enqueued the same award in the meantime.
+            return self.search([
+                ('award_id', '=', award.id),
+                ('state', 'in', ('pending', 'running')),
+            ], limit=1), False
+        self._trigger_workers()
+        return job, True
+
+    @api.model
+    def _trigger_workers(self):
+        for xmlid in JOB_CRON_XMLIDS:
+            cron = self.env.ref(xmlid, raise_if_not_found=False)
+            if cron and cron.active:
+                cron.sudo()._trigger()
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _cron_run_award_jobs(self, limit=20):
+        """Run pending jobs one at a time, committing after each."""
+        self._requeue_stale_jobs()
+        for _i in range(limit):
+            job = self._claim_next_job()
+            if not job:
+                break
+            job._run()
+
+    @api.model
+    def _requeue_stale_jobs(self):
+        """Jobs left ``running`` by a killed worker go back to the queue."""
+        self.env.cr.execute("SELECT id FROM bhu_section23_award_job WHERE state = 'running'")
+        stale_ids = []
+        for (job_id,) in self.env.cr.fetchall():
+            # Free only when no live worker holds it; released again at commit.
+            self.env.cr.execute("SELECT pg_try_advisory_xact_lock(%s, %s)", (JOB_LOCK_NAMESPACE, job_id))
+            if self.env.cr.fetchone()[0]:
+                stale_ids.append(job_id)
+        if stale_ids:
+            self.env.cr.execute("""
+                UPDATE bhu_section23_award_job
+                   SET state = 'pending', started_at = NULL
+                 WHERE id = ANY(%s) AND state = 'running'
+            """, (stale_ids,))
+            _logger.warning("[S23 JOB] requeued %s stale job(s)", self.env.cr.rowcount)
+        self.env.cr.commit()
+
+    @api.model
+    def _claim_next_job(self):
+        """Lock the oldest due pending job and mark it running (committed).
+
+        The job's advisory lock is taken before the commit and stays with this
+        worker's connection until ``_run`` releases it.
+        """
+        self.env.cr.execute("""
+            SELECT id
+              FROM bhu_section23_award_job
+             WHERE state = 'pending'
+               AND (next_attempt_at IS NULL
+                    OR next_attempt_at <= (now() at time zone 'UTC'))
+             ORDER BY id
+             LIMIT 1
+             FOR UPDATE SKIP LOCKED
+        """)
+        row = self.env.cr.fetchone()
+        if not row:
+            return self.browse()
+        self.env.cr.execute("SELECT pg_try_advisory_lock(%s, %s)", (JOB_LOCK_NAMESPACE, row[0]))
+        if not self.env.cr.fetchone()[0]:
+            # Its previous worker is still finishing up; picked up on a later run.
+            self.env.cr.rollback()
+            return self.browse()
+        job = self.browse(row[0])
+        job.write({
+            'state': 'running',
+            'attempts': job.attempts + 1,
+            'started_at': fields.Datetime.now(),
+            'error': False,
+        })
+        self.env.cr.commit()
+        return job
+
+    def _run(self):
+        self.ensure_one()
+        try:
+            self._run_locked()
+        finally:
+            self.env.cr.execute("SELECT pg_advisory_unlock(%s, %s)", (JOB_LOCK_NAMESPACE, self.id))
+
+    def _run_locked(self):
+        award = self.award_id.with_user(self.user_id).with_company(
+            self.company_id or self.user_id.company_id
+        ).with_context(s23_job_id=self.id, lang=self.user_id.lang)
+        _logger.info("[S23 JOB] start job=%s award=%s type=%s scope=%s variant=%s attempt=%s",
+                     self.id, award.id, self.job_type, self.export_scope, self.variant, self.attempts)
+        try:
+            if self.job_type == 'variant':
+                result = award._generate_variant_without_download(variant=self.variant)
+            else:
+                result = award._generate_scope_without_download(
+                    export_scope=self.export_scope or 'all',
+                    label=self.label or None,
+                    allow_regenerate=self.allow_regenerate,
+                )
+            message = ((result or {}).get('params') or {}).get('message') or ''
+            self.write({
+                'state': 'done',
+                'finished_at': fields.Datetime.now(),
+                'result_message': message,
+            })
+            self.env.cr.commit()
+        except Exception as e:
+            self.env.cr.rollback()
+            self._handle_failure(e)
+            self.env.cr.commit()
+            return
+        self._finish_progress(award, message or _('Completed'))
+
+    def _handle_failure(self, error):
+        self.ensure_one()
+        is_user_error = isinstance(error, (UserError, ValidationError))
+        text = str(error.args[0]) if is_user_error and error.args else str(error)
+        if not is_user_error and self.attempts < self.max_attempts:
+            _logger.warning("[S23 JOB] job=%s award=%s attempt %s failed, retrying: %s",
+                            self.id, self.award_id.id, self.attempts, error)
+            delay = JOB_RETRY_DELAY_SECONDS * self.attempts
+            self.write({
+                'state': 'pending',
+                'started_at': False,
+                'error': text,
+                'next_attempt_at': fields.Datetime.now() + timedelta(seconds=delay),
+            })
+            award = self.award_id.with_user(self.user_id)
+            award._s23_set_loader_progress(
+                label=_('Generation failed, retrying shortly... (%s/%s)') % (self.attempts, self.max_attempts),
+                active=True,
+                flush=True,
+            )
+            return
+        _logger.exception("[S23 JOB] job=%s award=%s failed", self.id, self.award_id.id,
+                          exc_info=error)
+        self.write({
+            'state': 'failed',
+            'finished_at': fields.Datetime.now(),
+            'error': text,
+        })
+        award = self.award_id.with_user(self.user_id)
+        award.sudo().message_post(body=_(
+            "Award generation failed. / अवार्ड जेनरेशन विफल हुआ।\n%s"
+        ) % text)
+        self._finish_progress(award, _('Failed: %s') % text, error=text)
+
+    @api.model
+    def _finish_progress(self, award, label, error=None):
+        """Close the loader once the job's transaction is committed."""
+        current = award.get_loader_progress_current() or {}
+        total = int(current.get('total') or 0)
+        award.with_context(s23_job_id=False)._s23_set_loader_progress(
+            done=total if not error else None,
+            total=total,
+            label=label,
+            active=False,
+            flush=True,
+        )
@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 
-import json
 import logging
 
 from odoo import api, models, _
 from odoo.exceptions import ValidationError
 
+from .award_progress_bus import publish_award_progress
+from .award_progress_store import get_progress_store
+
 _logger = logging.getLogger(__name__)
 
 
@@ -40,20 +42,20 @@ class Section23Award(models.Model):
 
     def _s23_set_loader_progress(self, done=None, total=None, label=None, active=None, flush=False):
         self.ensure_one()
-        key = 'bhuarjan.s23.loader.progress.%s' % self.id
-        user_key = 'bhuarjan.s23.loader.progress.user.%s' % self.env.uid
+        store = get_progress_store()
+        key = 'award.%s' % self.id
+        user_key = 'user.%s' % self.env.uid
         vtype_raw = (self.village_type or (self.village_id.village_type if self.village_id else '') or '').lower()
         village_type_label = 'Urban / नगरीय' if vtype_raw == 'urban' else 'Rural / ग्रामीण'
         urban_body_label = self.get_urban_body_label() or '-'
+        if active is False and self.env.context.get('s23_job_id'):
+            # Queued job: the worker closes the loader only after its commit.
+            active = True
         current = {}
-        raw = self.env['ir.config_parameter'].sudo().get_param(key, default='') or ''
-        if raw:
-            try:
-                current = json.loads(raw) if isinstance(raw, str) else {}
-                if not isinstance(current, dict):
-                    current = {}
-            except Exception:
-                current = {}
+        try:
+            current = store.get(self.env, key)
+        except Exception:
+            current = {}
         done_val = max(0, int(done if done is not None else current.get('done') or 0))
         total_val = max(0, int(total if total is not None else current.get('total') or 0))
         pct_val = (100.0 * done_val / total_val) if total_val > 0 else float(current.get('pct') or 0.0)
@@ -69,20 +71,13 @@ class Section23Award(models.Model):
             'urban_body': urban_body_label,
         }
         try:
-            if flush:
-                # Write progress in an isolated transaction to avoid concurrent
-                # updates on the same award row.
-                from odoo.modules.registry import Registry
-                with Registry(self.env.cr.dbname).cursor() as cr2:
-                    env2 = api.Environment(cr2, self.env.uid, dict(self.env.context))
-                    env2['ir.config_parameter'].sudo().set_param(key, json.dumps(payload))
-                    env2['ir.config_parameter'].sudo().set_param(user_key, json.dumps(payload))
-                    cr2.commit()
-            else:
-                self.env['ir.config_parameter'].sudo().set_param(key, json.dumps(payload))
-                self.env['ir.config_parameter'].sudo().set_param(user_key, json.dumps(payload))
+            store.set(self.env, {key: payload, user_key: payload}, flush=flush)
         except Exception:
             _logger.exception("Failed loader progress write for award %s", self.id)
+        try:
+            publish_award_progress(self.env, self.id, payload, flush=flush)
+        except Exception:
+            _logger.exception("Failed loader progress push for award %s", self.id)
 
     @api.model
     def get_loader_progress(self, award_id):
@@ -94,20 +89,17 @@ class Section23Award(models.Model):
         if not rec.exists():
             return {}
         try:
-            key = 'bhuarjan.s23.loader.progress.%s' % rec.id
-            raw = self.env['ir.config_parameter'].sudo().get_param(key, default='') or ''
-            if raw:
-                try:
-                    payload = json.loads(raw)
-                    if isinstance(payload, dict):
-                        payload.setdefault('project', rec.project_id.name if rec.project_id else '')
-                        payload.setdefault('village', rec.village_id.name if rec.village_id else '')
-                        vtype_raw = (rec.village_type or (rec.village_id.village_type if rec.village_id else '') or '').lower()
-                        payload.setdefault('village_type', 'Urban / नगरीय' if vtype_raw == 'urban' else 'Rural / ग्रामीण')
-                        payload.setdefault('urban_body', rec.get_urban_body_label() or '-')
-                        return payload
-                except Exception:
-                    pass
+            payload = get_progress_store().get(self.env, 'award.%s' % rec.id)
+            if payload and all(k in payload for k in ('project', 'village', 'village_type', 'urban_body')):
+                # Ticks carry the header labels; don't re-read the award on every poll.
+                return payload
+            if payload:
+                payload.setdefault('project', rec.project_id.name if rec.project_id else '')
+                payload.setdefault('village', rec.village_id.name if rec.village_id else '')
+                vtype_raw = (rec.village_type or (rec.village_id.village_type if rec.village_id else '') or '').lower()
+                payload.setdefault('village_type', 'Urban / नगरीय' if vtype_raw == 'urban' else 'Rural / ग्रामीण')
+                payload.setdefault('urban_body', rec.get_urban_body_label() or '-')
+                return payload
             vtype_raw = (rec.village_type or (rec.village_id.village_type if rec.village_id else '') or '').lower()
             return {
                 'active': False,
@@ -126,15 +118,12 @@ class Section23Award(models.Model):
 
     @api.model
     def get_loader_progress_current(self):
-        key = 'bhuarjan.s23.loader.progress.user.%s' % self.env.uid
-        raw = self.env['ir.config_parameter'].sudo().get_param(key, default='') or ''
-        if raw:
-            try:
-                payload = json.loads(raw)
-                if isinstance(payload, dict):
-                    return payload
-            except Exception:
-                pass
+        try:
+            payload = get_progress_store().get(self.env, 'user.%s' % self.env.uid)
+        except Exception:
+            payload = {}
+        if payload:
+            return payload
         return {
             'active': False,
             'done': 0,
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""Per-generation snapshot of the Section 23 compensation rows.
+
+A generation asks for the same land/tree/structure rows many times: the line
+item refresh, the QWeb templates, the Excel exporters, the payment file and
+the village summary. ``get_*_compensation_data`` and ``get_*_grouped_data``
+read them from one ``Section23ComputationSnapshot`` instead, which computes
+each result once. Snapshots live in ``cr.precommit.data``, keyed by award,
+user and language. That dict is cleared by every ``cr.flush()``, so also by
+each savepoint and by commit and rollback; a snapshot never outlives the next
+one and is then rebuilt on first use.
+
+Outside a generation a snapshot is only reused while the input fingerprint of
+the document cache (``_s23_cache_fingerprint``) is unchanged; editing a
+survey, award line, rate or the award header in the same transaction rebuilds
+it. That check digests the input tables on every call, so the generation
+flows fingerprint once and pin it with ``_s23_open_computation_snapshot``:
+the returned record carries the fingerprint in its context and its getters
+skip the digest.
+"""
+from odoo import models
+
+from .award_document_cache import S23_SCOPE_COMPONENTS
+
+S23_SNAPSHOT_KEY = 'bhu_s23_computation_snapshot'
+# Context key pinning the snapshot fingerprint for one generation.
+S23_SNAPSHOT_FINGERPRINT = 's23_snapshot_fingerprint'
+
+
+class Section23ComputationSnapshot:
+    """Compensation rows and groups of one award, computed on first use."""
+
+    def __init__(self, award, fingerprint):
+        self.award = award
+        self.fingerprint = fingerprint
+        self._results = {}
+
+    def _result(self, name, compute):
+        if name not in self._results:
+            self._results[name] = compute()
+        return self._results[name]
+
+    @property
+    def land_rows(self):
+        return self._result('land_rows', self.award._s23_compute_land_compensation_data)
+
+    @property
+    def tree_rows(self):
+        return self._result('tree_rows', self.award._s23_compute_tree_compensation_data)
+
+    @property
+    def structure_rows(self):
+        return self._result('structure_rows', self.award._s23_compute_structure_compensation_data)
+
+    @property
+    def land_groups(self):
+        return self._result('land_groups', lambda: self.award._s23_group_land_compensation_data(self.land_rows))
+
+    @property
+    def tree_groups(self):
+        return self._result('tree_groups', lambda: self.award._s23_group_tree_compensation_data(self.tree_rows))
+
+    @property
+    def structure_groups(self):
+        return self._result(
+            'structure_groups',
+            lambda: self.award._s23_group_structure_compensation_data(self.structure_rows),
+        )
+
+
+class Section23AwardSnapshot(models.Model):
+    _inherit = 'bhu.section23.award'
+
+    def _s23_open_computation_snapshot(self, digests=None):
+        """This award with its snapshot pinned to the current inputs.
+
+        For one generation, which must not change the inputs afterwards.
+        ``digests``: ``_s23_cache_input_digests`` of every component, when
+        the caller already has them.
+        """
+        self.ensure_one()
+        if digests is None:
+            digests = self._s23_cache_input_digests(S23_SCOPE_COMPONENTS['all'])
+        fingerprint = self._s23_cache_fingerprint(export_scope='all', variant='standard', digests=digests)
+        return self.with_context(**{S23_SNAPSHOT_FINGERPRINT: fingerprint})
+
+    def _s23_computation_snapshot(self):
+        """Snapshot of this award's compensation rows for the current inputs."""
+        self.ensure_one()
+        if not isinstance(self.id, int):
+            # Unsaved form records (onchange previews): nothing to fingerprint.
+            return Section23ComputationSnapshot(self, None)
+        fingerprint = (self.env.context.get(S23_SNAPSHOT_FINGERPRINT)
+                       or self._s23_cache_fingerprint(export_scope='all', variant='standard'))
+        snapshots = self.env.cr.precommit.data.setdefault(S23_SNAPSHOT_KEY, {})
+        key = (self.id, self.env.uid, self.env.lang)
+        snapshot = snapshots.get(key)
+        if snapshot is None or snapshot.fingerprint != fingerprint:
+            snapshot = snapshots[key] = Section23ComputationSnapshot(self, fingerprint)
+        return snapshot
+
+    def get_land_compensation_data(self):
+        """Land rows grouped by landowner and khasra (per-generation snapshot)."""
+        return self._s23_computation_snapshot().land_rows
+
+    def get_tree_compensation_data(self):
+        """Tree rows grouped by landowner, khasra and tree (per-generation snapshot)."""
+        return self._s23_computation_snapshot().tree_rows
+
+    def get_structure_compensation_data(self):
+        """Structure rows per award structure entry (per-generation snapshot)."""
+        return self._s23_computation_snapshot().structure_rows
+
+    def get_land_compensation_grouped_data(self):
+        return self._s23_computation_snapshot().land_groups
+
+    def get_tree_compensation_grouped_data(self):
+        return self._s23_computation_snapshot().tree_groups
+
+    def get_structure_compensation_grouped_data(self):
+        return self._s23_computation_snapshot().structure_groups
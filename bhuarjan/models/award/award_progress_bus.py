@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Push Section 23 loader progress over the bus.
+
+Every progress tick is sent on ``bhu_award_progress_<award id>``; the loader
+(``static/src/js/award_action_loader.js``) subscribes to the award it shows
+instead of polling ``get_loader_progress``. Flushed ticks are sent from an
+isolated cursor, like the progress store, so they reach the browser while the
+generating transaction is still running.
+"""
+from odoo import SUPERUSER_ID, api, models
+
+AWARD_PROGRESS_CHANNEL_PREFIX = 'bhu_award_progress_'
+AWARD_PROGRESS_NOTIFICATION = 'bhu_award_progress'
+
+
+def publish_award_progress(env, award_id, payload, flush=False):
+    channel = '%s%s' % (AWARD_PROGRESS_CHANNEL_PREFIX, award_id)
+    message = dict(payload, award_id=award_id)
+    if not flush:
+        env['bus.bus'].sudo()._sendone(channel, AWARD_PROGRESS_NOTIFICATION, message)
+        return
+    from odoo.modules.registry import Registry
+    with Registry(env.cr.dbname).cursor() as cr2:
+        api.Environment(cr2, SUPERUSER_ID, {})['bus.bus']._sendone(
+            channel, AWARD_PROGRESS_NOTIFICATION, message
+        )
+
+
+class IrWebsocket(models.AbstractModel):
+    _inherit = 'ir.websocket'
+
+    def _build_bus_channel_list(self, channels):
+        """Only let users subscribe to progress of awards they can read."""
+        kept, award_ids = [], []
+        for channel in channels:
+            if isinstance(channel, str) and channel.startswith(AWARD_PROGRESS_CHANNEL_PREFIX):
+                suffix = channel[len(AWARD_PROGRESS_CHANNEL_PREFIX):]
+                if suffix.isdigit():
+                    award_ids.append(int(suffix))
+            else:
+                kept.append(channel)
+        if award_ids and self.env.uid:
+            awards = self.env['bhu.section23.award'].browse(award_ids).exists()
+            kept.extend(
+                '%s%s' % (AWARD_PROGRESS_CHANNEL_PREFIX, award.id)
+                for award in awards._filtered_access('read')
+            )
+        return super()._build_bus_channel_list(kept)
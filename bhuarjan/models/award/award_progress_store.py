@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""Progress channel for long-running Section 23 award jobs.
+
+Progress ticks used to live in ``ir.config_parameter``; every ``set_param``
+clears the ormcache of all workers. The stores below never touch it:
+
+- ``memory``: per-process dict. Only for single-process servers (``workers = 0``),
+  because the poll may land on a different worker than the generation.
+- ``table`` (default): one row per key in ``bhu_section23_award_progress``,
+  upserted with plain SQL so no ORM cache is invalidated.
+
+Pick the backend with ``bhuarjan_award_progress_store = memory|table`` in the
+Odoo server configuration file.
+"""
+import json
+import logging
+import threading
+
+from odoo import fields, models
+from odoo.tools import config
+
+_logger = logging.getLogger(__name__)
+
+
+class Section23AwardProgress(models.Model):
+    """Backing table of the shared progress store (written with raw SQL)."""
+    _name = 'bhu.section23.award.progress'
+    _description = 'Section 23 Award Generation Progress'
+    _log_access = False
+
+    key = fields.Char(string='Key', required=True, index=True)
+    payload = fields.Text(string='Payload')
+    updated_at = fields.Datetime(string='Updated At')
+
+    _sql_constraints = [
+        ('key_uniq', 'unique(key)', 'Progress key must be unique.'),
+    ]
+
+
+class InProcessProgressStore:
+    """Progress kept in this worker's memory."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, env, key):
+        with self._lock:
+            payload = self._data.get((env.cr.dbname, key))
+        return dict(payload) if payload else {}
+
+    def set(self, env, payloads, flush=False):
+        with self._lock:
+            for key, payload in payloads.items():
+                self._data[(env.cr.dbname, key)] = dict(payload)
+
+
+class TableProgressStore:
+    """Progress shared by all workers through ``bhu_section23_award_progress``."""
+
+    _UPSERT = """
+        INSERT INTO bhu_section23_award_progress (key, payload, updated_at)
+        VALUES (%s, %s, now() at time zone 'UTC')
+        ON CONFLICT (key) DO UPDATE
+            SET payload = EXCLUDED.payload, updated_at = EXCLUDED.updated_at
+    """
+
+    def get(self, env, key):
+        env.cr.execute(
+            "SELECT payload FROM bhu_section23_award_progress WHERE key = %s", (key,)
+        )
+        row = env.cr.fetchone()
+        if not row or not row[0]:
+            return {}
+        try:
+            payload = json.loads(row[0])
+        except ValueError:
+            return {}
+        return payload if isinstance(payload, dict) else {}
+
+    def set(self, env, payloads, flush=False):
+        params = [(key, json.dumps(payload)) for key, payload in payloads.items()]
+        if not flush:
+            for param in params:
+                env.cr.execute(self._UPSERT, param)
+            return
+        # Commit in an isolated transaction so pollers see the tick while the
+        # generating request is still running.
+        from odoo.modules.registry import Registry
+        with Registry(env.cr.dbname).cursor() as cr2:
+            for param in params:
+                cr2.execute(self._UPSERT, param)
+            cr2.commit()
+
+
+_STORES = {
+    'memory': InProcessProgressStore(),
+    'table': TableProgressStore(),
+}
+
+
+def get_progress_store():
+    """Return the configured progress store (``table`` when unset/unknown)."""
+    name = (config.get('bhuarjan_award_progress_store') or 'table').strip().lower()
+    store = _STORES.get(name)
+    if store is None:
+        _logger.warning("Unknown bhuarjan_award_progress_store %r, using 'table'", name)
+        store = _STORES['table']
+    return store
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Compact rows for the Section 23 land, tree and structure compensation data.
+
+A village award can carry tens of thousands of compensation rows. Instead of
+one dict per row (a hash table of 30-40 keys each) rows are ``__slots__``
+records with a fixed column set per kind, and they hold the landowner id
+rather than the ``bhu.landowner`` record. Rows keep the mapping interface the
+reports, Excel exporters and payment file read them through (``row['x']``,
+``row.get('x')``, ``row['x'] = v``, ``update``, ``copy``); a column a row
+never set behaves like a missing dict key. Group totals are summed column by
+column with ``column_totals``.
+"""
+from operator import attrgetter
+
+
+class CompensationRow:
+    """Mapping-like row with one slot per column (see subclasses)."""
+
+    __slots__ = ()
+    _columns = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._columns = frozenset(cls.__slots__)
+
+    def __init__(self, **values):
+        self.update(values)
+
+    def __getitem__(self, key):
+        if key in self._columns:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self._columns:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self._columns and hasattr(self, key)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, ', '.join('%s=%r' % item for item in self.items()))
+
+    def get(self, key, default=None):
+        if key in self._columns:
+            return getattr(self, key, default)
+        return default
+
+    def keys(self):
+        return [name for name in self.__slots__ if hasattr(self, name)]
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self.keys()]
+
+    def update(self, values=(), **kwargs):
+        for key, value in dict(values, **kwargs).items():
+            self[key] = value
+
+    def copy(self):
+        row = type(self).__new__(type(self))
+        for name, value in self.items():
+            setattr(row, name, value)
+        return row
+
+
+class LandCompensationRow(CompensationRow):
+    __slots__ = (
+        'landowner_id', 'landowner_name', 'father_name', 'spouse_name', 'address',
+        'khasra', 'lagan', 'survey_id', 'village_name', 'original_area', 'acquired_area',
+        'fallow', 'unirrigated', 'irrigated', 'is_diverted', 'is_within_distance',
+        'distance_from_main_road', 'road_type_label', 'irrigation_label', 'diverted_label',
+        'base_rate_hectare', 'effective_rate_hectare', 'guide_line_rate', 'guide_line_rate_unit',
+        'is_urban_slab', 'slab_label', 'slab_pct',
+        'basic_value', 'market_value', 'solatium', 'interest', 'total_compensation',
+        'rehab_policy_per_acre_1', 'rehab_policy_per_acre_2', 'rehab_policy_rate_per_acre',
+        'rehab_policy_amount', 'dev_compensation', 'paid_compensation', 'remark',
+        # Set by the owner grouping for the report rowspans.
+        'khasra_merge_show', 'khasra_merge_rowspan', 'rehab_policy_amount_display',
+    )
+
+
+class TreeCompensationRow(CompensationRow):
+    __slots__ = (
+        'landowner_id', 'landowner_name', 'father_name', 'spouse_name',
+        'khasra', 'total_khasra', 'total_area', 'land_khasra', 'land_area_ha', 'tree_khasra',
+        'tree_type', 'tree_type_code', 'tree_count', 'girth_cm', 'development_stage', 'condition',
+        'unit_rate', 'rate', 'value', 'mulya', 'kul_rashi', 'determined_value',
+        'solatium', 'interest', 'total', 'remark',
+    )
+
+
+class StructureCompensationRow(CompensationRow):
+    __slots__ = (
+        'landowner_name', 'father_name', 'spouse_name', 'address',
+        'total_khasra', 'total_area', 'asset_khasra', 'asset_land_area',
+        'asset_type', 'structure_type', 'construction_type', 'asset_code',
+        'asset_dimension', 'rate_per_sqm', 'market_value', 'solatium', 'interest', 'total',
+        'remark',
+    )
+
+
+def column_totals(rows, names):
+    """Sum each column of ``names`` over ``rows``; empty cells count as 0.
+
+    Every row must have the columns set (the compute methods set all amount
+    columns on every row).
+    """
+    return {
+        name: sum(filter(None, map(attrgetter(name), rows)), 0.0)
+        for name in names
+    }
@@ -2,6 +2,8 @@
 from odoo import models, _
 from odoo.exceptions import ValidationError
 
+from ..xlsx_export import XlsxExport
+
 
 class Section23AwardRR(models.Model):
     _inherit = 'bhu.section23.award'
@@ -101,10 +103,8 @@ class Section23AwardRR(models.Model):
         """Download R&R award sheet as Excel."""
         self.ensure_one()
         self._s23_recompute_award_survey_lines_for_export()
-        import io
-        import base64
         try:
-            import xlsxwriter
+            import xlsxwriter  # noqa: F401
         except ImportError:
             raise ValidationError(_("Python library 'xlsxwriter' is not installed."))
 
@@ -113,8 +113,7 @@ class Section23AwardRR(models.Model):
             raise ValidationError(_('No R&R data available for this award.'))
 
         headers = self.get_award_header_constants()['excel']['rr_award_headers']
-        output = io.BytesIO()
-        wb = xlsxwriter.Workbook(output, {'in_memory': True})
+        wb = XlsxExport()
         ws = wb.add_worksheet('R&R Award')
         font = 'Noto Sans Devanagari'
 
@@ -215,17 +214,12 @@ class Section23AwardRR(models.Model):
         for i, w in enumerate(widths):
             ws.set_column(i, i, w)
 
-        wb.close()
-        output.seek(0)
-        file_data = base64.b64encode(output.read())
-        output.close()
-        attachment = self.env['ir.attachment'].create({
-            'name': f"RRAwardSheet_{self.village_id.name or 'Award'}.xlsx",
-            'type': 'binary',
-            'datas': file_data,
-            'res_model': 'bhu.section23.award',
-            'res_id': self.id,
-        })
+        attachment = wb.save_attachment(
+            self.env,
+            f"RRAwardSheet_{self.village_id.name or 'Award'}.xlsx",
+            'bhu.section23.award',
+            self.id,
+        )
         return {
             'type': 'ir.actions.act_url',
             'url': f'/web/content/{attachment.id}?download=true',
@@ -161,11 +161,19 @@ class Section23Award(models.Model):
             return fields.Datetime.to_datetime(self.create_date).date()
         return fields.Date.context_today(self)
 
-    def _calculate_interest_on_basic(self, basic_value):
-        """Calculate interest at 1% per month (or part thereof)."""
+    def _s23_interest_period(self):
+        """Return ``(start_date, end_date)`` for interest: Section 4 hearing to award date."""
         self.ensure_one()
-        start_date = self._get_section4_public_hearing_date()
-        end_date = self._get_award_calculation_date()
+        return self._get_section4_public_hearing_date(), self._get_award_calculation_date()
+
+    def _calculate_interest_on_basic(self, basic_value, period=None):
+        """Calculate interest at 1% per month (or part thereof).
+
+        ``period`` may carry a precomputed ``_s23_interest_period()`` so batch
+        callers do not re-read Section 4 for every row.
+        """
+        self.ensure_one()
+        start_date, end_date = period if period is not None else self._s23_interest_period()
         if not start_date or not end_date or not basic_value:
             return 0.0, 0
         if end_date < start_date:
@@ -232,15 +240,18 @@ class Section23Award(models.Model):
             return f"{start_date.strftime('%d/%m/%Y')} से {end_date.strftime('%d/%m/%Y')} तक"
         return "धारा 4 सार्वजनिक सुनवाई दिनांक से अवार्ड दिनांक तक"
 
-    def _s23_land_base_rate_per_hectare(self, survey, award_line, derived_within):
-        """MR/BMR rate from award values; fallback to active land rate master."""
+    def _s23_land_base_rate_per_hectare(self, survey, award_line, derived_within, rate_master=None):
+        """MR/BMR rate from award values; fallback to active land rate master.
+
+        ``rate_master`` lets batch callers pass the already-resolved master.
+        """
         self.ensure_one()
         if not self.village_id or not survey:
             return 0.0
         mr_rate = float(self.rate_master_main_road_ha or 0.0)
         bmr_rate = float(self.rate_master_other_road_ha or 0.0)
         if mr_rate <= 0.0 or bmr_rate <= 0.0:
-            rm = self._get_active_rate_master_for_village()
+            rm = rate_master if rate_master is not None else self._get_active_rate_master_for_village()
             if rm:
                 if mr_rate <= 0.0:
                     mr_rate = float(rm.main_road_rate_hectare or 0.0)
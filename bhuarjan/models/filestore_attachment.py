@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Attachments created from a file without loading it into memory.
+
+Used by the Excel exports (``xlsx_export``) and the QR microsite document
+cache. ``ir.attachment.create``/``write`` derive ``store_fname``,
+``checksum`` and ``file_size`` from ``raw``/``datas`` and drop them when they
+are passed in directly. The file is therefore hashed and copied into the
+filestore in chunks, the attachment is created without data, and those three
+columns are set on its row afterwards. Databases that keep attachments in the
+database read the file once instead.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+
+FILESTORE_COPY_CHUNK = 1024 * 1024
+
+
+def create_attachment_from_file(env, file, vals):
+    """``ir.attachment`` created from ``vals`` with the content of binary ``file``."""
+    Attachment = env['ir.attachment']
+    file.seek(0)
+    if Attachment._storage() != 'file':
+        return Attachment.create(dict(vals, raw=file.read()))
+
+    sha, size = hashlib.sha1(), 0
+    for chunk in iter(lambda: file.read(FILESTORE_COPY_CHUNK), b''):
+        sha.update(chunk)
+        size += len(chunk)
+    if not size:
+        return Attachment.create(dict(vals, raw=b''))
+    checksum = sha.hexdigest()
+    # Same layout as ``ir.attachment._get_path``, which wants the bytes for its
+    # collision check; an existing file with this sha1 already holds them.
+    fname = checksum[:2] + '/' + checksum
+    full_path = Attachment._full_path(fname)
+    if not os.path.isfile(full_path):
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        file.seek(0)
+        # Copy next to the target and rename, so readers never see a partial file.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(full_path))
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                shutil.copyfileobj(file, out, FILESTORE_COPY_CHUNK)
+            os.replace(tmp_path, full_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        # Collected again if the transaction rolls back.
+        Attachment._mark_for_gc(fname)
+
+    attachment = Attachment.create(vals)
+    env.cr.execute(
+        "UPDATE ir_attachment SET store_fname = %s, checksum = %s, file_size = %s WHERE id = %s",
+        (fname, checksum, size, attachment.id),
+    )
+    attachment.invalidate_recordset(['store_fname', 'checksum', 'file_size', 'raw', 'datas'])
+    return attachment
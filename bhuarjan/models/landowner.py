@@ -8,8 +8,9 @@ import re
 class BhuLandowner(models.Model):
     _name = 'bhu.landowner'
     _description = 'Landowner'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'bhu.sync.tracked.mixin']
     _order = 'name'
+    _sync_village_field = 'village_id'
     
     # Basic Information
     name = fields.Char(string='Full Name / पूरा नाम', required=True, tracking=True)
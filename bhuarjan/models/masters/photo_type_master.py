@@ -7,7 +7,7 @@ from odoo.exceptions import ValidationError
 class PhotoTypeMaster(models.Model):
     _name = 'bhu.photo.type'
     _description = 'Photo Type Master / फोटो प्रकार मास्टर'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'bhu.sync.tracked.mixin']
     _order = 'sequence, name'
 
     name = fields.Char(string='Photo Type Name / फोटो प्रकार का नाम', required=True, tracking=True,
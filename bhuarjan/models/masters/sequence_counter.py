@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+
+
+# Record tables whose numbering is allocated from ``bhuarjan.sequence.counter``.
+COUNTER_MODEL_BY_PROCESS = {
+    'survey': 'bhu.survey',
+}
+
+
+class BhuarjanSequenceCounter(models.Model):
+    """Next free number per (process, project, village, prefix).
+
+    Allocation locks the single counter row instead of scanning the numbered
+    records, so it stays O(1) however many surveys a village has. The counter
+    is seeded from the highest existing number (computed in SQL) the first
+    time a key is used, and re-seeded when the top number is deleted.
+    """
+    _name = 'bhuarjan.sequence.counter'
+    _description = 'Bhuarjan Sequence Counter'
+
+    process_name = fields.Char(string='Process Name', required=True)
+    project_id = fields.Many2one('bhu.project', string='Project', required=True, ondelete='cascade')
+    village_id = fields.Many2one('bhu.village', string='Village', ondelete='cascade')
+    prefix = fields.Char(string='Prefix', required=True)
+    next_number = fields.Integer(string='Next Number', required=True, default=1)
+
+    def init(self):
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS bhuarjan_sequence_counter_key_uniq
+            ON bhuarjan_sequence_counter (process_name, project_id, COALESCE(village_id, 0), prefix)
+        """)
+
+    @api.model
+    def _max_existing_number(self, model_name, prefix, project_id=None, village_id=None):
+        """Highest ``<prefix><digits>`` number among existing records, computed in SQL."""
+        table = self.env[model_name]._table
+        where = ["left(t.name, %(plen)s) = %(prefix)s",
+                 "substr(t.name, %(plen)s + 1) ~ '^[0-9]+$'"]
+        params = {'plen': len(prefix), 'prefix': prefix}
+        if project_id:
+            where.append("t.project_id = %(project_id)s")
+            params['project_id'] = project_id
+        if village_id:
+            where.append("t.village_id = %(village_id)s")
+            params['village_id'] = village_id
+        self.env.flush_all()
+        self.env.cr.execute("""
+            SELECT MAX(substr(t.name, %(plen)s + 1)::bigint)
+              FROM {table} t
+             WHERE {where}
+        """.format(table=table, where=' AND '.join(where)), params)
+        row = self.env.cr.fetchone()
+        return row[0] if row and row[0] is not None else None
+
+    @api.model
+    def _lock_counter(self, process_name, project_id, village_id, prefix, initial_seq=1):
+        """Return ``(id, next_number)`` of the counter row, locked for this transaction."""
+        select = """
+            SELECT id, next_number FROM bhuarjan_sequence_counter
+             WHERE process_name = %s AND project_id = %s
+               AND COALESCE(village_id, 0) = %s AND prefix = %s
+               FOR UPDATE
+        """
+        key = (process_name, project_id, village_id or 0, prefix)
+        self.env.cr.execute(select, key)
+        row = self.env.cr.fetchone()
+        if row:
+            return row
+        seed = initial_seq
+        model_name = COUNTER_MODEL_BY_PROCESS.get(process_name)
+        if model_name:
+            last = self._max_existing_number(model_name, prefix, project_id, village_id)
+            if last is not None:
+                seed = max(initial_seq, last + 1)
+        self.env.cr.execute("""
+            INSERT INTO bhuarjan_sequence_counter
+                (process_name, project_id, village_id, prefix, next_number,
+                 create_uid, create_date, write_uid, write_date)
+            VALUES (%s, %s, %s, %s, %s, %s, now() at time zone 'UTC', %s, now() at time zone 'UTC')
+            ON CONFLICT (process_name, project_id, COALESCE(village_id, 0), prefix) DO NOTHING
+        """, (process_name, project_id, village_id or None, prefix, seed, self.env.uid, self.env.uid))
+        self.env.cr.execute(select, key)
+        return self.env.cr.fetchone()
+
+    @api.model
+    def _next_number(self, process_name, project_id, village_id, prefix, initial_seq=1):
+        """Allocate and return the next number for the key."""
+        return self._next_numbers(process_name, project_id, village_id, prefix, 1, initial_seq)[0]
+
+    @api.model
+    def _next_numbers(self, process_name, project_id, village_id, prefix, count, initial_seq=1):
+        """Reserve ``count`` consecutive numbers for the key in one step."""
+        counter_id, number = self._lock_counter(process_name, project_id, village_id, prefix, initial_seq)
+        self.env.cr.execute(
+            "UPDATE bhuarjan_sequence_counter SET next_number = %s WHERE id = %s",
+            (number + count, counter_id),
+        )
+        return list(range(number, number + count))
+
+    @api.model
+    def _release_numbers(self, process_name, project_id, village_id, prefix, numbers, initial_seq=1):
+        """After deleting ``numbers``: if the top one was freed, rewind to the new max + 1."""
+        self.env.cr.execute("""
+            SELECT id, next_number FROM bhuarjan_sequence_counter
+             WHERE process_name = %s AND project_id = %s
+               AND COALESCE(village_id, 0) = %s AND prefix = %s
+               FOR UPDATE
+        """, (process_name, project_id, village_id or 0, prefix))
+        row = self.env.cr.fetchone()
+        if not row or (row[1] - 1) not in numbers:
+            return
+        last = self._max_existing_number(COUNTER_MODEL_BY_PROCESS[process_name], prefix, project_id, village_id)
+        next_number = max(initial_seq, last + 1) if last is not None else initial_seq
+        self.env.cr.execute(
+            "UPDATE bhuarjan_sequence_counter SET next_number = %s WHERE id = %s",
+            (next_number, row[0]),
+        )
+
+    @api.model
+    def _backfill(self, process_name, prefix_template):
+        """Seed/raise every counter of ``process_name`` from existing records in one SQL statement.
+
+        ``prefix_template`` is the sequence settings prefix; its placeholders are
+        substituted per project/village on the server.
+        """
+        model_name = COUNTER_MODEL_BY_PROCESS.get(process_name)
+        if not model_name or not prefix_template:
+            return 0
+        self.env.flush_all()
+        self.env.cr.execute("""
+            INSERT INTO bhuarjan_sequence_counter
+                (process_name, project_id, village_id, prefix, next_number,
+                 create_uid, create_date, write_uid, write_date)
+            SELECT %(process)s, t.project_id, t.village_id, k.prefix,
+                   MAX(substr(t.name, length(k.prefix) + 1)::bigint) + 1,
+                   %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM {table} t
+              JOIN bhu_project p ON p.id = t.project_id
+              JOIN bhu_village v ON v.id = t.village_id
+             CROSS JOIN LATERAL (
+                   SELECT replace(replace(replace(replace(%(tpl)s,
+                              %(ph_proj1)s, pc.code), %(ph_proj2)s, pc.code),
+                              %(ph_proj3)s, pc.code), %(ph_village)s, COALESCE(v.village_code, '')) AS prefix
+                     FROM (SELECT COALESCE(NULLIF(p.code, ''), NULLIF(p.name, ''), 'PROJ') AS code) pc
+             ) k
+             WHERE left(t.name, length(k.prefix)) = k.prefix
+               AND substr(t.name, length(k.prefix) + 1) ~ '^[0-9]+$'
+             GROUP BY t.project_id, t.village_id, k.prefix
+            ON CONFLICT (process_name, project_id, COALESCE(village_id, 0), prefix)
+            DO UPDATE SET next_number = GREATEST(bhuarjan_sequence_counter.next_number, EXCLUDED.next_number)
+        """.format(table=self.env[model_name]._table), {
+            'process': process_name,
+            'uid': self.env.uid,
+            'tpl': prefix_template,
+            'ph_proj1': '{%PROJ_CODE%}',
+            'ph_proj2': '{bhu.project.code}',
+            'ph_proj3': '{PROJ_CODE}',
+            'ph_village': '{bhu.village.code}',
+        })
+        return self.env.cr.rowcount
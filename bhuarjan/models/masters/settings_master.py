@@ -344,35 +344,14 @@ class BhuarjanSettingsMaster(models.Model):
         Returns:
             int: Last sequence number + 1, or initial_seq if no records exist
         """
-        # Build domain to find existing records
-        domain = [('name', '!=', 'New'), ('name', '!=', False)]
-        if project_id:
-            domain.append(('project_id', '=', project_id))
-        if village_id:
-            domain.append(('village_id', '=', village_id))
-        
-        # Get all existing records matching the criteria
-        model = self.env[model_name]
-        existing_records = model.search(domain)
-        
-        # Extract sequence numbers from existing names
-        sequence_numbers = []
-        prefix_escaped = re.escape(prefix_pattern)
-        # Pattern to match: prefix followed by digits at the end
-        pattern = re.compile(rf'^{prefix_escaped}(\d+)$')
-        
-        for record in existing_records:
-            if record.name and pattern.match(record.name):
-                match = pattern.match(record.name)
-                seq_num = int(match.group(1))
-                sequence_numbers.append(seq_num)
-        
+        last = self.env['bhuarjan.sequence.counter']._max_existing_number(
+            model_name, prefix_pattern, project_id=project_id, village_id=village_id,
+        )
         # If no existing sequences, return initial sequence
-        if not sequence_numbers:
+        if last is None:
             return initial_seq
-        
         # Return the highest sequence number + 1
-        return max(sequence_numbers) + 1
+        return last + 1
     
     @api.model
     def get_sequence_number(self, process_name, project_id, village_id=None):
@@ -419,46 +398,23 @@ class BhuarjanSettingsMaster(models.Model):
             else:
                 sequence_code = f'bhuarjan.{process_name}.{project_id}'
             
-            # Get last sequence number from existing records (for survey process with village)
-            next_seq_number = None
+            # Survey numbers per village come from the locked counter row (seeded
+            # from the highest existing number), not from scanning the surveys.
             if process_name == 'survey' and village_id:
-                model_name = 'bhu.survey'
-                next_seq_number = self._get_last_sequence_number(
-                    model_name,
+                next_seq_number = self.env['bhuarjan.sequence.counter']._next_number(
+                    process_name,
+                    project_id,
+                    village_id,
                     sequence_prefix,
-                    project_id=project_id,
-                    village_id=village_id,
-                    initial_seq=sequence_setting.initial_sequence
+                    initial_seq=sequence_setting.initial_sequence,
                 )
-            
+                return f"{sequence_prefix}{str(next_seq_number).zfill(sequence_setting.padding)}"
+
             # Check if sequence exists, if not create it
             existing_sequence = self.env['ir.sequence'].search([
                 ('code', '=', sequence_code)
             ], limit=1)
             
-            # If we calculated next_seq_number from existing records, use it directly
-            if next_seq_number is not None:
-                # Update or create the sequence with the calculated number
-                if not existing_sequence:
-                    # Create new sequence starting from calculated number
-                    # Set number_next to next_seq_number + 1 since we'll use next_seq_number now
-                    existing_sequence = self.env['ir.sequence'].sudo().create({
-                        'name': f'Bhuarjan {process_name.title()} Sequence - Project {project.name}' + 
-                               (f' - Village {village.name}' if village_id and village.exists() else ''),
-                        'code': sequence_code,
-                        'prefix': sequence_prefix,
-                        'number_next': next_seq_number + 1,  # Set to +1 since we're using next_seq_number now
-                        'padding': sequence_setting.padding,
-                        'company_id': False,
-                    })
-                else:
-                    # Update existing sequence counter to use the calculated number
-                    existing_sequence.write({'number_next': next_seq_number + 1})  # Set to +1 since we're using next_seq_number now
-                
-                # Generate the sequence number directly using the calculated value
-                sequence_number = f"{sequence_prefix}{str(next_seq_number).zfill(sequence_setting.padding)}"
-                return sequence_number
-            
             # If no next_seq_number calculated, use ir.sequence as normal
             if not existing_sequence:
                 # Create new sequence for this project-village combination
@@ -508,6 +464,40 @@ class BhuarjanSettingsMaster(models.Model):
         
         return sequence
     
+    @api.model
+    def get_sequence_numbers(self, process_name, project_id, village_id=None, count=1):
+        """Reserve ``count`` sequence numbers for a process in one step.
+
+        Survey numbers per village are taken as one block from the counter row;
+        other processes fall back to ``get_sequence_number`` per number.
+        """
+        if count <= 0:
+            return []
+        sequence_setting = self.env['bhuarjan.sequence.settings'].search([
+            ('process_name', '=', process_name),
+            ('active', '=', True)
+        ], limit=1)
+        if not (sequence_setting and process_name == 'survey' and village_id):
+            return [self.get_sequence_number(process_name, project_id, village_id=village_id)
+                    for _i in range(count)]
+        project = self.env['bhu.project'].browse(project_id)
+        project_code = project.code or project.name or 'PROJ'
+        village = self.env['bhu.village'].browse(village_id)
+        village_code = village.village_code if village.exists() else ''
+        sequence_prefix = sequence_setting.prefix.replace('{%PROJ_CODE%}', project_code)
+        sequence_prefix = sequence_prefix.replace('{bhu.project.code}', project_code)
+        sequence_prefix = sequence_prefix.replace('{PROJ_CODE}', project_code)
+        sequence_prefix = sequence_prefix.replace('{bhu.village.code}', village_code)
+        numbers = self.env['bhuarjan.sequence.counter']._next_numbers(
+            process_name,
+            project_id,
+            village_id,
+            sequence_prefix,
+            count,
+            initial_seq=sequence_setting.initial_sequence,
+        )
+        return [f"{sequence_prefix}{str(n).zfill(sequence_setting.padding)}" for n in numbers]
+
     @api.model
     def recreate_sequence(self, process_name, project_id):
         """Manually recreate sequence for debugging"""
@@ -518,6 +508,7 @@ class BhuarjanSettingsMaster(models.Model):
         
         if sequence_setting:
             sequence_setting._create_sequence()
+            self.env['bhuarjan.sequence.counter']._backfill(process_name, sequence_setting.prefix)
             return True
         return False
     
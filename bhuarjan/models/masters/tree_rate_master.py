@@ -1,13 +1,74 @@
 # -*- coding: utf-8 -*-
 
+import threading
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 
+# Per-worker rate index: dbname -> (version, TreeRateIndex). The version is
+# max(write_date) and row count of the rate table, read once per transaction,
+# so other workers pick up a change once it is committed; changes made in
+# this worker drop the entry at once.
+_rate_index_cache = {}
+_rate_index_lock = threading.Lock()
+# ``cr.cache`` key of the rate table version read in the current transaction.
+TREE_RATE_VERSION_KEY = 'bhu_tree_rate_index_version'
+
+
+class TreeRateIndex:
+    """Active tree rates grouped by (tree master, development stage).
+
+    Each group keeps its slabs sorted by ``girth_range_min`` with the running
+    maximum of ``girth_range_max``, so the first slab containing a girth (the
+    one a linear scan in ``_order`` would find) is located with two bisects.
+    """
+
+    def __init__(self, rows):
+        """``rows``: ``(id, tree_master_id, development_stage, girth_min, girth_max, rate)``."""
+        grouped = defaultdict(list)
+        for rate_id, tree_id, stage, girth_min, girth_max, rate in rows:
+            grouped[(tree_id, stage)].append((girth_min or 0.0, rate_id, girth_max or float('inf'), rate))
+        self._slabs = {}
+        self._stages = defaultdict(list)
+        for key, slabs in grouped.items():
+            slabs.sort(key=lambda slab: (slab[0], slab[1]))
+            reach, top = [], float('-inf')
+            for slab in slabs:
+                top = max(top, slab[2])
+                reach.append(top)
+            self._slabs[key] = ([slab[0] for slab in slabs], reach, [slab[3] for slab in slabs])
+            self._stages[key[0]].append(key[1])
+        for stages in self._stages.values():
+            stages.sort()
+
+    def _match(self, key, girth):
+        mins, reach, rates = self._slabs[key]
+        first_fit = bisect_left(reach, girth)
+        return rates[first_fit] if first_fit < bisect_right(mins, girth) else None
+
+    def lookup(self, tree_id, stage, girth):
+        """Rate of the first slab containing ``girth``, else of the first slab.
+
+        Without a stage every stage of the tree is tried in ``_order``.
+        Returns ``None`` when the tree has no active rate.
+        """
+        stages = [stage] if stage else self._stages.get(tree_id, [])
+        keys = [(tree_id, s) for s in stages if (tree_id, s) in self._slabs]
+        if not keys:
+            return None
+        for key in keys:
+            rate = self._match(key, girth)
+            if rate is not None:
+                return rate
+        return self._slabs[keys[0]][2][0]
+
 
 class TreeMaster(models.Model):
     _name = 'bhu.tree.master'
     _description = 'Tree Rate Master / वृक्ष दर मास्टर'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'bhu.sync.tracked.mixin']
     _order = 'name'
 
     name = fields.Char(string='Tree Name / वृक्ष का नाम', required=True, tracking=True,
@@ -673,3 +734,57 @@ class TreeRateMaster(models.Model):
         }
         for rec in self:
             rec.stage_icon = icon_map.get(rec.development_stage, '')
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self._invalidate_rate_index()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        self._invalidate_rate_index()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self._invalidate_rate_index()
+        return res
+
+    @api.model
+    def _invalidate_rate_index(self):
+        """Drop this worker's rate index; only the tree rates, not the registry caches."""
+        self.env.cr.cache.pop(TREE_RATE_VERSION_KEY, None)
+        with _rate_index_lock:
+            _rate_index_cache.pop(self.env.cr.dbname, None)
+
+    @api.model
+    def _get_rate_index(self):
+        """``TreeRateIndex`` of all active rates, rebuilt when a rate row changes."""
+        self.flush_model()
+        cr = self.env.cr
+        version = cr.cache.get(TREE_RATE_VERSION_KEY)
+        if version is None:
+            cr.execute("SELECT MAX(write_date), COUNT(*) FROM bhu_tree_rate_master")
+            version = cr.cache[TREE_RATE_VERSION_KEY] = cr.fetchone()
+            # Read again in the next transaction of this cursor.
+            cr.postcommit.add(lambda: cr.cache.pop(TREE_RATE_VERSION_KEY, None))
+            cr.postrollback.add(lambda: cr.cache.pop(TREE_RATE_VERSION_KEY, None))
+        with _rate_index_lock:
+            entry = _rate_index_cache.get(cr.dbname)
+        if entry and entry[0] == version:
+            return entry[1]
+        cr.execute("""
+            SELECT id, tree_master_id, development_stage, girth_range_min, girth_range_max, rate
+              FROM bhu_tree_rate_master
+             WHERE active
+        """)
+        index = TreeRateIndex(cr.fetchall())
+        with _rate_index_lock:
+            _rate_index_cache[cr.dbname] = (version, index)
+        return index
+
+    @api.model
+    def get_rate_for_tree(self, tree_master_id, girth_cm, development_stage):
+        """Per-tree rate for a tree master, girth and stage (``None`` when no rate exists)."""
+        return self._get_rate_index().lookup(tree_master_id, development_stage or False, girth_cm or 0.0)
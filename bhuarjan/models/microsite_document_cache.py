@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""Stored PDFs served by the public QR microsite (``controllers/api/qr_microsite.py``).
+
+One row per (record, kind) points at the rendered attachment and the
+fingerprint of the inputs it was rendered from, like the Section 23 document
+cache. A scan whose fingerprint matches is served from the filestore; any
+change to the record, to the child lines its report prints, or to the
+surveys, landowners and tree lines of its project/village, renders the
+document again on the next scan.
+"""
+from psycopg2 import IntegrityError
+
+from odoo import api, fields, models
+from odoo.tools import mute_logger
+
+from .award.award_document_cache import s23_fingerprint, s23_rows_digest_query
+from .filestore_attachment import create_attachment_from_file
+
+# Bump when the fingerprint payload changes shape.
+MICROSITE_CACHE_FINGERPRINT_VERSION = 2
+
+# (table, where clause) per input; params are (project_id, village_id).
+MICROSITE_SURVEY_DIGEST_QUERIES = [
+    ('bhu_survey', "t.project_id = %(project_id)s AND t.village_id = %(village_id)s"),
+    ('bhu_landowner', """t.id IN (
+        SELECT r.landowner_id FROM bhu_survey_landowner_rel r
+          JOIN bhu_survey s ON s.id = r.survey_id
+         WHERE s.project_id = %(project_id)s AND s.village_id = %(village_id)s)"""),
+    ('bhu_survey_tree_line', """t.survey_id IN (
+        SELECT s.id FROM bhu_survey s
+         WHERE s.project_id = %(project_id)s AND s.village_id = %(village_id)s)"""),
+]
+
+
+class MicrositeDocumentCache(models.Model):
+    _name = 'bhu.microsite.document.cache'
+    _description = 'QR Microsite Document Cache'
+
+    res_model = fields.Char(string='Model', required=True)
+    res_id = fields.Many2oneReference(string='Record ID', model_field='res_model', required=True)
+    kind = fields.Char(string='Document', required=True)
+    fingerprint = fields.Char(string='Input Fingerprint')
+    attachment_id = fields.Many2one('ir.attachment', string='Attachment', required=True, ondelete='cascade')
+
+    _sql_constraints = [
+        ('record_kind_uniq', 'unique(res_model, res_id, kind)',
+         'Only one cached microsite document per record and kind.'),
+    ]
+
+    @api.model
+    def _microsite_fingerprint(self, record, kind, project=None, village=None, child_lines=()):
+        """Fingerprint of ``record``, its ``child_lines`` and the surveys of ``project``/``village``.
+
+        ``child_lines``: One2many field names of ``record`` whose lines the
+        report prints; editing a line does not touch the parent's write_date.
+        """
+        inputs = []
+        self.env.flush_all()
+        child_tables = []
+        for field_name in child_lines:
+            field = record._fields[field_name]
+            table = (self.env[field.comodel_name]._table, field.inverse_name)
+            if table not in child_tables:
+                child_tables.append(table)
+        for table, inverse_name in child_tables:
+            self.env.cr.execute(
+                s23_rows_digest_query(table, 't.%s = %%(record_id)s' % inverse_name),
+                {'record_id': record.id},
+            )
+            inputs.append(self.env.cr.fetchone()[0])
+        if project and village:
+            params = {'project_id': project.id, 'village_id': village.id}
+            for table, where in MICROSITE_SURVEY_DIGEST_QUERIES:
+                self.env.cr.execute(s23_rows_digest_query(table, where), params)
+                inputs.append(self.env.cr.fetchone()[0])
+        module = self.env['ir.module.module'].sudo().search([('name', '=', 'bhuarjan')], limit=1)
+        return s23_fingerprint({
+            'version': MICROSITE_CACHE_FINGERPRINT_VERSION,
+            'module': module.latest_version,
+            'kind': kind,
+            'record': [record._name, record.id, record.write_date],
+            'project': [project.id, project.write_date] if project else None,
+            'village': [village.id, village.write_date] if village else None,
+            'inputs': inputs,
+        })
+
+    @api.model
+    def _get_entry(self, record, kind):
+        return self.sudo().search([
+            ('res_model', '=', record._name),
+            ('res_id', '=', record.id),
+            ('kind', '=', kind),
+        ], limit=1)
+
+    @api.model
+    def _get_cached_document(self, record, kind, fingerprint):
+        """Stored attachment of ``kind`` for ``record`` if rendered from ``fingerprint``."""
+        entry = self._get_entry(record, kind)
+        if entry and entry.fingerprint == fingerprint:
+            return entry.attachment_id
+        return self.env['ir.attachment']
+
+    @api.model
+    def _store_document(self, record, kind, fingerprint, pdf, filename):
+        """Store freshly rendered ``pdf`` (bytes or a file), replacing the previous version.
+
+        Returns the new attachment. When a concurrent scan registers the same
+        document first, its entry is kept; this copy is still returned to be
+        served and is removed by the next store.
+        """
+        description = f'QR microsite cached document [{kind}]'
+        vals = {
+            'name': filename,
+            'type': 'binary',
+            'mimetype': 'application/pdf',
+            'res_model': record._name,
+            'res_id': record.id,
+            'description': description,
+        }
+        if isinstance(pdf, bytes):
+            attachment = self.env['ir.attachment'].sudo().create(dict(vals, raw=pdf))
+        else:
+            attachment = create_attachment_from_file(self.env(su=True), pdf, vals)
+        entry = self._get_entry(record, kind)
+        if entry:
+            entry.write({'attachment_id': attachment.id, 'fingerprint': fingerprint})
+            # Previous version plus copies left by concurrent scans.
+            self.env['ir.attachment'].sudo().search([
+                ('res_model', '=', record._name),
+                ('res_id', '=', record.id),
+                ('description', '=', description),
+                ('id', '!=', attachment.id),
+            ]).unlink()
+            return attachment
+        try:
+            with mute_logger('odoo.sql_db'), self.env.cr.savepoint():
+                self.sudo().create({
+                    'res_model': record._name,
+                    'res_id': record.id,
+                    'kind': kind,
+                    'fingerprint': fingerprint,
+                    'attachment_id': attachment.id,
+                })
+        except IntegrityError:
+            # Another scan of the same QR code stored the document first.
+            pass
+        return attachment
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""Incremental reader for uploaded bank reconciliation files.
+
+Rows are yielded one at a time from CSV, XLSX (openpyxl read-only mode) and
+XLS files, with headers normalized once to ``bhu.payment.reconciliation.bank.line``
+field names. Legacy ``.xls`` files are read through xlrd, which needs the
+whole workbook in memory (the format is capped at 65k rows anyway).
+"""
+import csv
+import io
+
+# Normalized header -> line field. A field's aliases are listed in priority
+# order; per row the first of its columns with a value wins.
+HEADER_ALIASES = {
+    'utr number': 'utr_number',
+    'utr': 'utr_number',
+    'transaction reference': 'transaction_reference',
+    'transaction ref': 'transaction_reference',
+    'beneficiary account': 'beneficiary_account',
+    'account number': 'beneficiary_account',
+    'beneficiary name': 'beneficiary_name',
+    'beneficiary bank code': 'beneficiary_bank_code',
+    'ifsc code': 'beneficiary_bank_code',
+    'credit amount': 'credit_amount',
+    'amount': 'credit_amount',
+    'status': 'status',
+    'event status': 'event_status',
+    'error': 'error',
+    'payment id': 'payment_id',
+    'date': 'transaction_date',
+}
+
+# Bank status text -> line status selection.
+BANK_STATUS_MAP = {
+    'executed': 'settled',
+    'settled': 'settled',
+    'success': 'settled',
+    'failed': 'failed',
+    'rejected': 'failed',
+    'returned': 'failed',
+}
+
+
+class BankFileRowError(ValueError):
+    """A single row could not be turned into line values."""
+
+
+def _header_columns(header_row):
+    """Return ``[(field name, [column indexes])]`` for the recognised headers.
+
+    Each field's columns are in ``HEADER_ALIASES`` order, not file order.
+    """
+    positions = {}
+    for idx, header in enumerate(header_row or []):
+        key = ' '.join(str(header if header is not None else '').split()).lower()
+        if key in HEADER_ALIASES and key not in positions:
+            positions[key] = idx
+    columns = {}
+    for key, field in HEADER_ALIASES.items():
+        if key in positions:
+            columns.setdefault(field, []).append(positions[key])
+    return list(columns.items())
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def row_to_line_vals(row):
+    """Validate one ``{field: raw value}`` row and return line values."""
+    amount_raw = row.get('credit_amount')
+    try:
+        if isinstance(amount_raw, str):
+            amount_raw = amount_raw.replace(',', '').replace('₹', '').strip()
+        amount = float(amount_raw or 0.0)
+    except (TypeError, ValueError):
+        raise BankFileRowError('Invalid amount %r' % (amount_raw,))
+    account = _text(row.get('beneficiary_account')).split('.')[0]
+    if not account:
+        raise BankFileRowError('Missing beneficiary account')
+    status = _text(row.get('status')).lower()
+    return {
+        'utr_number': _text(row.get('utr_number')),
+        'transaction_reference': _text(row.get('transaction_reference')),
+        'beneficiary_account': account,
+        'beneficiary_name': _text(row.get('beneficiary_name')),
+        'beneficiary_bank_code': _text(row.get('beneficiary_bank_code')),
+        'credit_amount': amount,
+        'status': BANK_STATUS_MAP.get(status, 'pending'),
+        'event_status': _text(row.get('event_status')),
+        'error': _text(row.get('error')),
+        'payment_id': _text(row.get('payment_id')),
+        'transaction_date': _text(row.get('transaction_date')),
+    }
+
+
+def _rows_from_values(values_iter, first_row_number):
+    """Map raw value tuples to ``(row number, {field: value})``, skipping blank rows."""
+    columns = None
+    for row_number, values in enumerate(values_iter, start=first_row_number):
+        values = values or ()
+        if columns is None:
+            columns = _header_columns(values)
+            continue
+        row = {}
+        has_data = False
+        for field, indexes in columns:
+            value = None
+            for idx in indexes:
+                value = values[idx] if idx < len(values) else None
+                if value not in (None, ''):
+                    has_data = True
+                    break
+            row[field] = value
+        if has_data:
+            yield row_number, row
+
+
+def iter_bank_file_rows(stream, filename):
+    """Yield ``(row number, {field: raw value})`` from a binary file object."""
+    name = (filename or '').lower()
+    if name.endswith('.xlsx'):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise BankFileRowError("Python library 'openpyxl' is required to process .xlsx files.")
+        workbook = load_workbook(stream, data_only=True, read_only=True)
+        try:
+            yield from _rows_from_values(workbook.active.iter_rows(values_only=True), 1)
+        finally:
+            workbook.close()
+    elif name.endswith('.xls'):
+        import xlrd
+        workbook = xlrd.open_workbook(file_contents=stream.read(), on_demand=True)
+        try:
+            sheet = workbook.sheet_by_index(0)
+            yield from _rows_from_values((sheet.row_values(i) for i in range(sheet.nrows)), 1)
+        finally:
+            workbook.release_resources()
+    else:
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        yield from _rows_from_values(csv.reader(text), 1)
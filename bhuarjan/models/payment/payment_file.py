@@ -9,6 +9,9 @@ import re
 import uuid
 from datetime import datetime
 
+from ..survey.survey import normalize_khasra
+from ..xlsx_export import XlsxExport
+
 _logger = logging.getLogger(__name__)
 
 try:
@@ -136,7 +139,27 @@ class PaymentFile(models.Model):
             
             if record.award_id and record.village_id:
                 record._populate_payment_lines()
+        self.env['bhuarjan.dashboard.helpers']._invalidate_dashboard_counts(self._name)
         return records
+
+    def write(self, vals):
+        relocated = 'project_id' in vals or 'village_id' in vals
+        old_keys = self.payment_line_ids._payment_status_survey_keys() if relocated else set()
+        result = super().write(vals)
+        if 'state' in vals:
+            self.env['bhuarjan.dashboard.helpers']._invalidate_dashboard_counts(self._name)
+        if relocated:
+            self.env['bhu.survey']._recompute_payment_status_for_keys(
+                old_keys | self.payment_line_ids._payment_status_survey_keys()
+            )
+        return result
+
+    def unlink(self):
+        # Lines go with the file through ON DELETE CASCADE, bypassing the line's unlink().
+        keys = self.payment_line_ids._payment_status_survey_keys()
+        result = super().unlink()
+        self.env['bhu.survey']._recompute_payment_status_for_keys(keys)
+        return result
     
     @api.onchange('project_id')
     def _onchange_project_id(self):
@@ -208,10 +231,10 @@ class PaymentFile(models.Model):
 
         for group in grouped_data:
             lines = group.get('lines', [])
-            owners = [line.get('landowner') for line in lines if line.get('landowner')]
-            landowner = owners[0] if owners else False
-            if not landowner:
+            owner_ids = [line.get('landowner_id') for line in lines if line.get('landowner_id')]
+            if not owner_ids:
                 continue
+            landowner = self.env['bhu.landowner'].browse(owner_ids[0])
 
             unique_khasras = sorted(
                 {(line.get('khasra') or '').strip() for line in lines if line.get('khasra')},
@@ -269,33 +292,21 @@ class PaymentFile(models.Model):
             raise ValidationError(_('xlsxwriter library is required for Excel export. Please install it: pip install xlsxwriter'))
         
         # Generate Excel file
-        excel_file = self._generate_excel_file()
+        excel_file, _size = self._generate_excel_file()
+        with excel_file:
+            excel_data = excel_file.read()
         
-        # Save to record
+        # Save to record (the stored field is the download; no second attachment copy)
         filename = f'Payment_File_{self.name}_{self.village_id.name or "Unknown"}.xlsx'
         self.write({
-            'generated_file': base64.b64encode(excel_file),
+            'generated_file': base64.b64encode(excel_data),
             'generated_file_filename': filename,
             'state': 'generated',
             'generation_date': fields.Date.today()
         })
         
-        # Create attachment for download
-        attachment = self.env['ir.attachment'].create({
-            'name': filename,
-            'type': 'binary',
-            'datas': base64.b64encode(excel_file),
-            'mimetype': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            'res_model': 'bhu.payment.file',
-            'res_id': self.id,
-        })
-        
         # Return download action
-        return {
-            'type': 'ir.actions.act_url',
-            'url': f'/web/content/{attachment.id}?download=true',
-            'target': 'self',
-        }
+        return self.action_download_generated_file()
 
     def action_download_generated_file(self):
         """Download already generated payment file from form."""
@@ -517,11 +528,10 @@ class PaymentFile(models.Model):
         }
     
     def _generate_excel_file(self):
-        """Generate Excel file based on Template 1 (Bank Export)"""
+        """Generate Excel file based on Template 1 (Bank Export); returns ``(file, size)``"""
         self.ensure_one()
         
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+        workbook = XlsxExport()
         worksheet = workbook.add_worksheet('PaymentData')
         
         # Define formats
@@ -593,9 +603,7 @@ class PaymentFile(models.Model):
         worksheet.set_column('K:K', 15)
         worksheet.set_column('L:N', 25)
         
-        workbook.close()
-        output.seek(0)
-        return output.read()
+        return workbook.close()
 
     def action_open_bank_details_wizard(self):
         """Open popup to update beneficiary bank details line-wise."""
@@ -689,6 +697,11 @@ class PaymentFileLine(models.Model):
     serial_number = fields.Integer(string='Serial Number / स.क.', required=True, default=1)
     award_serial_number = fields.Integer(string='Award Serial Number / अवॉर्ड स.क.', required=True)
     khasra_number = fields.Char(string='Khasra Number / खसरा नंबर')
+    khasra_key = fields.Char(string='Khasra Key', compute='_compute_khasra_key', store=True, index=True)
+    project_id = fields.Many2one('bhu.project', string='Project / परियोजना',
+                                 related='payment_file_id.project_id', store=True, index=True)
+    village_id = fields.Many2one('bhu.village', string='Village / ग्राम',
+                                 related='payment_file_id.village_id', store=True, index=True)
     
     # Landowner Details
     landowner_id = fields.Many2one('bhu.landowner', string='Landowner / भूमिस्वामी', required=False, ondelete='set null')
@@ -746,6 +759,41 @@ class PaymentFileLine(models.Model):
     # Remarks
     remark = fields.Text(string='Remark / रिमार्क')
     
+    @api.depends('khasra_number')
+    def _compute_khasra_key(self):
+        for record in self:
+            record.khasra_key = normalize_khasra(record.khasra_number)
+
+    def _payment_status_survey_keys(self):
+        """``{(khasra_key, project_id, village_id)}`` of the surveys these lines feed."""
+        return {
+            (line.khasra_key, line.project_id.id, line.village_id.id)
+            for line in self
+            if line.khasra_key
+        }
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        self.env['bhu.survey']._recompute_payment_status_for_keys(lines._payment_status_survey_keys())
+        return lines
+
+    def write(self, vals):
+        rekeyed = 'khasra_number' in vals or 'payment_file_id' in vals
+        old_keys = self._payment_status_survey_keys() if rekeyed else set()
+        result = super().write(vals)
+        if rekeyed:
+            self.env['bhu.survey']._recompute_payment_status_for_keys(
+                old_keys | self._payment_status_survey_keys()
+            )
+        return result
+
+    def unlink(self):
+        keys = self._payment_status_survey_keys()
+        result = super().unlink()
+        self.env['bhu.survey']._recompute_payment_status_for_keys(keys)
+        return result
+
     @api.depends('compensation_amount')
     def _compute_net_payable(self):
         """Compute net payable amount"""
@@ -1,8 +1,21 @@
 # -*- coding: utf-8 -*-
 
+import base64
+import io
+import logging
+from collections import defaultdict
+
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 
+from .bank_file_reader import BankFileRowError, iter_bank_file_rows, row_to_line_vals
+from .reconciliation_matcher import ReconciliationMatcher, normalize_ref
+
+_logger = logging.getLogger(__name__)
+
+# Bank lines created per INSERT batch / savepoint while ingesting a bank file.
+BANK_LINE_CHUNK = 1000
+
 
 class PaymentReconciliationBank(models.Model):
     _name = 'bhu.payment.reconciliation.bank'
@@ -81,105 +94,111 @@ class PaymentReconciliationBank(models.Model):
                 else:
                     # No project_id, use fallback
                     vals['name'] = self.env['ir.sequence'].next_by_code('bhu.payment.reconciliation.bank') or 'New'
-        return super().create(vals_list)
+        records = super().create(vals_list)
+        self.env['bhuarjan.dashboard.helpers']._invalidate_dashboard_counts(self._name)
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        if 'state' in vals:
+            self.env['bhuarjan.dashboard.helpers']._invalidate_dashboard_counts(self._name)
+        return result
     
+    def _open_bank_file_stream(self):
+        """Binary stream of the uploaded bank file without base64-decoding it in memory."""
+        self.ensure_one()
+        attachment = self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name),
+            ('res_id', '=', self.id),
+            ('res_field', '=', 'bank_file'),
+        ], limit=1)
+        if attachment.store_fname:
+            return open(attachment._full_path(attachment.store_fname), 'rb')
+        if attachment:
+            return io.BytesIO(attachment.raw or b'')
+        return io.BytesIO(base64.b64decode(self.bank_file or b''))
+
+    def _ingest_bank_file(self):
+        """Stream the bank file into reconciliation lines, BANK_LINE_CHUNK rows at a time.
+
+        Each chunk is created under its own savepoint; when a chunk fails its
+        rows are retried one by one so only the bad rows are skipped.
+        Returns ``(created count, [(row number, error)])``.
+        """
+        self.ensure_one()
+        Line = self.env['bhu.payment.reconciliation.bank.line']
+        created = 0
+        errors = []
+
+        def _flush(chunk):
+            nonlocal created
+            if not chunk:
+                return
+            try:
+                with self.env.cr.savepoint():
+                    Line.create([vals for _row_number, vals in chunk])
+                created += len(chunk)
+            except Exception:
+                for row_number, vals in chunk:
+                    try:
+                        with self.env.cr.savepoint():
+                            Line.create(vals)
+                        created += 1
+                    except Exception as row_error:
+                        errors.append((row_number, str(row_error)))
+            self.env.invalidate_all()
+            _logger.info("[BANK RECON] %s: %s line(s) created, %s row(s) skipped",
+                         self.name, created, len(errors))
+
+        chunk = []
+        with self._open_bank_file_stream() as stream:
+            for row_number, row in iter_bank_file_rows(stream, self.bank_file_filename):
+                try:
+                    vals = row_to_line_vals(row)
+                except BankFileRowError as row_error:
+                    errors.append((row_number, str(row_error)))
+                    continue
+                vals['reconciliation_id'] = self.id
+                chunk.append((row_number, vals))
+                if len(chunk) >= BANK_LINE_CHUNK:
+                    _flush(chunk)
+                    chunk = []
+        _flush(chunk)
+        return created, errors
+
     def action_process_bank_file(self):
         """Process uploaded bank file and match with payment lines"""
         self.ensure_one()
-        if not self.bank_file:
+        # bin_size: check presence without loading the file itself.
+        if not self.with_context(bin_size=True).bank_file:
             raise ValidationError(_('Please upload bank file first.'))
-        
-        # Decode bank file
-        import base64
-        import csv
-        import io
-        
+
         try:
-            file_content = base64.b64decode(self.bank_file)
-            
             # Clear existing lines
-            self.reconciliation_line_ids = [(5, 0, 0)]
-            line_vals = []
-
-            # Try to determine if it's Excel or CSV
-            filename = (self.bank_file_filename or '').lower()
-            is_xlsx = filename.endswith('.xlsx')
-            is_xls = filename.endswith('.xls')
-            is_excel = is_xls or is_xlsx
-            
-            if is_excel:
-                if is_xlsx:
-                    # Process XLSX via openpyxl (xlrd no longer supports xlsx).
-                    try:
-                        from openpyxl import load_workbook
-                    except ImportError:
-                        raise ValidationError(
-                            _("Python library 'openpyxl' is required to process .xlsx files.")
-                        )
-
-                    workbook = load_workbook(io.BytesIO(file_content), data_only=True, read_only=True)
-                    sheet = workbook.active
-                    header_row = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), None) or []
-                    headers = [str(h).strip() if h is not None else '' for h in header_row]
-
-                    for values in sheet.iter_rows(min_row=2, values_only=True):
-                        row_data = {}
-                        has_data = False
-                        for idx, header in enumerate(headers):
-                            if not header:
-                                continue
-                            cell_val = values[idx] if idx < len(values) else ''
-                            if cell_val is None:
-                                cell_val = ''
-                            if cell_val != '':
-                                has_data = True
-                            row_data[header] = cell_val
-                        if has_data:
-                            line_vals.append((0, 0, self._prepare_line_vals(row_data)))
-                else:
-                    # Process XLS via xlrd
-                    import xlrd
-                    workbook = xlrd.open_workbook(file_contents=file_content)
-                    sheet = workbook.sheet_by_index(0)
-                    headers = [str(sheet.cell_value(0, col)).strip() for col in range(sheet.ncols)]
-                    
-                    for row_idx in range(1, sheet.nrows):
-                        row_data = {}
-                        has_data = False
-                        for col_idx, header in enumerate(headers):
-                            if not header:
-                                continue
-                            value = sheet.cell_value(row_idx, col_idx)
-                            if value not in ('', None):
-                                has_data = True
-                            row_data[header] = value
-                        if has_data:
-                            line_vals.append((0, 0, self._prepare_line_vals(row_data)))
-            else:
-                # Process CSV
-                if isinstance(file_content, bytes):
-                    file_content = file_content.decode('utf-8-sig') # Handle BOM
-                
-                reader = csv.DictReader(io.StringIO(file_content))
-                for row in reader:
-                    line_vals.append((0, 0, self._prepare_line_vals(row)))
-            
-            if line_vals:
-                self.reconciliation_line_ids = line_vals
-                self.state = 'processed'
-                
-                # Match with payment file lines
-                self._match_payments()
-            else:
-                raise ValidationError(_('No valid rows found in uploaded bank file.'))
+            self.reconciliation_line_ids.unlink()
+            created, errors = self._ingest_bank_file()
         except Exception as e:
             raise ValidationError(_('Error processing bank file: %s') % str(e))
+        if not created:
+            raise ValidationError(_('No valid rows found in uploaded bank file.'))
+
+        self.state = 'processed'
+        # Match with payment file lines
+        match_counts = self._match_payments()
+        if errors:
+            self.message_post(body=_('%(count)s row(s) skipped while reading the bank file:\n%(rows)s') % {
+                'count': len(errors),
+                'rows': '\n'.join(_('Row %(row)s: %(error)s') % {'row': row, 'error': err}
+                                  for row, err in errors[:50]),
+            })
 
+        match_counts = match_counts or {}
         lines = self.reconciliation_line_ids
         total_processed = len(lines)
         passed_count = len(lines.filtered(lambda l: l.status == 'settled'))
         failed_count = len(lines.filtered(lambda l: l.status == 'failed'))
         unmatched_count = len(lines.filtered(lambda l: not l.payment_line_id))
+        skipped_count = len(errors)
 
         return {
             'type': 'ir.actions.client',
@@ -188,117 +207,200 @@ class PaymentReconciliationBank(models.Model):
                 'title': _('Reconciliation Summary'),
                 'message': _(
                     'Processed: %(processed)s | Passed: %(passed)s | Failed: %(failed)s | Unmatched: %(unmatched)s'
+                    ' | Ambiguous: %(ambiguous)s | Duplicate: %(duplicate)s | Skipped rows: %(skipped)s'
                 ) % {
                     'processed': total_processed,
                     'passed': passed_count,
                     'failed': failed_count,
                     'unmatched': unmatched_count,
+                    'ambiguous': match_counts.get('ambiguous', 0),
+                    'duplicate': match_counts.get('duplicate', 0),
+                    'skipped': skipped_count,
                 },
                 'type': 'success',
                 'sticky': True,
             }
         }
 
-    def _prepare_line_vals(self, row):
-        """Helper to map row data to line vals"""
-        # Mapping Template 2 columns
-        return {
-            'utr_number': row.get('UTR Number', '') or row.get('UTR', ''),
-            'transaction_reference': row.get('Transaction Reference', '') or row.get('Transaction Ref', ''),
-            'beneficiary_account': str(row.get('Beneficiary Account', '') or row.get('Account Number', '')).split('.')[0],
-            'beneficiary_name': row.get('Beneficiary Name', ''),
-            'beneficiary_bank_code': row.get('Beneficiary Bank Code', '') or row.get('IFSC Code', ''),
-            'credit_amount': float(row.get('Credit Amount', 0) or row.get('Amount', 0) or 0),
-            'status': row.get('Status', '').lower() if row.get('Status') else 'pending',
-            'event_status': row.get('Event Status', ''),
-            'error': row.get('Error', ''),
-            'payment_id': row.get('Payment Id', ''),
-            'transaction_date': row.get('Date', ''),
-        }
-    
     def _match_payments(self):
-        """Match bank file transactions with payment file lines"""
+        """Match bank file transactions with payment file lines
+
+        Resolves every bank row in one pass through ``ReconciliationMatcher``
+        and writes the results with a single UPDATE. Returns the number of
+        rows per match state.
+        """
         self.ensure_one()
         if not self.payment_file_id:
-            return
-        
-        # Get payment file lines
+            return {}
+
         payment_lines = self.payment_file_id.payment_line_ids
-        
-        # Match reconciliation lines with payment lines
-        for recon_line in self.reconciliation_line_ids:
-            # Try to match by account number and amount
-            matched_payment = payment_lines.filtered(
-                lambda p: p.account_number == recon_line.beneficiary_account and
-                         abs(p.net_payable_amount - recon_line.credit_amount) < 0.01
-            )
-            
-            if matched_payment:
-                recon_line.payment_line_id = matched_payment[0].id
+        # Earlier reconciliations of the same payment file resolve ties by UTR / payment id.
+        previous = self.env['bhu.payment.reconciliation.bank.line'].search_read([
+            ('payment_line_id', 'in', payment_lines.ids),
+            ('reconciliation_id', '!=', self.id),
+        ], ['utr_number', 'payment_id', 'payment_line_id'], load=None)
+        utr_index = {}
+        payment_id_index = {}
+        for row in previous:
+            if row['utr_number']:
+                utr_index[normalize_ref(row['utr_number'])] = row['payment_line_id']
+            if row['payment_id']:
+                payment_id_index[normalize_ref(row['payment_id'])] = row['payment_line_id']
+        matcher = ReconciliationMatcher(
+            [(line['id'], line['account_number'], line['net_payable_amount'])
+             for line in payment_lines.read(['account_number', 'net_payable_amount'], load=None)],
+            utr_index=utr_index,
+            payment_id_index=payment_id_index,
+        )
+
+        recon_lines = self.reconciliation_line_ids
+        rows = recon_lines.read(
+            ['beneficiary_account', 'credit_amount', 'utr_number', 'payment_id', 'status', 'error'], load=None
+        )
+        results = matcher.match(
+            (r['id'], r['beneficiary_account'], r['credit_amount'], r['utr_number'], r['payment_id'])
+            for r in rows
+        )
+
+        ids, line_ids, statuses, match_states = [], [], [], []
+        counts = defaultdict(int)
+        for r in rows:
+            payment_line_id, match_state = results[r['id']]
+            status = 'pending'
+            if payment_line_id:
                 # Determine status based on bank file status
-                bank_status = (recon_line.status or '').lower()
+                bank_status = (r['status'] or '').lower()
                 if bank_status == 'executed' or bank_status == 'settled':
-                    recon_line.status = 'settled'
-                elif recon_line.error or bank_status == 'failed':
-                    recon_line.status = 'failed'
-                else:
-                    recon_line.status = 'pending'
-            else:
-                recon_line.status = 'pending'
+                    status = 'settled'
+                elif r['error'] or bank_status == 'failed':
+                    status = 'failed'
+            ids.append(r['id'])
+            line_ids.append(payment_line_id or None)
+            statuses.append(status)
+            match_states.append(match_state)
+            counts[match_state] += 1
+
+        if ids:
+            self.env.flush_all()
+            self.env.cr.execute("""
+                UPDATE bhu_payment_reconciliation_bank_line l
+                   SET payment_line_id = v.payment_line_id,
+                       status = v.status,
+                       match_state = v.match_state,
+                       write_uid = %s,
+                       write_date = now() at time zone 'UTC'
+                  FROM unnest(%s::int[], %s::int[], %s::varchar[], %s::varchar[])
+                       AS v(id, payment_line_id, status, match_state)
+                 WHERE l.id = v.id
+            """, (self.env.uid, ids, line_ids, statuses, match_states))
+            fnames = ['payment_line_id', 'status', 'match_state']
+            recon_lines.invalidate_recordset(fnames)
+            # Recompute amount_difference and the reconciliation summary.
+            recon_lines.modified(fnames)
+        return dict(counts)
 
     def action_complete_reconciliation(self):
-        """Complete reconciliation and update landowner status"""
+        """Complete reconciliation and update landowner status
+
+        Surveys of the village/project and existing status rows are loaded
+        once; statuses are then upserted with one ``create`` and one UPDATE.
+        """
         self.ensure_one()
         if self.state != 'processed':
             raise ValidationError(_('Please process the file first.'))
-        
-        for recon_line in self.reconciliation_line_ids:
-            if recon_line.payment_line_id and recon_line.payment_line_id.landowner_id:
-                landowner = recon_line.payment_line_id.landowner_id
-                
-                # Find all surveys for this landowner in this village/project
-                # We need to update status for each survey since the user wants khasra-wise status
-                surveys = self.env['bhu.survey'].search([
-                    ('landowner_ids', 'in', landowner.id),
-                    ('village_id', '=', self.village_id.id),
-                    ('project_id', '=', self.project_id.id)
+
+        recon_lines = self.reconciliation_line_ids.filtered(
+            lambda l: l.payment_line_id and l.payment_line_id.landowner_id
+        )
+        landowners = recon_lines.payment_line_id.landowner_id
+        if landowners:
+            # Find all surveys for these landowners in this village/project
+            # We need to update status for each survey since the user wants khasra-wise status
+            surveys = self.env['bhu.survey'].search([
+                ('landowner_ids', 'in', landowners.ids),
+                ('village_id', '=', self.village_id.id),
+                ('project_id', '=', self.project_id.id)
+            ])
+            surveys_by_landowner = defaultdict(list)
+            for survey in surveys:
+                for landowner_id in survey.landowner_ids.ids:
+                    surveys_by_landowner[landowner_id].append(survey.id)
+
+            Status = self.env['bhu.landowner.payment.status']
+            status_by_key = {
+                (rec.landowner_id.id, rec.survey_id.id): rec
+                for rec in Status.search([
+                    ('landowner_id', 'in', landowners.ids),
+                    ('project_id', '=', self.project_id.id),
                 ])
-                
-                for survey in surveys:
-                    # Update or create landowner payment status
-                    status_val = 'pending'
-                    if recon_line.status == 'settled':
-                        status_val = 'paid'
-                    elif recon_line.status == 'failed':
-                        status_val = 'failed'
-                    
-                    status_record = self.env['bhu.landowner.payment.status'].search([
-                        ('landowner_id', '=', landowner.id),
-                        ('survey_id', '=', survey.id),
-                        ('project_id', '=', self.project_id.id)
-                    ], limit=1)
-                    
-                    vals = {
-                        'landowner_id': landowner.id,
-                        'survey_id': survey.id,
+            }
+
+            # Later bank rows win for the same landowner + survey, as before.
+            vals_by_key = {}
+            today = fields.Date.today()
+            for recon_line in recon_lines:
+                landowner_id = recon_line.payment_line_id.landowner_id.id
+                status_val = 'pending'
+                if recon_line.status == 'settled':
+                    status_val = 'paid'
+                elif recon_line.status == 'failed':
+                    status_val = 'failed'
+                for survey_id in surveys_by_landowner.get(landowner_id, ()):
+                    vals_by_key[(landowner_id, survey_id)] = {
+                        'landowner_id': landowner_id,
+                        'survey_id': survey_id,
                         'project_id': self.project_id.id,
                         'village_id': self.village_id.id,
                         'payment_file_id': self.payment_file_id.id,
                         'utr_number': recon_line.utr_number,
-                        'transaction_date': fields.Date.today(), # Or extract from file
+                        'transaction_date': today, # Or extract from file
                         'amount': recon_line.credit_amount,
                         'status': status_val,
                         'remarks': recon_line.error or recon_line.event_status or ''
                     }
-                    
-                    if status_record:
-                        status_record.write(vals)
-                    else:
-                        self.env['bhu.landowner.payment.status'].create(vals)
-        
+
+            to_create = [vals for key, vals in vals_by_key.items() if key not in status_by_key]
+            to_update = [(status_by_key[key], vals) for key, vals in vals_by_key.items() if key in status_by_key]
+            if to_create:
+                Status.create(to_create)
+            if to_update:
+                self._bulk_update_payment_statuses(to_update)
+
         self.state = 'completed'
         return True
 
+    def _bulk_update_payment_statuses(self, updates):
+        """Apply ``[(status record, vals)]`` with one UPDATE statement."""
+        fnames = ['village_id', 'payment_file_id', 'utr_number', 'transaction_date', 'amount', 'status', 'remarks']
+        self.env.flush_all()
+        columns = {fname: [] for fname in fnames}
+        ids = []
+        for record, vals in updates:
+            ids.append(record.id)
+            for fname in fnames:
+                value = vals[fname]
+                columns[fname].append(value if fname == 'amount' else (value or None))
+        self.env.cr.execute("""
+            UPDATE bhu_landowner_payment_status s
+               SET village_id = v.village_id,
+                   payment_file_id = v.payment_file_id,
+                   utr_number = v.utr_number,
+                   transaction_date = v.transaction_date,
+                   amount = v.amount,
+                   status = v.status,
+                   remarks = v.remarks,
+                   write_uid = %s,
+                   write_date = now() at time zone 'UTC'
+              FROM unnest(%s::int[], %s::int[], %s::int[], %s::varchar[], %s::date[],
+                          %s::numeric[], %s::varchar[], %s::text[])
+                   AS v(id, village_id, payment_file_id, utr_number, transaction_date, amount, status, remarks)
+             WHERE s.id = v.id
+        """, [self.env.uid, ids] + [columns[fname] for fname in fnames])
+        records = self.env['bhu.landowner.payment.status'].browse(ids)
+        records.invalidate_recordset(fnames)
+        # Surveys derive their payment status from these rows.
+        records.modified(fnames)
+
 
 class PaymentReconciliationBankLine(models.Model):
     _name = 'bhu.payment.reconciliation.bank.line'
@@ -327,6 +429,12 @@ class PaymentReconciliationBankLine(models.Model):
     
     # Matched Payment Line
     payment_line_id = fields.Many2one('bhu.payment.file.line', string='Matched Payment Line / मिलान भुगतान पंक्ति')
+    match_state = fields.Selection([
+        ('matched', 'Matched / मिलान'),
+        ('ambiguous', 'Ambiguous / अस्पष्ट'),
+        ('duplicate', 'Duplicate / दोहराव'),
+        ('unmatched', 'Unmatched / बेमेल'),
+    ], string='Match / मिलान स्थिति', readonly=True)
     
     # Computed fields from matched payment
     expected_amount = fields.Float(string='Expected Amount / अपेक्षित राशि', 
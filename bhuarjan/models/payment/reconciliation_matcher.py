@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""One-pass matcher between bank file rows and payment file lines.
+
+Payment lines are indexed by ``(account number, amount in paise)``; UTR and
+bank payment id from earlier reconciliations of the same payment file are
+used to break ties. Every bank row is resolved with dictionary lookups, so a
+20k-row bank file costs O(rows + lines) instead of O(rows x lines).
+"""
+from collections import defaultdict
+
+
+MATCH_MATCHED = 'matched'
+MATCH_AMBIGUOUS = 'ambiguous'
+MATCH_DUPLICATE = 'duplicate'
+MATCH_UNMATCHED = 'unmatched'
+
+
+def amount_to_paise(amount):
+    return int(round(float(amount or 0.0) * 100))
+
+
+def normalize_account(account):
+    return str(account or '').strip()
+
+
+def normalize_ref(ref):
+    return str(ref or '').strip().upper()
+
+
+class ReconciliationMatcher:
+    """Index payment lines once, then resolve bank rows against the index."""
+
+    def __init__(self, payment_lines, utr_index=None, payment_id_index=None):
+        """``payment_lines``: iterable of ``(id, account_number, amount)`` in priority order.
+
+        ``utr_index`` / ``payment_id_index`` map a normalized reference to the
+        payment line id it was reconciled against before.
+        """
+        self.by_key = defaultdict(list)
+        for line_id, account, amount in payment_lines:
+            self.by_key[(normalize_account(account), amount_to_paise(amount))].append(line_id)
+        self.utr_index = utr_index or {}
+        self.payment_id_index = payment_id_index or {}
+
+    def _by_reference(self, candidates, utr, payment_id):
+        for index, ref in ((self.utr_index, utr), (self.payment_id_index, payment_id)):
+            line_id = index.get(normalize_ref(ref)) if ref else None
+            if line_id in candidates:
+                return line_id
+        return None
+
+    def match(self, rows):
+        """Resolve ``rows`` (``(key, account, amount, utr, payment_id)``).
+
+        Returns ``{key: (payment_line_id or False, match_state)}``. Rows sharing
+        a candidate set are spread over its lines in order; a row that can only
+        reuse an already-taken line, or repeats a UTR of the file, is reported
+        as a duplicate.
+        """
+        results = {}
+        taken = set()
+        seen_utrs = set()
+        for key, account, amount, utr, payment_id in rows:
+            candidates = self.by_key.get((normalize_account(account), amount_to_paise(amount)))
+            if not candidates:
+                results[key] = (False, MATCH_UNMATCHED)
+                continue
+            utr_key = normalize_ref(utr)
+            repeated_utr = bool(utr_key) and utr_key in seen_utrs
+            if utr_key:
+                seen_utrs.add(utr_key)
+            if len(candidates) == 1:
+                line_id, state = candidates[0], MATCH_MATCHED
+            else:
+                line_id = self._by_reference(candidates, utr, payment_id)
+                state = MATCH_MATCHED
+                if line_id is None:
+                    free = [c for c in candidates if c not in taken]
+                    line_id = free[0] if free else candidates[0]
+                    state = MATCH_AMBIGUOUS
+            if line_id in taken or repeated_utr:
+                state = MATCH_DUPLICATE
+            taken.add(line_id)
+            results[key] = (line_id, state)
+        return results
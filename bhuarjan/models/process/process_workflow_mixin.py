@@ -198,7 +198,22 @@ class ProcessWorkflowMixin(models.AbstractModel):
                         # Mark related activities as done
                         record._mark_activities_done()
         
-        return super().write(vals)
+        result = super().write(vals)
+        if 'state' in vals:
+            self.env['bhuarjan.dashboard.helpers']._invalidate_dashboard_counts(self._name)
+        return result
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['bhuarjan.dashboard.helpers']._invalidate_dashboard_counts(self._name)
+        return records
+
+    def unlink(self):
+        model_name = self._name
+        result = super().unlink()
+        self.env['bhuarjan.dashboard.helpers']._invalidate_dashboard_counts(model_name)
+        return result
     
     def _validate_state_transition(self, old_state, new_state):
         """Validate state transitions"""
@@ -2,6 +2,8 @@ from odoo import models, fields, api
 from odoo.exceptions import ValidationError
 import json
 
+from .token import TOKEN_USER_FIELDS
+
 
 class BhuUserMobile(models.Model):
     """Additional mobile numbers for a user (for multi-mobile OTP login)"""
@@ -92,6 +94,8 @@ class ResUsers(models.Model):
 
     def write(self, vals):
         """Allow Bhuarjan Administrator and District Administrator to edit users."""
+        if TOKEN_USER_FIELDS.intersection(vals):
+            self.env['jwt.token']._evict_users(self.ids)
         current_user = self.env.user
         is_privileged = (
             current_user.has_group('bhuarjan.group_bhuarjan_admin') or
@@ -103,6 +107,10 @@ class ResUsers(models.Model):
             return super(ResUsers, self.sudo()).write(vals)
         return super().write(vals)
 
+    def unlink(self):
+        self.env['jwt.token']._evict_users(self.ids)
+        return super().unlink()
+
     @api.model_create_multi
     def create(self, vals_list):
         """Allow Bhuarjan Administrator and District Administrator to create users."""
@@ -5,6 +5,27 @@ from odoo.exceptions import ValidationError
 from dateutil.relativedelta import relativedelta
 import uuid
 
+class Section21SurveySnapshot:
+    """Approved/locked surveys of a notification's project and village, loaded once.
+
+    ``khasra_area``: khasra -> total acquired area
+    ``khasra_landowners``: khasra -> landowners (recordset, survey order, no duplicates)
+    ``khasras``: khasra numbers in ascending order
+    """
+
+    def __init__(self, surveys):
+        self.khasra_area = {}
+        self.khasra_landowners = {}
+        for survey in surveys:
+            khasra = survey.khasra_number
+            if not khasra:
+                continue
+            self.khasra_area[khasra] = self.khasra_area.get(khasra, 0.0) + (survey.acquired_area or 0.0)
+            landowners = self.khasra_landowners.get(khasra, survey.landowner_ids.browse())
+            self.khasra_landowners[khasra] = landowners | survey.landowner_ids
+        self.khasras = sorted(self.khasra_area)
+
+
 class Section21Notification(models.Model):
     _name = 'bhu.section21.notification'
     _description = 'Section 21 Notification / धारा 21 अधिसूचना'
@@ -135,42 +156,38 @@ class Section21Notification(models.Model):
                 record.khasra_numbers = ''
                 record.khasra_count = 0
     
-    def _get_approved_surveys_data(self):
-        """Get approved/locked survey data grouped by khasra number with total area and landowner info"""
+    def _get_survey_snapshot(self):
+        """Approved/locked survey snapshot for the report helpers, loaded with a single search.
+
+        Built fresh on every call; callers needing it twice pass it along.
+        """
         self.ensure_one()
-        if not self.village_id or not self.project_id:
-            return []
         surveys = self.env['bhu.survey'].search([
             ('village_id', '=', self.village_id.id),
             ('project_id', '=', self.project_id.id),
+            ('khasra_number', '!=', False),
             ('state', 'in', ['approved', 'locked'])
-        ], order='khasra_number')
-        khasra_data = {}
-        for survey in surveys:
-            if survey.khasra_number:
-                if survey.khasra_number not in khasra_data:
-                    khasra_data[survey.khasra_number] = {
-                        'area': 0.0,
-                        'landowner': False,
-                        'landowner_name': '',
-                        'landowner_father': '',
-                        'landowner_address': ''
-                    }
-                khasra_data[survey.khasra_number]['area'] += survey.acquired_area or 0.0
-                # Get first landowner if available
-                if survey.landowner_ids and not khasra_data[survey.khasra_number]['landowner']:
-                    landowner = survey.landowner_ids[0]
-                    khasra_data[survey.khasra_number]['landowner'] = landowner
-                    khasra_data[survey.khasra_number]['landowner_name'] = landowner.name or ''
-                    khasra_data[survey.khasra_number]['landowner_father'] = landowner.father_name or landowner.spouse_name or ''
-                    khasra_data[survey.khasra_number]['landowner_address'] = landowner.owner_address or ''
-        return [{
-            'khasra_number': k,
-            'area': v['area'],
-            'landowner_name': v['landowner_name'],
-            'landowner_father': v['landowner_father'],
-            'landowner_address': v['landowner_address']
-        } for k, v in sorted(khasra_data.items())]
+        ], order='khasra_number, create_date desc, id desc')
+        return Section21SurveySnapshot(surveys)
+
+    def _get_approved_surveys_data(self, snapshot=None):
+        """Get approved/locked survey data grouped by khasra number with total area and landowner info"""
+        self.ensure_one()
+        if not self.village_id or not self.project_id:
+            return []
+        snapshot = snapshot or self._get_survey_snapshot()
+        result = []
+        for khasra in snapshot.khasras:
+            # First landowner of the khasra, if available
+            landowner = snapshot.khasra_landowners[khasra][:1]
+            result.append({
+                'khasra_number': khasra,
+                'area': snapshot.khasra_area[khasra],
+                'landowner_name': landowner.name or '',
+                'landowner_father': landowner.father_name or landowner.spouse_name or '',
+                'landowner_address': landowner.owner_address or '',
+            })
+        return result
     
     # Survey-related fields (similar to Section 4)
     survey_ids = fields.Many2many('bhu.survey', compute='_compute_survey_ids', string='Surveys', readonly=True)
@@ -375,36 +392,17 @@ class Section21Notification(models.Model):
     
 
     
-    def _get_khasra_landowner_mapping(self):
+    def _get_khasra_landowner_mapping(self, snapshot=None):
         """Get mapping of khasra numbers to landowners directly from surveys (no land parcel dependency)"""
         self.ensure_one()
         if not self.village_id or not self.project_id:
             return []
         
-        # Find all approved/locked surveys for this village/project with khasra numbers
-        surveys = self.env['bhu.survey'].search([
-            ('village_id', '=', self.village_id.id),
-            ('project_id', '=', self.project_id.id),
-            ('khasra_number', '!=', False),
-            ('state', 'in', ['approved', 'locked']),
-        ])
-        
-        # Create mapping: khasra_number -> list of landowners (ensure at least one entry per khasra)
-        khasra_landowner_map = {}
-        for survey in surveys:
-            khasra = survey.khasra_number
-            if not khasra:
-                continue
-            if khasra not in khasra_landowner_map:
-                khasra_landowner_map[khasra] = []
-            for landowner in survey.landowner_ids:
-                if landowner.id not in [lo.id for lo in khasra_landowner_map[khasra]]:
-                    khasra_landowner_map[khasra].append(landowner)
-            # If no landowner linked, keep an empty list (handled below)
+        snapshot = snapshot or self._get_survey_snapshot()
         
         # Convert to list of tuples: (khasra_number, landowner or False)
         result = []
-        for khasra, landowners in khasra_landowner_map.items():
+        for khasra, landowners in snapshot.khasra_landowners.items():
             if landowners:
                 for landowner in landowners:
                     result.append((khasra, landowner))
@@ -412,8 +410,6 @@ class Section21Notification(models.Model):
                 # No landowner for this khasra, still return a placeholder to generate notice
                 result.append((khasra, False))
         
-                result.append((khasra, False))
-        
         return result
     
     # -------------------------------------------------------------------------
@@ -437,50 +433,21 @@ class Section21Notification(models.Model):
         self.ensure_one()
         
         # Get khasra-landowner mapping
-        khasra_landowner_mapping = self._get_khasra_landowner_mapping()
-        
-        # Helper to get area for a khasra
-        def get_khasra_area(khasra_num):
-            surveys = self.env['bhu.survey'].search([
-                ('village_id', '=', self.village_id.id),
-                ('project_id', '=', self.project_id.id),
-                ('khasra_number', '=', khasra_num),
-                ('state', 'in', ['approved', 'locked'])
-            ])
-            return sum(s.acquired_area or 0.0 for s in surveys)
+        snapshot = self._get_survey_snapshot() if self.village_id and self.project_id else None
+        khasra_landowner_mapping = self._get_khasra_landowner_mapping(snapshot=snapshot)
+        khasra_area = snapshot.khasra_area if khasra_landowner_mapping else {}
 
         personal_data_list = []
-        
-        # If no mapping, check if we simply have khasras without landowners
-        if not khasra_landowner_mapping:
-             surveys = self.env['bhu.survey'].search([
-                ('village_id', '=', self.village_id.id),
-                ('project_id', '=', self.project_id.id),
-                ('state', 'in', ['approved', 'locked']),
-                ('khasra_number', '!=', False)
-            ])
-             unique_khasras = list(set(surveys.mapped('khasra_number')))
-             for khasra in unique_khasras:
-                 personal_data_list.append({
-                     'khasra_number': khasra,
-                     'area': get_khasra_area(khasra),
-                     'landowner_name': '',
-                     'landowner_father': '',
-                     'landowner_address': '',
-                     # Add notification UUID for QR code generation if needed in loop
-                     'notification_uuid': self.notification_uuid
-                 })
-        else:
-            for khasra, landowner in khasra_landowner_mapping:
-                data = {
-                    'khasra_number': khasra,
-                    'area': get_khasra_area(khasra),
-                    'landowner_name': landowner.name if landowner else '',
-                    'landowner_father': (landowner.father_name or landowner.spouse_name) if landowner else '',
-                    'landowner_address': landowner.owner_address if landowner else '',
-                    'notification_uuid': self.notification_uuid
-                }
-                personal_data_list.append(data)
+        for khasra, landowner in khasra_landowner_mapping:
+            data = {
+                'khasra_number': khasra,
+                'area': khasra_area[khasra],
+                'landowner_name': landowner.name if landowner else '',
+                'landowner_father': (landowner.father_name or landowner.spouse_name) if landowner else '',
+                'landowner_address': landowner.owner_address if landowner else '',
+                'notification_uuid': self.notification_uuid
+            }
+            personal_data_list.append(data)
         
         # Sort by khasra number
         try:
@@ -91,7 +91,15 @@ class Section8(models.Model):
                     # No project_id, use fallback
                     sequence = self.env['ir.sequence'].next_by_code('bhu.section8') or 'New'
                     vals['name'] = f'SEC8-{sequence}'
-        return super().create(vals_list)
+        records = super().create(vals_list)
+        self.env['bhuarjan.dashboard.helpers']._invalidate_dashboard_counts(self._name)
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        if 'state' in vals:
+            self.env['bhuarjan.dashboard.helpers']._invalidate_dashboard_counts(self._name)
+        return result
     
     def action_approve(self):
         """Open wizard to approve Section 8"""
@@ -5,13 +5,35 @@ Common utilities for PDF and Excel generation that can be used by both web inter
 """
 from odoo import models, api
 from odoo.exceptions import UserError
+from odoo.modules.registry import Registry
+from odoo.tools.pdf import PdfFileReader, PdfFileWriter
+from concurrent.futures import ThreadPoolExecutor
 import io
 import re
 import logging
+import tempfile
+import threading
 from urllib.parse import quote
 
+from ..xlsx_export import XlsxExport
+
 _logger = logging.getLogger(__name__)
 
+# Bulk Form 10 PDFs are rendered FORM10_PDF_CHUNK_SIZE surveys at a time, with
+# at most FORM10_PDF_WORKERS wkhtmltopdf processes running per request. Merged
+# output stays in memory up to FORM10_PDF_SPOOL_SIZE, then goes to a temp file.
+FORM10_PDF_CHUNK_SIZE = 150
+FORM10_PDF_WORKERS = 3
+FORM10_PDF_SPOOL_SIZE = 16 * 1024 * 1024
+
+
+def _render_form10_chunk_isolated(dbname, uid, res_ids, serial_offset):
+    """Render one chunk in its own cursor; runs in a pool thread."""
+    threading.current_thread().dbname = dbname
+    with Registry(dbname).cursor() as cr:
+        env = api.Environment(cr, uid, {'lang': 'en_US', 'tz': 'UTC'})
+        return env['form10.export.utils']._render_form10_chunk(res_ids, serial_offset)
+
 try:
     import xlsxwriter
     HAS_XLSXWRITER = True
@@ -58,17 +80,8 @@ class Form10ExportUtils(models.AbstractModel):
         return surveys
 
     @api.model
-    def generate_form10_pdf(self, surveys):
-        """
-        Generate Form 10 PDF using Odoo's report system
-        Args:
-            surveys: Recordset of surveys
-        Returns:
-            bytes: PDF data
-        """
-        if not surveys:
-            raise UserError("No surveys found.")
-        
+    def _get_form10_report_action(self):
+        """Form 10 bulk table report action (sudo)"""
         # Get the Form 10 bulk table report using env.ref (bypasses permission checks)
         try:
             report_action = self.env.ref('bhuarjan.action_report_form10_bulk_table').sudo()
@@ -81,28 +94,30 @@ class Form10ExportUtils(models.AbstractModel):
             # env.ref raises ValueError if XML ID not found
             _logger.error(f"Form 10 PDF: Report XML ID not found: {str(ve)}", exc_info=True)
             raise UserError("Form 10 report not found. Please ensure the report is properly installed.")
+        except UserError:
+            raise
         except Exception as e:
             _logger.error(f"Form 10 PDF: Error getting report action: {str(e)}", exc_info=True)
             raise UserError(f"Error accessing report: {str(e)}")
+        return report_action
 
-        # Convert surveys to list of IDs for PDF rendering
-        res_ids = [int(sid) for sid in surveys.ids]
-        
-        if not res_ids:
-            raise UserError("No survey IDs found.")
-        
-        _logger.info(f"Form 10 PDF: Rendering PDF for {len(res_ids)} surveys")
-
-        # Generate PDF with error handling
+    @api.model
+    def _render_form10_chunk(self, res_ids, serial_offset=0):
+        """
+        Render one chunk of the Form 10 bulk table
+        Args:
+            res_ids: Survey IDs of the chunk
+            serial_offset: Number of surveys in earlier chunks (keeps S.No. continuous)
+        Returns:
+            bytes: PDF data
+        """
+        report_action = self._get_form10_report_action()
         report_name = report_action.report_name
         try:
-            pdf_result = report_action.sudo().with_context(
+            pdf_result = report_action.with_context(
                 lang='en_US',
                 tz='UTC'
-            )._render_qweb_pdf(report_name, res_ids, data={})
-        except MemoryError as mem_error:
-            _logger.error(f"Form 10 PDF: Memory error during PDF generation: {str(mem_error)}")
-            raise UserError("PDF generation failed due to memory constraints. Please reduce the number of surveys or contact administrator.")
+            )._render_qweb_pdf(report_name, res_ids, data={'form10_serial_offset': serial_offset})
         except Exception as render_error:
             _logger.error(f"Form 10 PDF: PDF rendering failed: {str(render_error)}", exc_info=True)
             raise UserError(f"Error generating PDF: {str(render_error)}")
@@ -122,6 +137,111 @@ class Form10ExportUtils(models.AbstractModel):
 
         return pdf_data
 
+    @api.model
+    def generate_form10_pdf_file(self, surveys):
+        """
+        Generate Form 10 PDF into a spooled temporary file
+        
+        Surveys are rendered in chunks of FORM10_PDF_CHUNK_SIZE by a bounded
+        pool of threads, each with its own cursor and wkhtmltopdf process
+        (in this cursor while the transaction has uncommitted writes).
+        Chunks are appended to the merged document in order as they finish,
+        and only FORM10_PDF_WORKERS chunks are ever pending.
+        Args:
+            surveys: Recordset of surveys
+        Returns:
+            tuple: (file object positioned at 0, size in bytes); caller closes it
+        """
+        if not surveys:
+            raise UserError("No surveys found.")
+
+        # Convert surveys to list of IDs for PDF rendering
+        res_ids = [int(sid) for sid in surveys.ids]
+        
+        if not res_ids:
+            raise UserError("No survey IDs found.")
+
+        # Fail early (in this cursor) when the report is missing
+        self._get_form10_report_action()
+
+        chunks = [res_ids[i:i + FORM10_PDF_CHUNK_SIZE] for i in range(0, len(res_ids), FORM10_PDF_CHUNK_SIZE)]
+        _logger.info(f"Form 10 PDF: Rendering PDF for {len(res_ids)} surveys in {len(chunks)} chunk(s)")
+
+        output = tempfile.SpooledTemporaryFile(max_size=FORM10_PDF_SPOOL_SIZE)
+        try:
+            if len(chunks) == 1:
+                output.write(self._render_form10_chunk(res_ids))
+            else:
+                self._merge_form10_chunks(chunks, output)
+        except Exception:
+            output.close()
+            raise
+        size = output.tell()
+        output.seek(0)
+        return output, size
+
+    @api.model
+    def _merge_form10_chunks(self, chunks, output):
+        """Render ``chunks`` and write the merged PDF to ``output``."""
+        offsets = [sum(len(chunk) for chunk in chunks[:index]) for index in range(len(chunks))]
+        writer = PdfFileWriter()
+        for chunk_pdf in self._iter_form10_chunk_pdfs(chunks, offsets):
+            reader = PdfFileReader(io.BytesIO(chunk_pdf), strict=False)
+            for page in range(reader.getNumPages()):
+                writer.addPage(reader.getPage(page))
+            del chunk_pdf
+        writer.write(output)
+
+    @api.model
+    def _iter_form10_chunk_pdfs(self, chunks, offsets):
+        """PDF of each chunk, in document order.
+
+        Chunks render in parallel in pool threads with their own cursors,
+        which only see committed data; flushing does not commit. When this
+        transaction has uncommitted writes they render one by one in this
+        cursor instead, so the PDF matches what the caller sees.
+        """
+        self.env.flush_all()
+        self.env.cr.execute("SELECT txid_current_if_assigned()")
+        if self.env.cr.fetchone()[0] is not None:
+            _logger.info("Form 10 PDF: uncommitted writes, rendering %s chunks in this cursor", len(chunks))
+            for chunk, offset in zip(chunks, offsets):
+                yield self._render_form10_chunk(chunk, offset)
+            return
+
+        dbname, uid = self.env.cr.dbname, self.env.uid
+        with ThreadPoolExecutor(max_workers=FORM10_PDF_WORKERS, thread_name_prefix='form10_pdf') as pool:
+            pending = []
+            next_chunk = 0
+            try:
+                while next_chunk < len(chunks) or pending:
+                    # Keep at most FORM10_PDF_WORKERS chunks in flight
+                    while next_chunk < len(chunks) and len(pending) < FORM10_PDF_WORKERS:
+                        pending.append(pool.submit(
+                            _render_form10_chunk_isolated,
+                            dbname, uid, chunks[next_chunk], offsets[next_chunk],
+                        ))
+                        next_chunk += 1
+                    # Merge in document order; later chunks keep rendering meanwhile
+                    yield pending.pop(0).result()
+            finally:
+                # Failed or abandoned merge: drop the chunks not started yet
+                for future in pending:
+                    future.cancel()
+
+    @api.model
+    def generate_form10_pdf(self, surveys):
+        """
+        Generate Form 10 PDF using Odoo's report system
+        Args:
+            surveys: Recordset of surveys
+        Returns:
+            bytes: PDF data
+        """
+        pdf_file, _size = self.generate_form10_pdf_file(surveys)
+        with pdf_file:
+            return pdf_file.read()
+
     @api.model
     def generate_form10_excel(self, surveys):
         """
@@ -131,14 +251,26 @@ class Form10ExportUtils(models.AbstractModel):
         Returns:
             bytes: Excel file data
         """
+        excel_file, _size = self.generate_form10_excel_file(surveys)
+        with excel_file:
+            return excel_file.read()
+
+    @api.model
+    def generate_form10_excel_file(self, surveys):
+        """
+        Generate the Form 10 Excel file on disk (streamed, see ``XlsxExport``)
+        Args:
+            surveys: Recordset of surveys
+        Returns:
+            tuple: (file object positioned at the start, size in bytes)
+        """
         if not HAS_XLSXWRITER:
             raise UserError("xlsxwriter library is required for Excel export. Please install it: pip install xlsxwriter")
         
         if not surveys:
             raise UserError("No surveys found.")
         
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+        workbook = XlsxExport()
         worksheet = workbook.add_worksheet('Form 10')
         
         # Define formats
@@ -455,9 +587,7 @@ class Form10ExportUtils(models.AbstractModel):
         worksheet.set_column(12, 17, 15)  # Asset + remarks columns
         worksheet.set_column(18, 20, 14)  # Survey type / distance / fallow
         
-        workbook.close()
-        output.seek(0)
-        return output.read()
+        return workbook.close()
 
     @api.model
     def sanitize_filename(self, name, max_length=80):
@@ -2,18 +2,26 @@ from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 import uuid
 import logging
+from collections import defaultdict
 from datetime import datetime, timezone
+from itertools import zip_longest
 
 _logger = logging.getLogger(__name__)
 
 
+def normalize_khasra(khasra_number):
+    """Case/space-insensitive khasra key shared by surveys and payment file lines."""
+    return (khasra_number or '').strip().lower() or False
+
+
 class Survey(models.Model):
     _name = 'bhu.survey'
     _inherit = ['bhu.qr.code.mixin']
     _description = 'Survey (सर्वे)'
-    _inherit = ['mail.thread', 'mail.activity.mixin', 'bhu.qr.code.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'bhu.qr.code.mixin', 'bhu.sync.tracked.mixin']
     # Show latest surveys first everywhere (kanban, list, search)
     _order = 'create_date desc, id desc'
+    _sync_village_field = 'village_id'
 
 
     @api.model
@@ -60,7 +68,10 @@ class Survey(models.Model):
         ('payment_under_process', 'Payment Under Process'),
         ('payment_done', 'Payment Done'),
         ('payment_failed', 'Payment Failed'),
-    ], string='Payment Status', compute='_compute_payment_status', readonly=True, tracking=True)
+    ], string='Payment Status', compute='_compute_payment_status', store=True, readonly=True,
+        index=True)
+    khasra_key = fields.Char(string='Khasra Key', compute='_compute_khasra_key', store=True, index=True,
+                             help='Normalized khasra number used to match payment file lines.')
     
     @api.onchange('project_id')
     def _onchange_project_id(self):
@@ -146,7 +157,12 @@ class Survey(models.Model):
             threshold = 50.0 if survey_type == 'rural' else 20.0
             rec.sudo().write({'is_within_distance_for_award': distance <= threshold})
 
-    @api.depends('payment_status_line_ids.status', 'khasra_number', 'project_id', 'village_id')
+    @api.depends('khasra_number')
+    def _compute_khasra_key(self):
+        for rec in self:
+            rec.khasra_key = normalize_khasra(rec.khasra_number)
+
+    @api.depends('payment_status_line_ids.status', 'khasra_key', 'project_id', 'village_id')
     def _compute_payment_status(self):
         """Reflect live payment lifecycle for each survey/khasra.
 
@@ -155,35 +171,57 @@ class Survey(models.Model):
         2) All available reconciled statuses paid => Payment Done
         3) Any pending/partial status OR payment file generated => Payment Under Process
         4) Otherwise => New
+
+        Stored: payment file lines trigger the recompute of their surveys
+        (see ``bhu.payment.file.line._payment_status_survey_keys``), and the
+        payment file line lookup is a single grouped query for the batch.
         """
-        PaymentFileLine = self.env['bhu.payment.file.line']
+        pending = self.browse()
         for rec in self:
             statuses = set(rec.payment_status_line_ids.mapped('status'))
 
             if 'failed' in statuses:
                 rec.payment_status = 'payment_failed'
-                continue
-
-            if statuses and statuses.issubset({'paid'}):
+            elif statuses and statuses.issubset({'paid'}):
                 rec.payment_status = 'payment_done'
-                continue
-
-            if statuses:
+            elif statuses:
                 rec.payment_status = 'payment_under_process'
-                continue
+            else:
+                pending |= rec
+
+        # No reconciliation status lines yet:
+        # if present in a payment file, treat as under process; else new.
+        with_line = set()
+        keyed = pending.filtered(lambda r: r.khasra_key and r.project_id and r.village_id)
+        if keyed:
+            groups = self.env['bhu.payment.file.line'].sudo()._read_group(
+                [
+                    ('khasra_key', 'in', list(set(keyed.mapped('khasra_key')))),
+                    ('project_id', 'in', keyed.project_id.ids),
+                    ('village_id', 'in', keyed.village_id.ids),
+                ],
+                ['khasra_key', 'project_id', 'village_id'],
+                ['__count'],
+            )
+            with_line = {(key, project.id, village.id) for key, project, village, _count in groups}
+        for rec in pending:
+            key = (rec.khasra_key, rec.project_id.id, rec.village_id.id)
+            rec.payment_status = 'payment_under_process' if key in with_line else 'new'
 
-            # No reconciliation status lines yet:
-            # if present in a payment file, treat as under process; else new.
-            has_payment_line = False
-            if rec.khasra_number and rec.project_id and rec.village_id:
-                has_payment_line = bool(PaymentFileLine.search_count([
-                    ('khasra_number', '=ilike', rec.khasra_number.strip()),
-                    ('payment_file_id.project_id', '=', rec.project_id.id),
-                    ('payment_file_id.village_id', '=', rec.village_id.id),
-                ]))
+    @api.model
+    def _recompute_payment_status_for_keys(self, keys):
+        """Mark surveys matching ``{(khasra_key, project_id, village_id)}`` for recompute."""
+        keys = {key for key in keys if all(key)}
+        if not keys:
+            return
+        surveys = self.sudo().search([
+            ('khasra_key', 'in', list({k[0] for k in keys})),
+            ('project_id', 'in', list({k[1] for k in keys})),
+            ('village_id', 'in', list({k[2] for k in keys})),
+        ]).filtered(lambda s: (s.khasra_key, s.project_id.id, s.village_id.id) in keys)
+        if surveys:
+            self.env.add_to_compute(self._fields['payment_status'], surveys)
 
-            rec.payment_status = 'payment_under_process' if has_payment_line else 'new'
-    
     # Rate Permutations for Village (read-only, computed)
     rate_permutation_ids = fields.One2many('bhu.rate.master.permutation.line', 'survey_id', 
                                            string='Rate Permutations', readonly=True, 
@@ -547,68 +585,79 @@ class Survey(models.Model):
     
     @api.model_create_multi
     def create(self, vals_list):
-        """Generate automatic survey numbers using bhuarjan settings master"""
+        """Generate automatic survey numbers using bhuarjan settings master
+
+        Numbers are reserved per project+village in one block, the award
+        distance flag is set in the create values and the creation chatter
+        notes are inserted in one batch, so large imports stay fast.
+        """
+        # Check if sequence settings exist for survey process (global settings, no project dependency)
+        sequence_settings = self.env['bhuarjan.sequence.settings'].search([
+            ('process_name', '=', 'survey'),
+            ('active', '=', True)
+        ], limit=1)
+        default_survey_type = self.default_get(['survey_type']).get('survey_type')
+        to_number = defaultdict(list)
         for vals in vals_list:
             # If state is explicitly set to 'submitted' (e.g., from API), set submitted_date
             # Otherwise, default to 'draft' for web UI
             if vals.get('state') == 'submitted' and 'submitted_date' not in vals:
-                from datetime import datetime, timezone
                 vals['submitted_date'] = datetime.now(timezone.utc).replace(tzinfo=None)
-            
+
+            # API/import: onchange does not fire, derive the award distance flag here
+            if 'distance_from_main_road' in vals or 'survey_type' in vals:
+                distance = vals.get('distance_from_main_road') or 0.0
+                survey_type = vals.get('survey_type', default_survey_type)
+                threshold = 50.0 if survey_type == 'rural' else 20.0
+                vals['is_within_distance_for_award'] = distance <= threshold
+
             if vals.get('name', 'New') == 'New':
-                # Check if project_id is available
-                if vals.get('project_id'):
-                    project = self.env['bhu.project'].browse(vals['project_id'])
-                    project_code = project.code or project.name or 'PROJ'
-                    
-                    # Check if sequence settings exist for survey process (global settings, no project dependency)
-                    sequence_settings = self.env['bhuarjan.sequence.settings'].search([
-                        ('process_name', '=', 'survey'),
-                        ('active', '=', True)
-                    ], limit=1)
-                    
-                    if sequence_settings:
-                        # Get village_id if available
-                        village_id = vals.get('village_id')
-                        
-                        # Generate sequence number using settings master (placeholders already replaced)
-                        sequence_number = self.env['bhuarjan.settings.master'].get_sequence_number(
-                            'survey', vals['project_id'], village_id=village_id
-                        )
-                        if sequence_number:
-                            vals['name'] = sequence_number
-                        else:
-                            # Fallback to default naming if sequence generation fails
-                            sequence = self.env['ir.sequence'].next_by_code('bhu.survey') or '001'
-                            vals['name'] = f'SC_{project_code}_{sequence.zfill(3)}'
-                    else:
-                        # No sequence settings found, use fallback naming
-                        sequence = self.env['ir.sequence'].next_by_code('bhu.survey') or '001'
-                        vals['name'] = f'SC_{project_code}_{sequence.zfill(3)}'
+                to_number[(vals.get('project_id') or False, vals.get('village_id') or False)].append(vals)
+
+        for (project_id, village_id), group in to_number.items():
+            sequence_numbers = []
+            if project_id and sequence_settings:
+                # Generate sequence numbers using settings master (placeholders already replaced)
+                sequence_numbers = self.env['bhuarjan.settings.master'].get_sequence_numbers(
+                    'survey', project_id, village_id=village_id, count=len(group)
+                )
+            project_code = 'PROJ'
+            if project_id:
+                project = self.env['bhu.project'].browse(project_id)
+                project_code = project.code or project.name or 'PROJ'
+            for vals, sequence_number in zip_longest(group, sequence_numbers):
+                if vals is None:
+                    break
+                if sequence_number:
+                    vals['name'] = sequence_number
                 else:
-                    # No project_id, use default naming
+                    # Fallback to default naming if no settings or sequence generation fails
                     sequence = self.env['ir.sequence'].next_by_code('bhu.survey') or '001'
-                    vals['name'] = f'SC_PROJ_{sequence.zfill(3)}'
-        
+                    vals['name'] = f'SC_{project_code}_{sequence.zfill(3)}'
+
         records = super(Survey, self).create(vals_list)
         # Log creation
-        for record, vals in zip(records, vals_list):
-            record._sync_within_distance_from_metres(vals)
-            record.message_post(
-                body=_('Survey created by %s') % self.env.user.name,
-                message_type='notification'
+        if records:
+            body = _('Survey created by %s') % self.env.user.name
+            records._message_log_batch(
+                bodies={record.id: body for record in records},
+                message_type='notification',
             )
+        self.env['bhuarjan.dashboard.helpers']._invalidate_dashboard_counts(self._name)
         return records
 
     def write(self, vals):
         result = super(Survey, self).write(vals)
         if 'distance_from_main_road' in vals or 'survey_type' in vals:
             self._sync_within_distance_from_metres(vals)
+        # State buckets and the survey_date trend are cached on the dashboard
+        if any(f in vals for f in ('state', 'survey_date', 'company_id', 'project_id', 'village_id')):
+            self.env['bhuarjan.dashboard.helpers']._invalidate_dashboard_counts(self._name)
         return result
     
     def unlink(self):
         """Override unlink to reset sequence counter after deletion"""
-        # Store project_id and village_id before deletion
+        # Store project_id, village_id and the deleted names before deletion
         project_village_map = {}
         for record in self:
             if record.project_id and record.village_id:
@@ -619,10 +668,13 @@ class Survey(models.Model):
                         'village_id': record.village_id.id,
                         'project_code': record.project_id.code or record.project_id.name or 'PROJ',
                         'village_code': record.village_id.village_code if record.village_id.village_code else '',
+                        'names': [],
                     }
+                project_village_map[key]['names'].append(record.name or '')
         
         # Delete the records
         result = super(Survey, self).unlink()
+        self.env['bhuarjan.dashboard.helpers']._invalidate_dashboard_counts('bhu.survey')
         
         # After deletion, update sequence counters for affected project+village combinations
         for key, info in project_village_map.items():
@@ -630,13 +682,14 @@ class Survey(models.Model):
                 info['project_id'],
                 info['village_id'],
                 info['project_code'],
-                info['village_code']
+                info['village_code'],
+                deleted_names=info['names'],
             )
         
         return result
     
-    def _reset_sequence_after_deletion(self, project_id, village_id, project_code, village_code):
-        """Reset sequence counter based on highest remaining sequence number"""
+    def _reset_sequence_after_deletion(self, project_id, village_id, project_code, village_code, deleted_names=None):
+        """Rewind the survey counter when the highest sequence number was deleted"""
         # Check if sequence settings exist
         sequence_setting = self.env['bhuarjan.sequence.settings'].search([
             ('process_name', '=', 'survey'),
@@ -652,24 +705,23 @@ class Survey(models.Model):
         sequence_prefix = sequence_prefix.replace('{PROJ_CODE}', project_code)
         sequence_prefix = sequence_prefix.replace('{bhu.village.code}', village_code)
         
-        # Get the last sequence number from existing records
-        next_seq_number = self.env['bhuarjan.settings.master']._get_last_sequence_number(
-            'bhu.survey',
+        # Only numbers of this prefix can affect the counter
+        numbers = set()
+        for name in deleted_names or []:
+            suffix = name[len(sequence_prefix):] if name.startswith(sequence_prefix) else ''
+            if suffix.isascii() and suffix.isdigit():
+                numbers.add(int(suffix))
+        if not numbers:
+            return
+        
+        self.env['bhuarjan.sequence.counter']._release_numbers(
+            'survey',
+            project_id,
+            village_id,
             sequence_prefix,
-            project_id=project_id,
-            village_id=village_id,
-            initial_seq=sequence_setting.initial_sequence
+            numbers,
+            initial_seq=sequence_setting.initial_sequence,
         )
-        
-        # Update the ir.sequence counter
-        sequence_code = f'bhuarjan.survey.{project_id}.{village_id}'
-        ir_sequence = self.env['ir.sequence'].search([
-            ('code', '=', sequence_code)
-        ], limit=1)
-        
-        if ir_sequence:
-            # Set counter to next_seq_number (which is already last + 1)
-            ir_sequence.write({'number_next': next_seq_number})
     
     @api.constrains('khasra_number', 'village_id')
     def _check_unique_khasra_per_village(self):
@@ -1103,6 +1155,20 @@ class SurveyTreeLine(models.Model):
         self.ensure_one()
         return 6000.0 if self.tree_type == 'fruit_bearing' else 177.0
 
+    def _get_applicable_rates(self):
+        """``{line id: per-tree rate}`` for the whole recordset, without a query per line."""
+        index = self.env['bhu.tree.rate.master']._get_rate_index()
+        rates = {}
+        for line in self:
+            if not line.tree_master_id:
+                rate = None
+            elif line.tree_type == 'fruit_bearing':
+                rate = line.tree_master_id.fruit_rate
+            else:
+                rate = index.lookup(line.tree_master_id.id, line.development_stage, line.girth_cm or 0.0)
+            rates[line.id] = rate or line._fallback_rate()
+        return rates
+
     def get_applicable_rate(self):
         """Return the applicable per-tree rate from ``bhu.tree.rate.master``.
 
@@ -1110,28 +1176,10 @@ class SurveyTreeLine(models.Model):
         For non-fruit-bearing trees, looked up by tree_master_id + development_stage + girth range.
         Falls back to a coarse rate when no master entry matches, so callers
         (award simulator, Section 23 report, downloads) never crash.
+        Use ``_get_applicable_rates`` to rate many lines at once.
         """
         self.ensure_one()
-        if not self.tree_master_id:
-            return self._fallback_rate()
-        if self.tree_type == 'fruit_bearing':
-            return self.tree_master_id.fruit_rate or self._fallback_rate()
-        domain = [
-            ('tree_master_id', '=', self.tree_master_id.id),
-            ('active', '=', True),
-        ]
-        if self.development_stage:
-            domain.append(('development_stage', '=', self.development_stage))
-        rates = self.env['bhu.tree.rate.master'].search(domain)
-        if not rates:
-            return self._fallback_rate()
-        girth = self.girth_cm or 0.0
-        for rate in rates:
-            lo = rate.girth_range_min or 0.0
-            hi = rate.girth_range_max
-            if girth >= lo and (not hi or girth <= hi):
-                return rate.rate or self._fallback_rate()
-        return rates[0].rate or self._fallback_rate()
+        return self._get_applicable_rates()[self.id]
 
 
 class SurveyLine(models.Model):
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Deletion log for the mobile delta sync (``/api/bhuarjan/sync``).
+
+Models synced to the app inherit ``bhu.sync.tracked.mixin``: deleting a
+record, or moving it to another village, leaves a tombstone so a device that
+synced it earlier can drop its local copy.
+"""
+from odoo import api, fields, models
+
+
+class SyncTombstone(models.Model):
+    _name = 'bhu.sync.tombstone'
+    _description = 'Mobile Sync Tombstone'
+    _order = 'id'
+
+    res_model = fields.Char(string='Model', required=True, index=True)
+    res_id = fields.Integer(string='Record ID', required=True)
+    village_id = fields.Integer(string='Village ID', index=True,
+                                help='Village the record belonged to; empty for global masters.')
+
+    @api.autovacuum
+    def _gc_old_tombstones(self):
+        """Devices that have not synced for 90 days do a full sync anyway."""
+        self.env.cr.execute("""
+            DELETE FROM bhu_sync_tombstone
+             WHERE create_date < (now() at time zone 'UTC') - interval '90 days'
+        """)
+
+
+class SyncTrackedMixin(models.AbstractModel):
+    _name = 'bhu.sync.tracked.mixin'
+    _description = 'Mobile Sync Tracked Record'
+
+    # Field scoping records to a village for patwari devices (None: global master).
+    _sync_village_field = None
+
+    def _sync_record_tombstones(self):
+        village_field = self._sync_village_field
+        vals_list = [{
+            'res_model': self._name,
+            'res_id': record.id,
+            'village_id': record[village_field].id if village_field else False,
+        } for record in self]
+        if vals_list:
+            self.env['bhu.sync.tombstone'].sudo().create(vals_list)
+
+    def write(self, vals):
+        village_field = self._sync_village_field
+        if village_field and village_field in vals:
+            moved = self.filtered(lambda r: r[village_field] and r[village_field].id != vals[village_field])
+            moved._sync_record_tombstones()
+        return super().write(vals)
+
+    def unlink(self):
+        self._sync_record_tombstones()
+        return super().unlink()
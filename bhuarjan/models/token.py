@@ -1,5 +1,41 @@
-from odoo import models, fields
+from odoo import api, models, fields
 import datetime
+import hashlib
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import jwt
+
+# Verified API tokens, per worker: (db, sha256(token)) -> TokenInfo, LRU-bounded and
+# dropped at the token's expiry. Revoking a token or changing its user evicts
+# the entry in this worker once the transaction commits, and bumps the
+# TOKEN_CACHE_SIGNAL sequence so the other workers drop their entries for the
+# database on their next API request (clearing the registry ormcache instead
+# would hit all workers on every logout). Entries are re-checked after the TTL.
+TOKEN_CACHE_SIZE = 4096
+TOKEN_CACHE_TTL_SECONDS = 60
+TOKEN_CACHE_SIGNAL = 'bhu_jwt_token_cache_signal'
+# res.users fields copied into the cache entry
+TOKEN_USER_FIELDS = {'active', 'bhuarjan_role', 'village_ids'}
+
+TokenInfo = namedtuple('TokenInfo', 'user_id role village_ids expires_at checked_at')
+
+_token_cache = OrderedDict()
+# db -> TOKEN_CACHE_SIGNAL value the entries of that db were checked against
+_token_cache_signals = {}
+_token_cache_lock = threading.Lock()
+
+
+def _token_key(dbname, token):
+    return dbname, hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def _evict(predicate):
+    with _token_cache_lock:
+        for key in [k for k, info in _token_cache.items() if predicate(k, info)]:
+            del _token_cache[key]
+
 
 class JWTToken(models.Model):
     _name = 'jwt.token'
@@ -7,6 +43,86 @@ class JWTToken(models.Model):
     _order = 'create_date desc'
 
     user_id = fields.Many2one('res.users', string='User', required=True)
-    token = fields.Char(string='Token', required=True)
+    token = fields.Char(string='Token', required=True, index=True)
 
     create_date = fields.Datetime(string='Created On', readonly=True)
+
+    def init(self):
+        self.env.cr.execute(f"CREATE SEQUENCE IF NOT EXISTS {TOKEN_CACHE_SIGNAL}")
+
+    @api.model
+    def _resolve_token(self, token):
+        """Return the ``TokenInfo`` of an issued, unexpired API token.
+
+        Raises ``jwt.ExpiredSignatureError`` / ``jwt.InvalidTokenError``.
+        """
+        dbname = self.env.cr.dbname
+        key = _token_key(dbname, token)
+        now = time.time()
+        self.env.cr.execute(f"SELECT last_value FROM {TOKEN_CACHE_SIGNAL}")
+        signal = self.env.cr.fetchone()[0]
+        with _token_cache_lock:
+            if _token_cache_signals.get(dbname) != signal:
+                # Another worker revoked a token or changed a user
+                for stale_key in [k for k in _token_cache if k[0] == dbname]:
+                    del _token_cache[stale_key]
+                _token_cache_signals[dbname] = signal
+            info = _token_cache.get(key)
+            if info is not None:
+                if info.expires_at <= now:
+                    del _token_cache[key]
+                    raise jwt.ExpiredSignatureError('Signature has expired')
+                if now - info.checked_at < TOKEN_CACHE_TTL_SECONDS:
+                    _token_cache.move_to_end(key)
+                    return info
+
+        claims = jwt.decode(token, options={"verify_signature": False, "verify_exp": True})
+        record = self.sudo().search([('token', '=', token)], limit=1)
+        user = record.user_id
+        if not record or not user.active or user.id != claims.get('user_id'):
+            _evict(lambda k, _info: k == key)
+            raise jwt.InvalidTokenError('Token is not registered')
+        expires_at = claims.get('exp') or now + 24 * 3600
+        info = TokenInfo(user.id, user.bhuarjan_role, tuple(user.village_ids.ids), expires_at, now)
+        with _token_cache_lock:
+            _token_cache[key] = info
+            _token_cache.move_to_end(key)
+            while len(_token_cache) > TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+        return info
+
+    @api.model
+    def _evict_after_commit(self, keys=(), user_ids=()):
+        """Drop ``keys`` and the tokens of ``user_ids`` from every worker's cache after commit.
+
+        Evicting earlier would let a concurrent request cache the old state
+        again before the change is visible.
+        """
+        cr, registry = self.env.cr, self.env.registry
+        pending = cr.postcommit.data.get('bhu_jwt_token_evict')
+        if pending is None:
+            pending = cr.postcommit.data['bhu_jwt_token_evict'] = {'keys': set(), 'user_ids': set()}
+
+            def evict():
+                dbname = registry.db_name
+                _evict(lambda k, info: k in pending['keys']
+                       or (k[0] == dbname and info.user_id in pending['user_ids']))
+                with registry.cursor() as signal_cr:
+                    signal_cr.execute(f"SELECT nextval('{TOKEN_CACHE_SIGNAL}')")
+
+            cr.postcommit.add(evict)
+
+        pending['keys'].update(keys)
+        pending['user_ids'].update(user_ids)
+
+    @api.model
+    def _evict_users(self, user_ids):
+        self._evict_after_commit(user_ids=user_ids)
+
+    def write(self, vals):
+        self._evict_after_commit(keys={_token_key(self.env.cr.dbname, t.token) for t in self if t.token})
+        return super().write(vals)
+
+    def unlink(self):
+        self._evict_after_commit(keys={_token_key(self.env.cr.dbname, t.token) for t in self if t.token})
+        return super().unlink()
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""Streaming xlsxwriter workbooks for the award, Form 10 and payment exports.
+
+``XlsxExport`` writes in xlsxwriter ``constant_memory`` mode to a temp file:
+worksheet rows go to disk as they are written instead of piling up in the
+worker, and the finished file is copied into the filestore in chunks
+(``filestore_attachment``, no base64 round-trip). Formats come from a registry keyed on their
+properties, so identical formats are shared across sheets.
+
+constant_memory ignores writes to a row once a later row has been written,
+while the award sheets merge owner cells after writing the khasra rows below
+them. Sheets are therefore ``RowOrderedSheet`` wrappers: cell writes are
+buffered per row and handed to xlsxwriter in row order once they fall
+``XLSX_ROW_WINDOW`` rows behind the furthest row written. A write to a row
+already handed over raises instead of being lost. Multi-row merges are
+recorded on xlsxwriter's ``Worksheet.merge`` list, which has no public
+equivalent; with an xlsxwriter outside ``XLSX_STREAMING_VERSIONS`` the
+workbook is built in memory with plain worksheet calls instead.
+"""
+import tempfile
+from collections import defaultdict
+
+from .filestore_attachment import create_attachment_from_file
+
+try:
+    import xlsxwriter
+    from xlsxwriter.utility import xl_cell_to_rowcol
+except ImportError:
+    xlsxwriter = None
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+# Rows kept in the buffer behind the furthest row written; an owner/khasra
+# group never spans more than this.
+XLSX_ROW_WINDOW = 1000
+# xlsxwriter releases checked to keep merged ranges in ``Worksheet.merge``.
+XLSX_STREAMING_VERSIONS = ('3.',)
+# Row-bound worksheet calls; everything else goes straight to the worksheet.
+XLSX_ROW_METHODS = frozenset({
+    'write', 'write_string', 'write_number', 'write_blank', 'write_formula',
+    'write_boolean', 'write_datetime', 'write_url', 'write_rich_string', 'set_row',
+})
+
+
+class RowOrderedSheet:
+    """Worksheet proxy replaying buffered row writes in row order.
+
+    With ``window=None`` every call goes straight to the worksheet.
+    """
+
+    def __init__(self, worksheet, window=XLSX_ROW_WINDOW):
+        self._worksheet = worksheet
+        self._window = window
+        self._rows = defaultdict(list)
+        self._flushed_row = -1
+        self._last_row = -1
+
+    def __getattr__(self, name):
+        if name in XLSX_ROW_METHODS and self._window is not None:
+            return lambda *args, **kwargs: self._queue(name, *args, **kwargs)
+        return getattr(self._worksheet, name)
+
+    def _queue(self, method, *args, **kwargs):
+        if isinstance(args[0], str) and method != 'set_row':
+            row, col = xl_cell_to_rowcol(args[0])
+            args = (row, col) + args[1:]
+        row = args[0]
+        if row <= self._flushed_row:
+            raise ValueError('Row %s of worksheet %r is already written out (buffer of %s rows).'
+                             % (row, self._worksheet.name, self._window))
+        self._rows[row].append((method, args, kwargs))
+        if row > self._last_row:
+            self._last_row = row
+            if row - self._window > self._flushed_row:
+                self.flush(row - self._window)
+        return 0
+
+    def merge_range(self, first_row, first_col, last_row, last_col, data, cell_format=None):
+        if self._window is None:
+            return self._worksheet.merge_range(first_row, first_col, last_row, last_col, data, cell_format)
+        if first_row > last_row:
+            first_row, last_row = last_row, first_row
+        if first_col > last_col:
+            first_col, last_col = last_col, first_col
+        if first_row == last_row:
+            return self._queue('merge_range', first_row, first_col, last_row, last_col, data, cell_format)
+        # xlsxwriter pads a merge into the rows below at once and refuses the
+        # range when its first row is already behind; pad it through the
+        # buffer instead and record the range on the worksheet directly.
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                if row == first_row and col == first_col:
+                    self._queue('write', row, col, data, cell_format)
+                else:
+                    self._queue('write_blank', row, col, None, cell_format)
+        self._worksheet.merge.append([first_row, first_col, last_row, last_col])
+        return 0
+
+    def flush(self, up_to_row=None):
+        """Hand buffered rows up to ``up_to_row`` (default: all) to xlsxwriter."""
+        if up_to_row is None:
+            up_to_row = self._last_row
+        for row in range(self._flushed_row + 1, up_to_row + 1):
+            for method, args, kwargs in self._rows.pop(row, ()):
+                getattr(self._worksheet, method)(*args, **kwargs)
+        self._flushed_row = max(self._flushed_row, up_to_row)
+
+
+class XlsxExport:
+    """xlsxwriter workbook in constant_memory mode on a temp file.
+
+    Drop-in for the ``Workbook`` calls the exporters make (``add_worksheet``,
+    ``add_format``); finish with ``close()`` for the file or
+    ``save_attachment()`` to store it.
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile(suffix='.xlsx')
+        self._streaming = xlsxwriter.__version__.startswith(XLSX_STREAMING_VERSIONS)
+        self.workbook = xlsxwriter.Workbook(self._file, {'constant_memory': self._streaming})
+        self._sheets = []
+        self._formats = {}
+
+    def add_worksheet(self, name=None):
+        window = XLSX_ROW_WINDOW if self._streaming else None
+        sheet = RowOrderedSheet(self.workbook.add_worksheet(name), window=window)
+        self._sheets.append(sheet)
+        return sheet
+
+    def add_format(self, properties=None):
+        """Shared ``Format`` for ``properties``; created once per workbook."""
+        key = tuple(sorted((properties or {}).items()))
+        cell_format = self._formats.get(key)
+        if cell_format is None:
+            cell_format = self._formats[key] = self.workbook.add_format(properties)
+        return cell_format
+
+    def close(self):
+        """Finish the workbook; returns ``(file, size)`` positioned at the start."""
+        for sheet in self._sheets:
+            sheet.flush()
+        self.workbook.close()
+        size = self._file.seek(0, 2)
+        self._file.seek(0)
+        return self._file, size
+
+    def save_attachment(self, env, name, res_model, res_id):
+        """Finish the workbook and copy it into the filestore as an ``ir.attachment``."""
+        output, _size = self.close()
+        with output:
+            return create_attachment_from_file(env, output, {
+                'name': name,
+                'type': 'binary',
+                'mimetype': XLSX_MIMETYPE,
+                'res_model': res_model,
+                'res_id': res_id,
+            })
@@ -294,9 +294,17 @@ export class GroupDashboard extends Component {
                 ]),
             ]);
 
-            // For each project, determine its current stage, counts and last survey date
+            // Stage, counts and last survey date of every project in one grouped call
+            const summary = await this.orm.call(
+                "bhuarjan.dashboard",
+                "get_scope_survey_summary",
+                [companyIds, projects.map((project) => project.id)]
+            );
+            const summaryById = new Map((summary.projects || []).map((row) => [row.id, row]));
+
             for (let project of projects) {
-                project.current_stage = await this.determineProjectStage(project.id);
+                const row = summaryById.get(project.id);
+                project.current_stage = row ? row.stage : "initial";
                 project.village_count = project.village_ids ? project.village_ids.length : 0;
 
                 // Track unique villages from these projects
@@ -305,27 +313,9 @@ export class GroupDashboard extends Component {
                 // Parse budget using smart parser
                 globalTotalBudget += this.parseCost(project.total_cost);
 
-                // Fetch last survey date for the project
-                try {
-                    const lastSurvey = await this.orm.searchRead(
-                        "bhu.survey",
-                        [["project_id", "=", project.id]],
-                        ["survey_date"],
-                        { limit: 1, order: "survey_date desc" }
-                    );
-                    project.last_survey_date = lastSurvey.length > 0 ? lastSurvey[0].survey_date : "No Survey";
-                } catch (error) {
-                    console.warn("Could not fetch last survey date for project", project.id, error);
-                    project.last_survey_date = "N/A";
-                }
-
-                // Get counts for the table row (Project specific)
-                const [khasraCount, landownerCount] = await Promise.all([
-                    this.orm.searchCount("bhu.survey", [["project_id", "=", project.id]]),
-                    this.orm.searchCount("bhu.landowner", [["survey_ids.project_id", "=", project.id]])
-                ]);
-                project.total_khasras = khasraCount;
-                project.total_landowners = landownerCount;
+                project.last_survey_date = row && row.last_survey_date ? row.last_survey_date : "No Survey";
+                project.total_khasras = row ? row.survey_count : 0;
+                project.total_landowners = row ? row.landowner_count : 0;
             }
 
             this.state.projects = projects;
@@ -442,48 +432,6 @@ export class GroupDashboard extends Component {
         });
     }
 
-    async determineProjectStage(projectId) {
-        // Check stages in reverse order (latest first)
-
-        // Check for Awards (Section 23)
-        const awards = await this.orm.searchCount("bhu.section23.award", [
-            ["project_id", "=", projectId]
-        ]);
-        if (awards > 0) return "award";
-
-        // Check for Section 21
-        const sec21 = await this.orm.searchCount("bhu.section21.notification", [
-            ["project_id", "=", projectId]
-        ]);
-        if (sec21 > 0) return "section21";
-
-        // Check for Section 19
-        const sec19 = await this.orm.searchCount("bhu.section19.notification", [
-            ["project_id", "=", projectId]
-        ]);
-        if (sec19 > 0) return "section19";
-
-        // Check for Section 11
-        const sec11 = await this.orm.searchCount("bhu.section11.preliminary.report", [
-            ["project_id", "=", projectId]
-        ]);
-        if (sec11 > 0) return "section11";
-
-        // Check for Section 4
-        const sec4 = await this.orm.searchCount("bhu.section4.notification", [
-            ["project_id", "=", projectId]
-        ]);
-        if (sec4 > 0) return "section4";
-
-        // Check for SIA
-        const sia = await this.orm.searchCount("bhu.sia.team", [
-            ["project_id", "=", projectId]
-        ]);
-        if (sia > 0) return "sia";
-
-        return "initial";
-    }
-
     async calculateDelay(project) {
         // Calculate delay based on Land Acquisition Act timelines
         const createDate = new Date(project.create_date);
@@ -589,26 +589,21 @@ export class UnifiedDashboard extends Component {
         }
     }
 
+    async loadScopeSummary(reload = false) {
+        // Counts for every department / project / village in scope, one RPC per page load
+        if (reload || !this.scopeSummaryPromise) {
+            this.scopeSummaryPromise = this.orm.call("bhuarjan.dashboard", "get_scope_survey_summary", []).catch((error) => {
+                this.scopeSummaryPromise = null;
+                throw error;
+            });
+        }
+        return this.scopeSummaryPromise;
+    }
+
     async loadDepartments() {
         try {
-            const departments = await this.orm.call("bhuarjan.dashboard", "get_all_departments", []);
-            const departmentsArray = Array.isArray(departments) ? departments : [];
-            const departmentsWithSurveyCount = await Promise.all(
-                departmentsArray.map(async (department) => {
-                    let surveyCount = 0;
-                    try {
-                        surveyCount = await this.orm.searchCount("bhu.survey", [
-                            ["project_id.department_id", "=", department.id],
-                        ]);
-                    } catch (error) {
-                        console.warn(`Could not load survey count for department ${department.id}`, error);
-                    }
-                    return {
-                        ...department,
-                        survey_count: surveyCount,
-                    };
-                })
-            );
+            const summary = await this.loadScopeSummary();
+            const departmentsWithSurveyCount = Array.isArray(summary.departments) ? summary.departments : [];
             this.state.departments = departmentsWithSurveyCount.sort((a, b) => (b.survey_count || 0) - (a.survey_count || 0));
             // Auto-select department for department users (they only have one department)
             if (this.dashboardType === 'department' && this.state.departments.length === 1) {
@@ -638,30 +633,9 @@ export class UnifiedDashboard extends Component {
         }
 
         try {
-            // Pass departmentId to get_user_projects to filter projects by department
-            const projects = await this.orm.call(
-                "bhuarjan.dashboard",
-                "get_user_projects",
-                [departmentId]
-            );
-
-            // Ensure we have an array
-            const projectsArray = Array.isArray(projects) ? projects : [];
-            const projectsWithSurveyCount = await Promise.all(
-                projectsArray.map(async (project) => {
-                    let surveyCount = 0;
-                    try {
-                        surveyCount = await this.orm.searchCount("bhu.survey", [
-                            ["project_id", "=", project.id]
-                        ]);
-                    } catch (error) {
-                        console.warn(`Could not load survey count for project ${project.id}`, error);
-                    }
-                    return {
-                        ...project,
-                        survey_count: surveyCount,
-                    };
-                })
+            const summary = await this.loadScopeSummary();
+            const projectsWithSurveyCount = (summary.projects || []).filter(
+                (project) => departmentId === null || project.department_id === departmentId
             );
             this.state.projects = projectsWithSurveyCount.sort((a, b) => (b.survey_count || 0) - (a.survey_count || 0));
         } catch (error) {
@@ -677,29 +651,20 @@ export class UnifiedDashboard extends Component {
         }
 
         try {
-            const villages = await this.orm.call(
-                "bhuarjan.dashboard",
-                "get_villages_by_project",
-                [this.state.selectedProject]
-            );
-            const villagesArray = Array.isArray(villages) ? villages : [];
-            const villagesWithSurveyCount = await Promise.all(
-                villagesArray.map(async (village) => {
-                    let surveyCount = 0;
-                    try {
-                        surveyCount = await this.orm.searchCount("bhu.survey", [
-                            ["project_id", "=", this.state.selectedProject],
-                            ["village_id", "=", village.id],
-                        ]);
-                    } catch (error) {
-                        console.warn(`Could not load survey count for village ${village.id}`, error);
-                    }
-                    return {
-                        ...village,
-                        survey_count: surveyCount,
-                    };
-                })
-            );
+            const summary = await this.loadScopeSummary();
+            const project = (summary.projects || []).find((p) => p.id === this.state.selectedProject);
+            let villagesWithSurveyCount;
+            if (project) {
+                villagesWithSurveyCount = project.villages;
+            } else {
+                // Project outside the summary scope (e.g. restored from localStorage): names only
+                const villages = await this.orm.call(
+                    "bhuarjan.dashboard",
+                    "get_villages_by_project",
+                    [this.state.selectedProject]
+                );
+                villagesWithSurveyCount = Array.isArray(villages) ? villages : [];
+            }
             this.state.villages = villagesWithSurveyCount.sort((a, b) => (b.survey_count || 0) - (a.survey_count || 0));
         } catch (error) {
             console.error("Error loading villages:", error);
@@ -1,9 +1,13 @@
 /** @odoo-module **/
 
+import { registry } from "@web/core/registry";
+
 /**
  * Award Action Loader
  * Shows a full-screen loading overlay when heavy award actions (generate / download)
  * are triggered from any Odoo form view button.
+ * Progress is pushed on the bus channel of the award; RPC polling is only
+ * the fallback when the bus service is not available.
  */
 
 const LOADER_ID = 'bhu_award_action_loader';
@@ -139,6 +143,18 @@ const ACTION_ICONS = {
 };
 
 let LOADER_PROGRESS_TIMER = null;
+// Slow poll when there is no bus; with the bus, re-check only after a silence.
+const LOADER_POLL_FALLBACK_MS = 2000;
+const LOADER_PUSH_WATCHDOG_MS = 15000;
+const AWARD_PROGRESS_CHANNEL_PREFIX = 'bhu_award_progress_';
+let AWARD_PROGRESS_BUS = null;
+let LOADER_PROGRESS_CHANNEL = null;
+let LOADER_LAST_UPDATE_AT = 0;
+// Set when the action only queued a generation job: keep the overlay up
+// until the job's progress turns inactive.
+let LOADER_FOLLOWING_JOB = false;
+let LOADER_SEEN_ACTIVE = false;
+let LOADER_JOB_CHECK_PENDING = false;
 
 function _extractSection23AwardId() {
     const hash = window.location.hash || '';
@@ -189,52 +205,129 @@ function _updateLoaderProgressUI(payload) {
     if (bar) bar.style.width = `${Math.max(0, Math.min(100, pct))}%`;
 }
 
+function _fetchLoaderProgress(awardId) {
+    return fetch('/web/dataset/call_kw/bhu.section23.award/get_loader_progress', {
+        method: 'POST',
+        credentials: 'same-origin',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+            jsonrpc: '2.0',
+            method: 'call',
+            params: {
+                model: 'bhu.section23.award',
+                method: 'get_loader_progress',
+                args: [awardId],
+                kwargs: {},
+            },
+            id: Date.now(),
+        }),
+    })
+        .then((r) => r.json())
+        .then((res) => (!res || res.error ? null : (res.result || {})));
+}
+
+// On the "Queued" notification, keep following the job instead of closing.
+function _hideLoaderUnlessJobActive() {
+    if (LOADER_FOLLOWING_JOB || LOADER_JOB_CHECK_PENDING) return;
+    const awardId = _extractSection23AwardId();
+    if (!awardId || awardId <= 0) {
+        _hideLoader();
+        return;
+    }
+    LOADER_JOB_CHECK_PENDING = true;
+    _fetchLoaderProgress(awardId)
+        .finally(() => { LOADER_JOB_CHECK_PENDING = false; })
+        .then((payload) => {
+            if (payload && payload.active) {
+                LOADER_FOLLOWING_JOB = true;
+                LOADER_SEEN_ACTIVE = true;
+                _updateLoaderProgressUI(payload);
+            } else {
+                _hideLoader();
+            }
+        })
+        .catch(() => _hideLoader());
+}
+
+function _applyLoaderProgress(payload) {
+    if (!payload) return;
+    LOADER_LAST_UPDATE_AT = Date.now();
+    _updateLoaderProgressUI(payload);
+    if (payload.active) {
+        LOADER_SEEN_ACTIVE = true;
+    } else if (LOADER_FOLLOWING_JOB && LOADER_SEEN_ACTIVE) {
+        // Queued job finished in a cron worker: close and show fresh data.
+        LOADER_FOLLOWING_JOB = false;
+        _hideLoader();
+        window.location.reload();
+    }
+}
+
+function _onAwardProgressPush(payload) {
+    if (!payload || !document.getElementById(LOADER_ID)) return;
+    if (payload.award_id !== _extractSection23AwardId()) return;
+    _applyLoaderProgress(payload);
+}
+
+// Returns false when progress has to be polled (no bus service).
+function _subscribeAwardProgress(awardId) {
+    if (!AWARD_PROGRESS_BUS) return false;
+    const channel = `${AWARD_PROGRESS_CHANNEL_PREFIX}${awardId}`;
+    if (LOADER_PROGRESS_CHANNEL !== channel) {
+        _unsubscribeAwardProgress();
+        AWARD_PROGRESS_BUS.addChannel(channel);
+        LOADER_PROGRESS_CHANNEL = channel;
+    }
+    return true;
+}
+
+function _unsubscribeAwardProgress() {
+    if (AWARD_PROGRESS_BUS && LOADER_PROGRESS_CHANNEL) {
+        AWARD_PROGRESS_BUS.deleteChannel(LOADER_PROGRESS_CHANNEL);
+    }
+    LOADER_PROGRESS_CHANNEL = null;
+}
+
+registry.category('services').add('bhu_award_progress_bus', {
+    dependencies: ['bus_service'],
+    start(env, { bus_service }) {
+        AWARD_PROGRESS_BUS = bus_service;
+        bus_service.subscribe('bhu_award_progress', _onAwardProgressPush);
+    },
+});
+
 function _startLoaderProgressPolling() {
     if (LOADER_PROGRESS_TIMER) {
         clearInterval(LOADER_PROGRESS_TIMER);
         LOADER_PROGRESS_TIMER = null;
     }
+    LOADER_LAST_UPDATE_AT = 0;
     _setLoaderText('.aal-project-name', _fieldRawValue('project_id'));
     _setLoaderText('.aal-village-name', _fieldRawValue('village_id'));
     _setLoaderText('.aal-village-type', _fieldRawValue('village_type') || '-');
     _setLoaderText('.aal-urban-body', _fieldRawValue('urban_body_type') || '-');
 
-    const poll = () => {
+    const tick = () => {
         if (!document.getElementById(LOADER_ID)) return;
         const awardId = _extractSection23AwardId();
         // Avoid RPCs with no record id (e.g. transient "new" form while overlay is up).
         if (!awardId || awardId <= 0) {
             return;
         }
-        fetch('/web/dataset/call_kw/bhu.section23.award/get_loader_progress', {
-            method: 'POST',
-            credentials: 'same-origin',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                jsonrpc: '2.0',
-                method: 'call',
-                params: {
-                    model: 'bhu.section23.award',
-                    method: 'get_loader_progress',
-                    args: [awardId],
-                    kwargs: {},
-                },
-                id: Date.now(),
-            }),
-        })
-            .then((r) => r.json())
-            .then((res) => {
-                if (!res || res.error) {
-                    return;
-                }
-                const payload = res.result || {};
-                _updateLoaderProgressUI(payload || {});
-            })
+        const pushed = _subscribeAwardProgress(awardId);
+        // With the bus: one fetch for the initial state, then only after a silence
+        // (ticks missed while the websocket reconnected).
+        if (pushed && Date.now() - LOADER_LAST_UPDATE_AT < LOADER_PUSH_WATCHDOG_MS) {
+            return;
+        }
+        LOADER_LAST_UPDATE_AT = Date.now();
+        _fetchLoaderProgress(awardId)
+            .then(_applyLoaderProgress)
             .catch(() => { /* keep loader alive even when polling fails */ });
     };
 
-    poll();
-    LOADER_PROGRESS_TIMER = setInterval(poll, 350);
+    tick();
+    LOADER_PROGRESS_TIMER = setInterval(tick, LOADER_POLL_FALLBACK_MS);
 }
 
 function _showLoader(label, actionName = '') {
@@ -388,10 +481,13 @@ function _showLoader(label, actionName = '') {
 
 function _hideLoader() {
     const el = document.getElementById(LOADER_ID);
+    LOADER_FOLLOWING_JOB = false;
+    LOADER_SEEN_ACTIVE = false;
     if (LOADER_PROGRESS_TIMER) {
         clearInterval(LOADER_PROGRESS_TIMER);
         LOADER_PROGRESS_TIMER = null;
     }
+    _unsubscribeAwardProgress();
     _setPopupButtonsDisabled(false);
     if (!el) return;
     el.style.transition = 'opacity 0.35s ease';
@@ -697,7 +793,7 @@ function _startLoaderHideWatcher() {
         if (!document.getElementById(LOADER_ID)) return;
         const notif = document.querySelector('.o_notification_manager .o_notification');
         if (notif) {
-            setTimeout(_hideLoader, 600);
+            setTimeout(_hideLoaderUnlessJobActive, 600);
         }
     });
     obs.observe(target, { childList: true, subtree: true });
@@ -243,7 +243,7 @@ class ReportWizard(models.TransientModel):
         """Export surveys to Excel format matching PDF structure"""
         # Use utility function to generate Excel
         export_utils = self.env['form10.export.utils']
-        excel_data = export_utils.generate_form10_excel(surveys)
+        excel_file, _size = export_utils.generate_form10_excel_file(surveys)
         
         # Generate filename (explicit project/village from wizard; keeps Hindi names)
         filename = export_utils.generate_form10_filename(
@@ -254,14 +254,15 @@ class ReportWizard(models.TransientModel):
         )
         
         # Create attachment
-        attachment = self.env['ir.attachment'].create({
-            'name': filename,
-            'type': 'binary',
-            'datas': base64.b64encode(excel_data),
-            'mimetype': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            'res_model': 'report.wizard',
-            'res_id': self.id,
-        })
+        with excel_file:
+            attachment = self.env['ir.attachment'].create({
+                'name': filename,
+                'type': 'binary',
+                'raw': excel_file.read(),
+                'mimetype': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+                'res_model': 'report.wizard',
+                'res_id': self.id,
+            })
         
         return {
             'type': 'ir.actions.act_url',